@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from contextvars import ContextVar, Token
+from types import TracebackType
 from typing import (
     Any,
     Callable,
     Dict,
     Generic,
+    List,
     Optional,
     Protocol,
     Type,
@@ -23,9 +26,52 @@ class SupportsServiceRegistration(Protocol):
 T = TypeVar("T", bound=SupportsServiceRegistration)
 
 
+class ServiceScope:
+    """
+    A registry of services that is active for the duration of a `with` block.
+
+    While a scope is active, the ServiceLocator registers and retrieves services in the
+    scope instead of the process-wide registry. The active scope is held in a
+    contextvar, so every thread (and asyncio task) has its own active scope and several
+    independent sets of services can be used in the same process.
+
+    Usage:
+        ```python
+        scope = ServiceScope()
+        with scope:
+            event_manager = EventManager(start_time=start_time, end_time=end_time)
+            ServiceLocator[EventManager]().get(EventManager.SERVICE_NAME)  # event_manager
+        ```
+    """
+
+    def __init__(self) -> None:
+        self._services: Dict[str, Any] = {}
+        self._tokens: List[Token[Optional[ServiceScope]]] = []
+
+    def __enter__(self) -> ServiceScope:
+        self._tokens.append(_active_scope.set(self))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        _active_scope.reset(self._tokens.pop())
+
+
+_active_scope: ContextVar[Optional[ServiceScope]] = ContextVar(
+    "service_scope", default=None
+)
+
+
 class ServiceLocator(Generic[T]):
     """
     Provides a central registry for services (components).
+
+    Services are registered in the active ServiceScope, or in a process-wide registry
+    when no scope is active.
     """
 
     _instance: Optional[ServiceLocator[T]] = (
@@ -44,17 +90,21 @@ class ServiceLocator(Generic[T]):
     def __init__(self) -> None:
         self._services: Dict[str, T]
 
+    def _active_services(self) -> Dict[str, T]:
+        scope = _active_scope.get()
+        return self._services if scope is None else scope._services
+
     def register(self, name: str, service: T) -> None:
         """
         Registers a service with a given name.
         """
-        self._services[name] = service
+        self._active_services()[name] = service
 
     def get(self, name: str) -> T:
         """
         Retrieves a service by its name.
         """
-        service = self._services.get(name)
+        service = self._active_services().get(name)
         if service is None:
             raise ValueError(f"Service {name} not found")
         return service
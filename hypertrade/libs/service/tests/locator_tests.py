@@ -0,0 +1,66 @@
+import threading
+import unittest
+from typing import List, Optional
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.service.locator import (
+    ServiceLocator,
+    ServiceScope,
+    register_service,
+)
+
+
+@register_service("mock_service")
+class MockService:
+    SERVICE_NAME: str = "mock_service"
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+class TestServiceScope(unittest.TestCase):
+
+    def test_scoped_registration(self) -> None:
+        """Services registered in a scope are only found while the scope is active"""
+        scope = ServiceScope()
+        with scope:
+            service = MockService(1)
+            self.assertIs(ServiceLocator[MockService]().get("mock_service"), service)
+        with self.assertRaises(ValueError):
+            ServiceLocator[MockService]().get("mock_service")
+        with scope:
+            self.assertIs(ServiceLocator[MockService]().get("mock_service"), service)
+
+    def test_nested_scopes(self) -> None:
+        outer, inner = ServiceScope(), ServiceScope()
+        with outer:
+            outer_service = MockService(1)
+            with inner:
+                inner_service = MockService(2)
+                self.assertIs(
+                    ServiceLocator[MockService]().get("mock_service"), inner_service
+                )
+            self.assertIs(
+                ServiceLocator[MockService]().get("mock_service"), outer_service
+            )
+
+    def test_scope_per_thread(self) -> None:
+        """A scope entered in one thread isn't active in other threads"""
+        found: List[Optional[MockService]] = []
+
+        def get_service() -> None:
+            try:
+                found.append(ServiceLocator[MockService]().get("mock_service"))
+            except ValueError:
+                found.append(None)
+
+        with ServiceScope():
+            MockService(1)
+            thread = threading.Thread(target=get_service)
+            thread.start()
+            thread.join()
+        self.assertEqual(found, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,9 @@ from typing import Any, Optional
 
 import pandas as pd
 
+from hypertrade.libs.service.locator import ServiceScope
 from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.event.log import EventLogMode
 from hypertrade.libs.simulator.event.service import EventManager
 from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, Frequency
 from hypertrade.libs.simulator.execute.broker import BrokerService
@@ -27,23 +29,38 @@ class TradingEngine:
         trading_strategy: Optional[TradingStrategy] = None,
         frequency: Frequency = Frequency.DAILY,
         capital_base: float = 0.0,
+        event_log_mode: EventLogMode = EventLogMode.ASYNC,
     ) -> None:
-        self.event_manager = EventManager(start_time=start_time, end_time=end_time)
+        # The services are registered in the engine's own scope, so several engines can
+        # run independently in the same process
+        self.services = ServiceScope()
+        with self.services:
+            self.event_manager = EventManager(
+                start_time=start_time,
+                end_time=end_time,
+                frequency=frequency,
+                event_log_mode=event_log_mode,
+            )
 
-        self.portfolio_manager = PortfolioManager(prices_dataset, capital_base)
-        self.market_price_simulator = MarketPriceService(
-            universe=[Asset(1, "GOOGL", "Google")]
-        )
-        self.order_manager = BrokerService(dataset=prices_dataset)
-        self.ledger_service = LedgerService()
-        self.performance_tracking_service = PerformanceTrackingService()
-        self.trading_strategy: Optional[TradingStrategy] = trading_strategy
-        if self.trading_strategy is not None:
-            self.trading_strategy.register_strategy()
+            self.portfolio_manager = PortfolioManager(prices_dataset, capital_base)
+            self.market_price_simulator = MarketPriceService(
+                universe=[Asset(1, "GOOGL", "Google")]
+            )
+            self.order_manager = BrokerService(dataset=prices_dataset)
+            self.ledger_service = LedgerService()
+            self.performance_tracking_service = PerformanceTrackingService()
+            self.trading_strategy: Optional[TradingStrategy] = trading_strategy
+            if self.trading_strategy is not None:
+                self.trading_strategy.register_strategy()
 
     def run(self) -> None:
-        for _event in self.event_manager:
-            pass
+        """Run the simulation to the end, then close the event manager's event log."""
+        try:
+            with self.services:
+                for _event in self.event_manager:
+                    pass
+        finally:
+            self.event_manager.close()
 
     @property
     def current_time(self) -> pd.Timestamp:
@@ -60,9 +77,15 @@ class TradingEngine:
             Event[Any]: The event that was waited for.
 
         Raises:
-            StopIteration: If the iteration stops before the event is reached.
+            StopIteration: If the iteration stops before the event is reached. The event
+                manager's event log is closed.
         """
-        while True:
-            evt = next(self.event_manager)
-            if evt.event_type == event_type:
-                return evt
+        with self.services:
+            while True:
+                try:
+                    evt = next(self.event_manager)
+                except StopIteration:
+                    self.event_manager.close()
+                    raise
+                if evt.event_type == event_type:
+                    return evt
@@ -0,0 +1,97 @@
+import enum
+from typing import List, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from hypertrade.libs.simulator.event.types import EVENT_TYPE
+
+
+class EventLogMode(enum.Enum):
+    """How the EventManager records the event log."""
+
+    OFF = 1
+    """No event log. Subscribing, publishing and dispatching never format a message or
+    call into loguru.
+    """
+
+    ASYNC = 2
+    """Event log written to `events.log` in the event log directory. Records are
+    enqueued and written to the file from a background thread.
+    """
+
+    RING_BUFFER = 3
+    """Structured records kept in a fixed size in-memory EventLogBuffer. Once the buffer
+    is full the oldest records are overwritten.
+    """
+
+
+class EventLogAction(enum.Enum):
+    SUBSCRIBE = 1
+    PUBLISH = 2
+    DISPATCH = 3
+    ADVANCE = 4
+
+
+EVENT_LOG_DTYPE = np.dtype(
+    [
+        ("time_ns", np.int64),
+        ("action", np.int8),
+        ("event_type", np.int8),
+    ]
+)
+
+_ACTION_BY_VALUE = {action.value: action for action in EventLogAction}
+_EVENT_TYPE_BY_VALUE = {event_type.value: event_type for event_type in EVENT_TYPE}
+
+
+class EventLogBuffer:
+    """Fixed size ring buffer of structured event log records.
+
+    Each record holds the simulation time (epoch nanoseconds), the action taken by the
+    EventManager and the event type it was taken for. Records are only decoded into
+    enums and timestamps when read back with `to_frame`.
+    """
+
+    def __init__(self, capacity: int = 1_000_000) -> None:
+        """
+        Args:
+            capacity (int): Maximum number of records kept. Older records are overwritten.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, but {capacity} was passed.")
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=EVENT_LOG_DTYPE)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def record(self, time_ns: int, action: EventLogAction, event_type: int) -> None:
+        """Append a record, overwriting the oldest one if the buffer is full."""
+        self._records[self._count % self.capacity] = (time_ns, action.value, event_type)
+        self._count += 1
+
+    def snapshot(self) -> npt.NDArray[np.void]:
+        """Copy of the records currently in the buffer, oldest first."""
+        if self._count <= self.capacity:
+            return self._records[: self._count].copy()
+        head = self._count % self.capacity
+        return np.concatenate((self._records[head:], self._records[:head]))
+
+    def to_frame(self, tz: str = "America/New_York") -> pd.DataFrame:
+        """Decode the records into a DataFrame with `time`, `action` and `event_type`."""
+        records = self.snapshot()
+        actions = cast(List[int], records["action"].tolist())
+        event_types = cast(List[int], records["event_type"].tolist())
+        return pd.DataFrame(
+            {
+                "time": pd.to_datetime(records["time_ns"], utc=True).tz_convert(tz),
+                "action": [_ACTION_BY_VALUE[v] for v in actions],
+                "event_type": [_EVENT_TYPE_BY_VALUE[v] for v in event_types],
+            }
+        )
+
+    def clear(self) -> None:
+        self._count = 0
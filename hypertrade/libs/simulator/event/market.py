@@ -1,26 +1,75 @@
 import datetime
+from typing import Any, Dict, Optional, Tuple
 
 import exchange_calendars as xcals
+import numpy as np
+import numpy.typing as npt
 import pytz
-from pandas import Timestamp
+from pandas import Timedelta, Timestamp
 
 from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, Frequency
 
+PRE_MARKET_OPEN_OFFSET = datetime.timedelta(minutes=15)
+POST_MARKET_CLOSE_OFFSET = datetime.timedelta(minutes=15)
+
+_PRE_MARKET_OPEN_OFFSET_NS = Timedelta(PRE_MARKET_OPEN_OFFSET).value
+_POST_MARKET_CLOSE_OFFSET_NS = Timedelta(POST_MARKET_CLOSE_OFFSET).value
+
+# How far ahead to build the timeline when no end time is known
+_TIMELINE_EXTENSION_NS = Timedelta(days=365).value
+
+# Length of a bar for the intraday frequencies
+_BAR_NS: Dict[Frequency, int] = {
+    Frequency.HOURLY: Timedelta(hours=1).value,
+    Frequency.MINUTE: Timedelta(minutes=1).value,
+}
+
+# Number of sessions generated at a time. Daily timelines are small enough to be built
+# for the whole window at once, intraday timelines are generated lazily in chunks.
+_SESSIONS_PER_CHUNK: Dict[Frequency, Optional[int]] = {
+    Frequency.DAILY: None,
+    Frequency.HOURLY: 250,
+    Frequency.MINUTE: 20,
+}
+
+_EVENT_TYPE_BY_VALUE: Dict[int, EVENT_TYPE] = {e.value: e for e in EVENT_TYPE}
+
 
 class MarketEvents:
-    """Handles market events and provides the next market event after a given time."""
+    """Handles market events and provides the next market event after a given time.
+
+    The market events for the simulation window are precomputed from the exchange
+    calendar into a sorted timeline of epoch nanoseconds. Finding the next market event
+    is then a cursor check (or a binary search when the cursor is stale), so the cost per
+    event does not depend on how far into the window the simulation is.
+
+    Every session emits PRE_MARKET_OPEN, MARKET_OPEN, MARKET_CLOSE and POST_MARKET_CLOSE.
+    At the HOURLY and MINUTE frequencies a BAR event is also emitted whenever an intraday
+    bar completes. The bar completing at the session close is reported by MARKET_CLOSE,
+    so every trading minute (or hour) ends with exactly one market event.
+
+    Daily timelines are built for the whole window at once. Intraday timelines are built
+    lazily, a chunk of sessions at a time, and only materialize an Event for the market
+    event that is actually returned.
+    """
 
     def __init__(
         self,
         exchange: str = "XNYS",
         frequency: Frequency = Frequency.DAILY,
         tz: str = "America/New_York",
+        start_time: Optional[Timestamp] = None,
+        end_time: Optional[Timestamp] = None,
     ) -> None:
         """
         Args:
             exchange (ExchangeCalendar string): The exchange to get the calendar for.
             frequency (Frequency): The frequency of the market events.
             tz (pytz.timezone string): The timezone to use for the market events.
+            start_time (pd.Timestamp): Start of the window to precompute market events for.
+            end_time (pd.Timestamp): End of the window to precompute market events for.
+                If either bound is not provided, the timeline is built lazily on the first
+                call to `next_market_event`.
 
         Raises:
             ValueError
@@ -34,29 +83,149 @@ class MarketEvents:
         self.frequency = frequency
         self.tz = pytz.timezone(tz)
 
+        self._bar_ns: Optional[int] = _BAR_NS.get(frequency)
+        self._sessions_per_chunk: Optional[int] = _SESSIONS_PER_CHUNK[frequency]
+        self._end_ns: Optional[int] = None
+        self._times: npt.NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self._event_types: npt.NDArray[np.int8] = np.empty(0, dtype=np.int8)
+        self._window_start_ns: int = 0
+        self._cursor: int = 0
+        self._cursor_event: Optional[Event[None]] = None
+
+        if start_time is not None and end_time is not None:
+            if start_time > end_time:
+                raise ValueError(
+                    f"start_time {start_time} is later than end_time {end_time}"
+                )
+            self._end_ns = end_time.value
+            self._build_timeline(start_time.value)
+
+    def _build_timeline(self, start_ns: int) -> None:
+        """Precompute the sorted market event timeline for the sessions after `start_ns`.
+
+        The timeline covers every session with a market event after `start_ns` up to
+        and including one session past the end of the window, so there is always a next
+        event available for any time within the window. Intraday timelines are capped at
+        `_sessions_per_chunk` sessions and extended by the next call.
+        """
+        opens = self.calendar.opens_nanos
+        closes = self.calendar.closes_nanos
+        end_ns = (
+            self._end_ns
+            if self._end_ns is not None and self._end_ns >= start_ns
+            else start_ns + _TIMELINE_EXTENSION_NS
+        )
+        first = int(
+            np.searchsorted(
+                closes + _POST_MARKET_CLOSE_OFFSET_NS, start_ns, side="right"
+            )
+        )
+        last = (
+            int(
+                np.searchsorted(
+                    opens - _PRE_MARKET_OPEN_OFFSET_NS, end_ns, side="right"
+                )
+            )
+            + 1
+        )
+        if self._sessions_per_chunk is not None:
+            last = min(last, first + self._sessions_per_chunk)
+        if first >= len(opens):
+            raise ValueError(
+                f"No market sessions after {Timestamp(start_ns, tz=self.tz)} in the "
+                f"{self.calendar.name} calendar (last session {self.calendar.last_session})"
+            )
+
+        # Early closes and holidays are already reflected in the calendar's opens/closes
+        self._times, self._event_types = self._session_events(
+            opens[first:last], closes[first:last]
+        )
+        self._window_start_ns = start_ns
+        self._cursor = 0
+        self._cursor_event = None
+
+    def _session_events(
+        self, opens: npt.NDArray[np.int64], closes: npt.NDArray[np.int64]
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int8]]:
+        """Lay out the market events of consecutive sessions in time order.
+
+        Each session is laid out as PRE_MARKET_OPEN, MARKET_OPEN, one BAR event per bar
+        except the last, MARKET_CLOSE and POST_MARKET_CLOSE. Sessions don't overlap, so
+        the result is sorted without needing a sort.
+        """
+        n_sessions = len(opens)
+        n_bar_events: npt.NDArray[np.signedinteger[Any]]
+        if self._bar_ns is None:
+            n_bar_events = np.zeros(n_sessions, dtype=np.int64)
+        else:
+            # The last (possibly partial) bar of the session completes at the close
+            n_bar_events = (closes - opens + self._bar_ns - 1) // self._bar_ns - 1
+
+        n_events = n_bar_events + 4
+        session_starts = np.cumsum(n_events) - n_events
+        times = np.empty(int(n_events.sum()), dtype=np.int64)
+        event_types = np.full(len(times), EVENT_TYPE.BAR.value, dtype=np.int8)
+
+        times[session_starts] = opens - _PRE_MARKET_OPEN_OFFSET_NS
+        event_types[session_starts] = EVENT_TYPE.PRE_MARKET_OPEN.value
+        times[session_starts + 1] = opens
+        event_types[session_starts + 1] = EVENT_TYPE.MARKET_OPEN.value
+        times[session_starts + n_events - 2] = closes
+        event_types[session_starts + n_events - 2] = EVENT_TYPE.MARKET_CLOSE.value
+        times[session_starts + n_events - 1] = closes + _POST_MARKET_CLOSE_OFFSET_NS
+        event_types[session_starts + n_events - 1] = EVENT_TYPE.POST_MARKET_CLOSE.value
+
+        if self._bar_ns is not None:
+            total_bar_events = int(n_bar_events.sum())
+            bar_event_number = np.arange(total_bar_events) - np.repeat(
+                np.cumsum(n_bar_events) - n_bar_events, n_bar_events
+            )
+            times[np.repeat(session_starts + 2, n_bar_events) + bar_event_number] = (
+                np.repeat(opens, n_bar_events) + (bar_event_number + 1) * self._bar_ns
+            )
+
+        return times, event_types
+
+    def _seek(self, time_ns: int) -> int:
+        """Return the index of the first market event strictly after `time_ns`."""
+        times = self._times
+        cursor = self._cursor
+        # Fast path: simulation time only moves forward, so the cursor is usually current
+        if (
+            cursor < len(times)
+            and times[cursor] > time_ns
+            and (
+                times[cursor - 1] <= time_ns
+                if cursor > 0
+                else self._window_start_ns <= time_ns
+            )
+        ):
+            return cursor
+
+        if time_ns < self._window_start_ns or not len(times) or times[-1] <= time_ns:
+            self._build_timeline(time_ns)
+            times = self._times
+        return int(np.searchsorted(times, time_ns, side="right"))
+
     def next_market_event(self, time: Timestamp) -> Event[None]:
         """
         Returns the next market event after the given time.
+
+        Repeated calls for times that resolve to the same market event return the same
+        Event instance.
         """
-        if self.frequency == Frequency.DAILY:
-            open_time = self.calendar.next_open(time).tz_convert(self.tz)
-            # Account when the current time being passed is the close time
-            close_time = (
-                self.calendar.next_close(time).tz_convert(self.tz)
-                if self.calendar.next_close(time.normalize()) != time
-                else time.tz_convert(self.tz)
+        return self.next_market_event_ns(time.value)
+
+    def next_market_event_ns(self, time_ns: int) -> Event[None]:
+        """
+        Returns the next market event after the given time in epoch nanoseconds.
+        """
+        idx = self._seek(time_ns)
+        if idx != self._cursor or self._cursor_event is None:
+            self._cursor = idx
+            event = Event[None](
+                event_type=_EVENT_TYPE_BY_VALUE[int(self._event_types[idx])]
             )
-            pre_open_time = open_time - datetime.timedelta(minutes=15)
-            post_close_time = close_time + datetime.timedelta(minutes=15)
-
-            times_events = [
-                (pre_open_time, EVENT_TYPE.PRE_MARKET_OPEN),
-                (open_time, EVENT_TYPE.MARKET_OPEN),
-                (close_time, EVENT_TYPE.MARKET_CLOSE),
-                (post_close_time, EVENT_TYPE.POST_MARKET_CLOSE),
-            ]
-            future_times = [(t, e) for (t, e) in times_events if t > time]
-            next_time, next_type = min(future_times, key=lambda x: x[0])
-            return Event(event_type=next_type, time=next_time)
-        else:
-            raise NotImplementedError("Only daily frequency is supported")
+            event.set_time_ns(int(self._times[idx]), self.tz)
+            self._cursor_event = event
+        return self._cursor_event
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import datetime
 import heapq
+import itertools
 import os
+import uuid
+from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
-    Dict,
+    Iterable,
     List,
     Literal,
     Optional,
@@ -16,11 +19,21 @@ from typing import (
 )
 
 from loguru import logger
-from pandas import Timestamp
+from pandas import Timedelta, Timestamp
 
 from hypertrade.libs.service.locator import register_service
+from hypertrade.libs.simulator.event.log import (
+    EventLogAction,
+    EventLogBuffer,
+    EventLogMode,
+)
 from hypertrade.libs.simulator.event.market import MarketEvents
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, Frequency
+from hypertrade.libs.simulator.event.types import (
+    EVENT_TYPE,
+    Event,
+    Frequency,
+    HandlerPriority,
+)
 from hypertrade.libs.simulator.execute.types import Order, Transaction
 from hypertrade.libs.simulator.market_types import PriceChangeData
 
@@ -33,6 +46,16 @@ EventHandlerFn = Callable[[Event[Any]], None]  # More general type for methods
 
 EVENT_SERVICE_NAME = "event_manager"
 
+# Size of the dispatch table, which is indexed by the EVENT_TYPE value
+_DISPATCH_TABLE_SIZE = max(event_type.value for event_type in EVENT_TYPE) + 1
+
+
+@dataclass(eq=False)
+class _Subscription:
+    subscriber: EventHandlerFn
+    priority: int
+    once: bool
+
 
 @register_service(EVENT_SERVICE_NAME)
 class EventManager:
@@ -49,6 +72,8 @@ class EventManager:
         tz: str = "America/New_York",
         # trunk-ignore(bandit/B108)
         event_log_dir: str = "/tmp/logs/hypertrade/events",
+        event_log_mode: EventLogMode = EventLogMode.ASYNC,
+        event_log_capacity: int = 1_000_000,
     ) -> None:
         """Initialize the event manager.
 
@@ -58,6 +83,9 @@ class EventManager:
                 NOTE: If no time is provided, the timestamp defaults to 00:00:00, meaning this
                 day will not be included in the simulation.
             frequency (Frequency): The frequency of the market events.
+            event_log_dir (str): Directory of the `events.log` file in ASYNC mode.
+            event_log_mode (EventLogMode): How the event log is recorded. See EventLogMode.
+            event_log_capacity (int): Number of records kept in RING_BUFFER mode.
 
         Raises:
             ValueError
@@ -69,27 +97,69 @@ class EventManager:
 
         """
         # public attributes
-        self._current_time = start_time
         self.end_time = end_time
 
+        # The clock is kept in epoch nanoseconds, the Timestamp is created on access
+        self._current_time_ns: int = start_time.value
+        self._current_time: Optional[Timestamp] = start_time
+        self._tz: Optional[datetime.tzinfo] = start_time.tz
+        self._end_time_ns: int = end_time.value
+
         # private attributes
-        self._subscribers: Dict[EVENT_TYPE, List[EventHandlerFn]] = {}
+        self._subscriptions: List[List[_Subscription]] = [
+            [] for _ in range(_DISPATCH_TABLE_SIZE)
+        ]
+        # Handlers compiled from the subscriptions, in call order
+        self._dispatch_table: List[Tuple[EventHandlerFn, ...]] = [
+            () for _ in range(_DISPATCH_TABLE_SIZE)
+        ]
         self._market_events = MarketEvents(
-            exchange=exchange, frequency=frequency, tz=tz
+            exchange=exchange,
+            frequency=frequency,
+            tz=tz,
+            start_time=start_time,
+            end_time=end_time,
         )
-        self._event_queue: List[Tuple[Timestamp, Event[Any]]] = []
-
-        self._configure_event_logging(event_log_dir=event_log_dir)
+        # Entries are (time_ns, priority, seq, event). The sequence number is unique, so
+        # events never need to be compared and same time, same priority events are
+        # published in the order they were scheduled.
+        self._event_queue: List[Tuple[int, int, int, Event[Any]]] = []
+        self._event_seq = itertools.count()
+
+        self.event_log_mode = event_log_mode
+        # Checked on the hot path so that OFF costs a single attribute lookup
+        self._log_events = event_log_mode is not EventLogMode.OFF
+        self._event_log: Optional[EventLogBuffer] = None
+        self._event_log_sink: Optional[int] = None
+        if event_log_mode is EventLogMode.ASYNC:
+            self._configure_event_logging(event_log_dir=event_log_dir)
+        elif event_log_mode is EventLogMode.RING_BUFFER:
+            self._event_log = EventLogBuffer(capacity=event_log_capacity)
 
     @property
     def current_time(self) -> Timestamp:
+        if self._current_time is None:
+            self._current_time = Timestamp(self._current_time_ns, tz=self._tz)
         return self._current_time
 
+    @property
+    def current_time_ns(self) -> int:
+        """The simulation time in epoch nanoseconds. Cheaper than `current_time` when
+        only ordering or time deltas are needed."""
+        return self._current_time_ns
+
+    @property
+    def event_log(self) -> Optional[EventLogBuffer]:
+        """The event log records in RING_BUFFER mode, None otherwise."""
+        return self._event_log
+
     def _format_with_sim_time(self, record: Record) -> str:
         """
         Custom formatter function to add simulation time.
         """
-        sim_time = self._current_time
+        # Records are written from a background thread, so the simulation time is
+        # captured on the record when it is logged
+        sim_time: Timestamp = record["extra"]["simulation_time"]
         formatted_time = sim_time.strftime("%Y-%m-%d %H:%M:%S")
         return "{time} - SimTime: {sim_time} - {level:7s} - {message}\n".format(
             time=record["time"].strftime("%Y-%m-%d %H:%M:%S"),
@@ -100,57 +170,90 @@ class EventManager:
 
     def _filter_event_logs(self, record: Record) -> bool:
         """
-        Filter function to include only event logs.
+        Filter function to include only the event logs of this event manager.
         """
-        return "event" in record["extra"]  # Check for "event" key in record["extra"]
+        return record["extra"].get("event") == self._event_log_token
 
     def _configure_event_logging(self, event_log_dir: str) -> None:
         """
         Configures a separate handler for the event logging in a separate location.
         """
 
-        # Configure Loguru
-        logger.add(
+        # Records are told apart by a token of this manager, unlike `id(self)` it isn't
+        # reused by a later manager
+        self._event_log_token = uuid.uuid4().hex
+        self._event_log_sink = logger.add(
             os.path.join(event_log_dir, "events.log"),
             format=self._format_with_sim_time,
             filter=self._filter_event_logs,  # Add the filter
+            enqueue=True,
         )
+        self._event_logger = logger.bind(event=self._event_log_token)
+
+    def close(self) -> None:
+        """
+        Flushes and removes the event log file handler, if there is one.
+        """
+        if self._event_log_sink is not None:
+            logger.remove(self._event_log_sink)
+            self._event_log_sink = None
+            self._log_events = self._event_log is not None
 
     @overload
     def subscribe(
         self,
         event_type: Literal[EVENT_TYPE.MARKET_OPEN],
         subscriber: Callable[[Event[None]], None],
+        priority: int = ...,
+        once: bool = ...,
     ) -> None: ...
     @overload
     def subscribe(
         self,
         event_type: Literal[EVENT_TYPE.MARKET_CLOSE],
         subscriber: Callable[[Event[None]], None],
+        priority: int = ...,
+        once: bool = ...,
+    ) -> None: ...
+    @overload
+    def subscribe(
+        self,
+        event_type: Literal[EVENT_TYPE.BAR],
+        subscriber: Callable[[Event[None]], None],
+        priority: int = ...,
+        once: bool = ...,
     ) -> None: ...
     @overload
     def subscribe(
         self,
         event_type: Literal[EVENT_TYPE.ORDER_PLACED],
         subscriber: Callable[[Event[Order]], None],
+        priority: int = ...,
+        once: bool = ...,
     ) -> None: ...
     @overload
     def subscribe(
         self,
         event_type: Literal[EVENT_TYPE.ORDER_FULFILLED],
         subscriber: Callable[[Event[Transaction]], None],
+        priority: int = ...,
+        once: bool = ...,
     ) -> None: ...
     @overload
     def subscribe(
         self,
         event_type: Literal[EVENT_TYPE.PRICE_CHANGE],
         subscriber: Callable[[Event[PriceChangeData]], None],
+        priority: int = ...,
+        once: bool = ...,
     ) -> None: ...
 
     def subscribe(
         self,
         event_type: EVENT_TYPE,
         subscriber: EventHandlerFn,
+        priority: int = HandlerPriority.DEFAULT,
+        once: bool = False,
     ) -> None:
         """
         Subscribes a component to a specific event type.
@@ -161,76 +264,222 @@ class EventManager:
                 This can either be a class that implements the SupportsEventHandling protocol
                 (i.e. has a handle_event method) or a function that takes a time and event as
                 arguments. See SupportsEventHandling and EventHandlerFn for the method signature.
+            priority (int): Subscribers are called in order of priority, lowest first, and
+                in subscription order for the same priority. See HandlerPriority.
+            once (bool): Unsubscribe after the subscriber has been called once.
         """
-        logger.bind(event=True, simulation_time=self.current_time).info(
-            f"Subscribing {subscriber} to {event_type}"
+        if self._log_events:
+            self._log(
+                EventLogAction.SUBSCRIBE,
+                event_type,
+                "INFO",
+                "Subscribing {} to {}",
+                subscriber,
+                event_type,
+            )
+        subscriptions = self._subscriptions[event_type.value]
+        subscriptions.append(_Subscription(subscriber, priority, once))
+        # Stable sort, so the subscription order is kept within a priority
+        subscriptions.sort(key=lambda subscription: subscription.priority)
+        self._compile_handlers(event_type)
+
+    def unsubscribe(self, event_type: EVENT_TYPE, subscriber: EventHandlerFn) -> None:
+        """
+        Unsubscribes a component from a specific event type.
+
+        Raises:
+            ValueError: If the subscriber is not subscribed to the event type.
+        """
+        for subscription in self._subscriptions[event_type.value]:
+            if subscription.subscriber == subscriber:
+                self._remove_subscription(event_type, subscription)
+                return
+        raise ValueError(f"{subscriber} is not subscribed to {event_type}")
+
+    def _remove_subscription(
+        self, event_type: EVENT_TYPE, subscription: _Subscription
+    ) -> None:
+        self._subscriptions[event_type.value].remove(subscription)
+        self._compile_handlers(event_type)
+
+    def _compile_handlers(self, event_type: EVENT_TYPE) -> None:
+        """
+        Rebuilds the tuple of handlers called when publishing the event type.
+        """
+        self._dispatch_table[event_type.value] = tuple(
+            (
+                self._one_shot_handler(event_type, subscription)
+                if subscription.once
+                else subscription.subscriber
+            )
+            for subscription in self._subscriptions[event_type.value]
         )
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
 
-        self._subscribers[event_type].append(subscriber)
+    def _one_shot_handler(
+        self, event_type: EVENT_TYPE, subscription: _Subscription
+    ) -> EventHandlerFn:
+        def handler(event: Event[Any]) -> None:
+            # May already be unsubscribed by an earlier handler of the same event
+            if subscription in self._subscriptions[event_type.value]:
+                self._remove_subscription(event_type, subscription)
+            subscription.subscriber(event)
+
+        return handler
 
     def _publish(self, event: Event[Any]) -> None:
         """
         Publishes an event to all subscribers of that event type.
         """
-
-        logger.bind(event=True, simulation_time=self.current_time).debug(
-            f"Publishing {event.event_type}"
+        handlers = self._dispatch_table[event.event_type.value]
+        if not self._log_events:
+            for handler in handlers:
+                handler(event)
+            return
+
+        self._log(
+            EventLogAction.PUBLISH,
+            event.event_type,
+            "DEBUG",
+            "Publishing {}",
+            event.event_type,
         )
-        if event.event_type in self._subscribers:
-            for subscriber in self._subscribers[event.event_type]:
-                logger.bind(event=True, simulation_time=self.current_time).trace(
-                    f"Dispatching {event.event_type} to {subscriber}"
-                )
-                subscriber(event)
+        for handler in handlers:
+            self._log(
+                EventLogAction.DISPATCH,
+                event.event_type,
+                "TRACE",
+                "Dispatching {} to {}",
+                event.event_type,
+                handler,
+            )
+            handler(event)
+
+    def _log(
+        self,
+        action: EventLogAction,
+        event_type: EVENT_TYPE,
+        level: str,
+        message: str,
+        *args: Any,
+    ) -> None:
+        """
+        Records an event log entry. Only called when the event log is enabled.
+
+        The message is passed to loguru unformatted, so it's only formatted when a handler
+        accepts the level.
+        """
+        if self._event_log is not None:
+            self._event_log.record(self._current_time_ns, action, event_type.value)
+        else:
+            self._event_logger.log(
+                level, message, *args, simulation_time=self.current_time
+            )
 
     def schedule_event(
-        self, event: Event[Any], delay: Optional[datetime.timedelta] = None
+        self,
+        event: Event[Any],
+        delay: Optional[datetime.timedelta] = None,
+        priority: int = 0,
     ) -> None:
         """
         Schedules an event to be published after a delay.
+
+        Events scheduled for the same time are published in order of priority (lowest
+        first) and then in the order they were scheduled.
+        """
+        time_ns = self._current_time_ns
+        if delay:
+            time_ns += _timedelta_ns(delay)
+        event.set_time_ns(time_ns, self._tz)
+        event.id = seq = next(self._event_seq)
+        heapq.heappush(self._event_queue, (time_ns, priority, seq, event))
+
+    def schedule_events(
+        self,
+        events: Iterable[Event[Any]],
+        delay: Optional[datetime.timedelta] = None,
+        priority: int = 0,
+    ) -> None:
         """
-        event_time = self._current_time + delay if delay else self._current_time
-        event.time = event_time
-        heapq.heappush(self._event_queue, (event_time, event))
+        Schedules a batch of events to be published after the same delay.
+
+        Equivalent to calling `schedule_event` for each event in order, but the events are
+        merged into the event queue at once.
+        """
+        time_ns = self._current_time_ns
+        if delay:
+            time_ns += _timedelta_ns(delay)
+        tz = self._tz
+        entries = []
+        for event in events:
+            event.set_time_ns(time_ns, tz)
+            event.id = seq = next(self._event_seq)
+            entries.append((time_ns, priority, seq, event))
+
+        queue = self._event_queue
+        if len(entries) * max(len(queue), 1).bit_length() < len(queue) + len(entries):
+            # A few events into a large queue, pushing is cheaper than re-heapifying
+            for entry in entries:
+                heapq.heappush(queue, entry)
+        else:
+            queue.extend(entries)
+            heapq.heapify(queue)
 
     def __iter__(self) -> EventManager:
         return self
 
-    def _update_current_time(self, time: Timestamp) -> None:
-        if self._current_time != time:
-            logger.bind(event=True, simulation_time=self.current_time).info(
-                f"Advancing time from {self._current_time} --> {time}"
-            )
-            self._current_time = time
+    def _update_current_time(self, time_ns: int, event_type: EVENT_TYPE) -> None:
+        if self._current_time_ns != time_ns:
+            if self._log_events:
+                self._log(
+                    EventLogAction.ADVANCE,
+                    event_type,
+                    "INFO",
+                    "Advancing time from {} --> {}",
+                    self.current_time,
+                    Timestamp(time_ns, tz=self._tz),
+                )
+            self._current_time_ns = time_ns
+            self._current_time = None
 
     def __next__(self) -> Event[Any]:
 
         # Get the next market event and time to see if any schedule events need to be run
         # before it.
-        next_market_event: Event[Any] = self._market_events.next_market_event(
-            self._current_time
+        next_market_event: Event[Any] = self._market_events.next_market_event_ns(
+            self._current_time_ns
         )
-        if next_market_event.time is None:
+        market_time_ns = next_market_event.time_ns
+        if market_time_ns is None:
             raise ValueError(
                 "next_market_event came back with None time. Something went wrong"
             )
         # Drain event queue if there are events scheduled and it's time to handle them
-        if self._event_queue and self._event_queue[0][0] <= next_market_event.time:
-            event_time, event = heapq.heappop(self._event_queue)
+        if self._event_queue and self._event_queue[0][0] <= market_time_ns:
+            time_ns, _, _, event = heapq.heappop(self._event_queue)
             # advance time to the next event time
-            self._update_current_time(event_time)
+            self._update_current_time(time_ns, event.event_type)
             self._publish(event)
             return event
 
         # If the next market event is after the end time, end the simulation
-        if next_market_event.time > self.end_time:
+        if market_time_ns > self._end_time_ns:
             raise StopIteration
 
         # If there are no scheduled events that can be run, look for next market event
         # and advance time to that event
         # advance time to the next market event
-        self._update_current_time(next_market_event.time)
+        self._update_current_time(market_time_ns, next_market_event.event_type)
         self._publish(next_market_event)
         return next_market_event
+
+
+def _timedelta_ns(delay: datetime.timedelta) -> int:
+    """Converts a timedelta to nanoseconds without creating a pd.Timedelta."""
+    if isinstance(delay, Timedelta):
+        return delay.value
+    return (
+        delay.days * 86_400_000_000_000
+        + delay.seconds * 1_000_000_000
+        + delay.microseconds * 1_000
+    )
@@ -1,8 +1,8 @@
 import unittest
 from collections import Counter
 from datetime import timedelta
-from typing import Generic, TypeVar
-from unittest.mock import patch
+from typing import Generic, List, Optional, Tuple, TypeVar
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytz
@@ -12,8 +12,18 @@ from loguru import logger
 from hypertrade.libs.logging.setup import initialize_logging
 from hypertrade.libs.service.locator import ServiceLocator
 from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.event.log import (
+    EventLogAction,
+    EventLogBuffer,
+    EventLogMode,
+)
 from hypertrade.libs.simulator.event.service import EventManager
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.event.types import (
+    EVENT_TYPE,
+    Event,
+    Frequency,
+    HandlerPriority,
+)
 from hypertrade.libs.simulator.execute.types import Order
 from hypertrade.libs.tsfd.utils.time import cast_timestamp
 
@@ -338,6 +348,314 @@ class TestEventManager(unittest.TestCase):
                 market_open_event.time, pd.Timestamp("2020-01-02 09:30", tz=nytz)
             )
 
+    def test_market_events_respect_holidays_and_early_closes(self) -> None:
+        """Test the precomputed timeline skips holidays and uses early close times"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2019-11-27", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2019-11-30", tz=nytz))
+        event_manager = EventManager(start_time=start_time, end_time=end_time)
+
+        events = [(event.event_type, event.time) for event in event_manager]
+
+        # Thanksgiving (2019-11-28) is a holiday and the day after closes at 13:00
+        self.assertEqual(
+            events,
+            [
+                (
+                    EVENT_TYPE.PRE_MARKET_OPEN,
+                    pd.Timestamp("2019-11-27 09:15", tz=nytz),
+                ),
+                (EVENT_TYPE.MARKET_OPEN, pd.Timestamp("2019-11-27 09:30", tz=nytz)),
+                (EVENT_TYPE.MARKET_CLOSE, pd.Timestamp("2019-11-27 16:00", tz=nytz)),
+                (
+                    EVENT_TYPE.POST_MARKET_CLOSE,
+                    pd.Timestamp("2019-11-27 16:15", tz=nytz),
+                ),
+                (
+                    EVENT_TYPE.PRE_MARKET_OPEN,
+                    pd.Timestamp("2019-11-29 09:15", tz=nytz),
+                ),
+                (EVENT_TYPE.MARKET_OPEN, pd.Timestamp("2019-11-29 09:30", tz=nytz)),
+                (EVENT_TYPE.MARKET_CLOSE, pd.Timestamp("2019-11-29 13:00", tz=nytz)),
+                (
+                    EVENT_TYPE.POST_MARKET_CLOSE,
+                    pd.Timestamp("2019-11-29 13:15", tz=nytz),
+                ),
+            ],
+        )
+
+    def test_post_market_close_after_scheduled_event_at_close(self) -> None:
+        """Test an event scheduled just after the close does not skip the post close event"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02 15:00", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+        event_manager = EventManager(start_time=start_time, end_time=end_time)
+
+        market_close_event = next(event_manager)
+        self.assertEqual(market_close_event.event_type, EVENT_TYPE.MARKET_CLOSE)
+        event_manager.schedule_event(
+            Event[None](event_type=EVENT_TYPE.PORTFOLIO_UPDATE),
+            delay=timedelta(milliseconds=3),
+        )
+        self.assertEqual(next(event_manager).event_type, EVENT_TYPE.PORTFOLIO_UPDATE)
+
+        post_close_event = next(event_manager)
+        self.assertEqual(post_close_event.event_type, EVENT_TYPE.POST_MARKET_CLOSE)
+        self.assertEqual(
+            post_close_event.time, pd.Timestamp("2020-01-02 16:15", tz=nytz)
+        )
+
+    def test_minute_frequency_bar_events(self) -> None:
+        """Test a bar event is published for each trading minute"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2019-11-27", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2019-11-30", tz=nytz))
+        event_manager = EventManager(
+            start_time=start_time, end_time=end_time, frequency=Frequency.MINUTE
+        )
+
+        events = [(event.event_type, event.time) for event in event_manager]
+        event_counter = Counter(event_type for event_type, _ in events)
+
+        # A regular session has 390 minutes and the early close after Thanksgiving has
+        # 210. The last minute of each session is reported by the market close.
+        self.assertEqual(event_counter[EVENT_TYPE.BAR], 389 + 209)
+        self.assertEqual(event_counter[EVENT_TYPE.MARKET_OPEN], 2)
+        self.assertEqual(event_counter[EVENT_TYPE.MARKET_CLOSE], 2)
+        self.assertEqual(
+            events[2], (EVENT_TYPE.BAR, pd.Timestamp("2019-11-27 09:31", tz=nytz))
+        )
+        self.assertEqual(
+            [time for _, time in events], sorted(time for _, time in events)
+        )
+
+    def test_hourly_frequency_bar_events(self) -> None:
+        """Test a bar event is published for each trading hour, including partial hours"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2019-11-29", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2019-11-30", tz=nytz))
+        event_manager = EventManager(
+            start_time=start_time, end_time=end_time, frequency=Frequency.HOURLY
+        )
+
+        events = [(event.event_type, event.time) for event in event_manager]
+        self.assertEqual(
+            events,
+            [
+                (
+                    EVENT_TYPE.PRE_MARKET_OPEN,
+                    pd.Timestamp("2019-11-29 09:15", tz=nytz),
+                ),
+                (EVENT_TYPE.MARKET_OPEN, pd.Timestamp("2019-11-29 09:30", tz=nytz)),
+                (EVENT_TYPE.BAR, pd.Timestamp("2019-11-29 10:30", tz=nytz)),
+                (EVENT_TYPE.BAR, pd.Timestamp("2019-11-29 11:30", tz=nytz)),
+                (EVENT_TYPE.BAR, pd.Timestamp("2019-11-29 12:30", tz=nytz)),
+                (EVENT_TYPE.MARKET_CLOSE, pd.Timestamp("2019-11-29 13:00", tz=nytz)),
+                (
+                    EVENT_TYPE.POST_MARKET_CLOSE,
+                    pd.Timestamp("2019-11-29 13:15", tz=nytz),
+                ),
+            ],
+        )
+
+    def test_same_time_events_published_in_schedule_order(self) -> None:
+        """Test events scheduled for the same time are published by priority, then FIFO"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02 09:30", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+
+        def replay() -> List[Tuple[EVENT_TYPE, Optional[int]]]:
+            event_manager = EventManager(start_time=start_time, end_time=end_time)
+            for event_type in [
+                EVENT_TYPE.PORTFOLIO_UPDATE,
+                EVENT_TYPE.ORDER_PLACED,
+                EVENT_TYPE.ORDER_FULFILLED,
+                EVENT_TYPE.PRICE_CHANGE,
+            ]:
+                event_manager.schedule_event(Event[None](event_type=event_type))
+            event_manager.schedule_event(
+                Event[None](event_type=EVENT_TYPE.PRICE_CHANGE), priority=-1
+            )
+            return [
+                (event.event_type, event.id)
+                for event in (next(event_manager) for _ in range(5))
+            ]
+
+        events = replay()
+        self.assertEqual(
+            [event_type for event_type, _ in events],
+            [
+                EVENT_TYPE.PRICE_CHANGE,
+                EVENT_TYPE.PORTFOLIO_UPDATE,
+                EVENT_TYPE.ORDER_PLACED,
+                EVENT_TYPE.ORDER_FULFILLED,
+                EVENT_TYPE.PRICE_CHANGE,
+            ],
+        )
+        self.assertEqual([event_id for _, event_id in events], [4, 0, 1, 2, 3])
+        # Replaying the same schedule with a new event manager gives the same events
+        self.assertEqual(replay(), events)
+
+    def test_schedule_events_batch(self) -> None:
+        """Test a batch of events is published as if scheduled one by one"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02 09:30", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+        event_manager = EventManager(start_time=start_time, end_time=end_time)
+
+        later = Event[None](event_type=EVENT_TYPE.PORTFOLIO_UPDATE)
+        first = Event[None](event_type=EVENT_TYPE.ORDER_FULFILLED)
+        event_manager.schedule_event(later, delay=timedelta(seconds=2))
+        event_manager.schedule_event(first, delay=timedelta(seconds=1))
+        batch = [Event[None](event_type=EVENT_TYPE.ORDER_PLACED) for _ in range(20)]
+        event_manager.schedule_events(batch, delay=timedelta(seconds=1))
+
+        events = [next(event_manager) for _ in range(22)]
+        self.assertEqual(events, [first, *batch, later])
+        self.assertEqual(events[1].time, start_time + pd.Timedelta(seconds=1))
+
+    def test_nanosecond_clock(self) -> None:
+        """Test the integer clock and the lazily created timestamps agree"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02 09:30", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+        event_manager = EventManager(start_time=start_time, end_time=end_time)
+        self.assertEqual(event_manager.current_time_ns, start_time.value)
+
+        event = Event[None](event_type=EVENT_TYPE.PORTFOLIO_UPDATE)
+        event_manager.schedule_event(event, delay=timedelta(microseconds=1500))
+        self.assertEqual(event.time_ns, start_time.value + 1_500_000)
+        event_manager.schedule_event(
+            Event[None](event_type=EVENT_TYPE.PORTFOLIO_UPDATE),
+            delay=pd.Timedelta(nanoseconds=1),
+        )
+
+        self.assertEqual(next(event_manager).time_ns, start_time.value + 1)
+        self.assertEqual(event_manager.current_time_ns, start_time.value + 1)
+        self.assertIs(next(event_manager), event)
+        self.assertEqual(
+            event_manager.current_time, start_time + pd.Timedelta(microseconds=1500)
+        )
+        self.assertEqual(event.time, event_manager.current_time)
+        self.assertEqual(event_manager.current_time.tz, start_time.tz)
+
+    def test_subscriber_priority(self) -> None:
+        """Test subscribers are called by priority, then in subscription order"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+        event_manager = EventManager(start_time=start_time, end_time=end_time)
+
+        calls: List[str] = []
+        event_manager.subscribe(EVENT_TYPE.MARKET_OPEN, lambda _: calls.append("a"))
+        event_manager.subscribe(
+            EVENT_TYPE.MARKET_OPEN,
+            lambda _: calls.append("analytics"),
+            priority=HandlerPriority.ANALYTICS,
+        )
+        event_manager.subscribe(EVENT_TYPE.MARKET_OPEN, lambda _: calls.append("b"))
+        event_manager.subscribe(
+            EVENT_TYPE.MARKET_OPEN,
+            lambda _: calls.append("accounting"),
+            priority=HandlerPriority.ACCOUNTING,
+        )
+
+        next(event_manager)  # Pre market open
+        next(event_manager)  # Market open
+        self.assertEqual(calls, ["accounting", "analytics", "a", "b"])
+
+    def test_unsubscribe(self) -> None:
+        """Test unsubscribed and one-shot subscribers are no longer called"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-04", tz=nytz))
+        event_manager = EventManager(start_time=start_time, end_time=end_time)
+
+        handler = MagicMock()
+        one_shot_handler = MagicMock()
+        event_manager.subscribe(EVENT_TYPE.MARKET_OPEN, handler)
+        event_manager.subscribe(EVENT_TYPE.MARKET_OPEN, one_shot_handler, once=True)
+
+        market_opens = [
+            event
+            for event in event_manager
+            if event.event_type == EVENT_TYPE.MARKET_OPEN
+        ]
+        self.assertEqual(len(market_opens), 2)
+        self.assertEqual(handler.call_count, 2)
+        one_shot_handler.assert_called_once_with(market_opens[0])
+
+        event_manager.unsubscribe(EVENT_TYPE.MARKET_OPEN, handler)
+        with self.assertRaises(ValueError):
+            event_manager.unsubscribe(EVENT_TYPE.MARKET_OPEN, handler)
+        with self.assertRaises(ValueError):
+            event_manager.unsubscribe(EVENT_TYPE.MARKET_OPEN, one_shot_handler)
+
+    def test_event_log_off(self) -> None:
+        """Test nothing is logged or recorded when the event log is off"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+
+        with patch("hypertrade.libs.simulator.event.service.logger") as mock_logger:
+            event_manager = EventManager(
+                start_time=start_time,
+                end_time=end_time,
+                event_log_mode=EventLogMode.OFF,
+            )
+            event_manager.subscribe(
+                EVENT_TYPE.MARKET_OPEN, MockNoEventPublishHandler[None]().handle_event
+            )
+            events = list(event_manager)
+
+        self.assertEqual(len(events), 4)
+        self.assertIsNone(event_manager.event_log)
+        mock_logger.assert_not_called()
+        self.assertEqual(mock_logger.method_calls, [])
+
+    def test_event_log_ring_buffer(self) -> None:
+        """Test subscribing, publishing, dispatching and time advances are recorded"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2020-01-02", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2020-01-03", tz=nytz))
+        event_manager = EventManager(
+            start_time=start_time,
+            end_time=end_time,
+            event_log_mode=EventLogMode.RING_BUFFER,
+        )
+        event_manager.subscribe(
+            EVENT_TYPE.MARKET_OPEN, MockNoEventPublishHandler[None]().handle_event
+        )
+        for _ in event_manager:
+            pass
+
+        event_log = event_manager.event_log
+        assert event_log is not None
+        log_df = event_log.to_frame()
+        # 1 subscribe, 4 time advances, 4 publishes and 1 dispatch
+        self.assertEqual(len(log_df), 10)
+        self.assertEqual(
+            Counter(log_df["action"]),
+            {
+                EventLogAction.SUBSCRIBE: 1,
+                EventLogAction.ADVANCE: 4,
+                EventLogAction.PUBLISH: 4,
+                EventLogAction.DISPATCH: 1,
+            },
+        )
+        dispatch = log_df[log_df["action"] == EventLogAction.DISPATCH].iloc[0]
+        self.assertEqual(dispatch["event_type"], EVENT_TYPE.MARKET_OPEN)
+        self.assertEqual(dispatch["time"], pd.Timestamp("2020-01-02 09:30", tz=nytz))
+
+    def test_event_log_buffer_overwrites_oldest(self) -> None:
+        """Test the ring buffer keeps the most recent records in order"""
+        event_log = EventLogBuffer(capacity=3)
+        for time_ns in range(5):
+            event_log.record(time_ns, EventLogAction.PUBLISH, EVENT_TYPE.BAR.value)
+
+        self.assertEqual(len(event_log), 3)
+        self.assertEqual(event_log.snapshot()["time_ns"].tolist(), [2, 3, 4])
+
     # TODO: Add tests for improper start/end dates
 
     # TODO: Add test for various timezones
@@ -0,0 +1,87 @@
+"""Benchmarks for stepping through the MarketEvents timeline.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/event/tests:market_benchmarks
+"""
+
+import sys
+import time
+
+import pandas as pd
+import pytest
+import pytz
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.event.log import EventLogMode
+from hypertrade.libs.simulator.event.market import MarketEvents
+from hypertrade.libs.simulator.event.service import EventManager
+from hypertrade.libs.simulator.event.types import Frequency
+
+pytest_plugins = ["hypertrade.libs.simulator.tests.benchmark_fixtures"]
+pytestmark = pytest.mark.usefixtures("quiet_logging")
+
+NYTZ = pytz.timezone("America/New_York")
+START_TIME = pd.Timestamp("2007-01-03", tz=NYTZ)
+END_TIME = pd.Timestamp("2025-12-31", tz=NYTZ)
+EVENTS_PER_ROUND = 1_000
+
+
+@pytest.fixture(scope="module")
+def market_events() -> MarketEvents:
+    return MarketEvents(start_time=START_TIME, end_time=END_TIME)
+
+
+def _step(market_events: MarketEvents, time: pd.Timestamp) -> pd.Timestamp:
+    for _ in range(EVENTS_PER_ROUND):
+        event_time = market_events.next_market_event(time).time
+        assert event_time is not None
+        time = event_time
+    return time
+
+
+@pytest.mark.parametrize(
+    "position",
+    [
+        pd.Timestamp("2007-01-03", tz=NYTZ),
+        pd.Timestamp("2016-06-01", tz=NYTZ),
+        pd.Timestamp("2025-06-02", tz=NYTZ),
+    ],
+    ids=["start", "middle", "end"],
+)
+def test_next_market_event_cost_by_position(
+    benchmark: BenchmarkFixture, market_events: MarketEvents, position: pd.Timestamp
+) -> None:
+    """Per-event cost should not depend on how far into the window the simulation is"""
+    benchmark.extra_info["events_per_round"] = EVENTS_PER_ROUND
+    benchmark(_step, market_events, position)
+
+
+def test_build_timeline(benchmark: BenchmarkFixture) -> None:
+    """One-time cost of precomputing ~19 years of daily market events"""
+    benchmark(MarketEvents, start_time=START_TIME, end_time=END_TIME)
+
+
+@pytest.mark.parametrize("frequency", [Frequency.HOURLY, Frequency.MINUTE])
+def test_intraday_event_throughput(
+    benchmark: BenchmarkFixture, frequency: Frequency
+) -> None:
+    """Events per second when iterating a month of intraday market events"""
+
+    def run() -> int:
+        event_manager = EventManager(
+            start_time=pd.Timestamp("2019-01-01", tz=NYTZ),
+            end_time=pd.Timestamp("2019-02-01", tz=NYTZ),
+            frequency=frequency,
+            event_log_mode=EventLogMode.OFF,
+        )
+        return sum(1 for _ in event_manager)
+
+    start = time.perf_counter()
+    n_events = benchmark.pedantic(run, rounds=3, iterations=1)
+    elapsed = (time.perf_counter() - start) / 3
+    benchmark.extra_info["events"] = n_events
+    benchmark.extra_info["events_per_second"] = round(n_events / elapsed)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
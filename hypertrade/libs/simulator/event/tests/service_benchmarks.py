@@ -0,0 +1,104 @@
+"""Benchmarks for scheduling and dispatching events through the EventManager.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/event/tests:service_benchmarks
+"""
+
+import datetime
+import heapq
+import sys
+from typing import Any, Iterator
+
+import pandas as pd
+import pytest
+import pytz
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.event.log import EventLogMode
+from hypertrade.libs.simulator.event.service import EventManager
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+
+pytest_plugins = ["hypertrade.libs.simulator.tests.benchmark_fixtures"]
+pytestmark = pytest.mark.usefixtures("quiet_logging")
+
+NYTZ = pytz.timezone("America/New_York")
+START_TIME = pd.Timestamp("2020-01-02 09:30", tz=NYTZ)
+END_TIME = pd.Timestamp("2020-12-31", tz=NYTZ)
+EVENTS_PER_ROUND = 1_000
+SUBSCRIBERS = 3
+
+
+def _noop_handler(event: Event[Any]) -> None:
+    pass
+
+
+@pytest.fixture(params=list(EventLogMode), ids=lambda mode: mode.name)
+def event_manager(request: pytest.FixtureRequest) -> Iterator[EventManager]:
+    event_manager = EventManager(
+        start_time=START_TIME, end_time=END_TIME, event_log_mode=request.param
+    )
+    for _ in range(SUBSCRIBERS):
+        # Nothing else publishes PORTFOLIO_UPDATE, which has no subscribe overload
+        event_manager.subscribe(
+            EVENT_TYPE.PORTFOLIO_UPDATE, _noop_handler  # type: ignore[call-overload]
+        )
+    yield event_manager
+    event_manager.close()
+
+
+def _dispatch(event_manager: EventManager) -> None:
+    for _ in range(EVENTS_PER_ROUND):
+        event_manager.schedule_event(Event[None](EVENT_TYPE.PORTFOLIO_UPDATE))
+    for _ in range(EVENTS_PER_ROUND):
+        next(event_manager)
+
+
+def test_dispatch_cost_by_event_log_mode(
+    benchmark: BenchmarkFixture, event_manager: EventManager
+) -> None:
+    """Cost of scheduling and dispatching events to subscribers with each event log mode"""
+    benchmark.extra_info["events_per_round"] = EVENTS_PER_ROUND
+    benchmark.extra_info["subscribers"] = SUBSCRIBERS
+    benchmark(_dispatch, event_manager)
+
+
+def _schedule_and_pop(event_manager: EventManager) -> None:
+    # Every 10 events share a timestamp, so ties are broken by the sequence number
+    for i in range(EVENTS_PER_ROUND):
+        event_manager.schedule_event(
+            Event[None](EVENT_TYPE.PORTFOLIO_UPDATE),
+            delay=datetime.timedelta(microseconds=i // 10),
+        )
+    queue = event_manager._event_queue
+    while queue:
+        heapq.heappop(queue)
+
+
+def test_schedule_pop_cost(benchmark: BenchmarkFixture) -> None:
+    """Cost of pushing events onto and popping them off the event queue"""
+    event_manager = EventManager(
+        start_time=START_TIME, end_time=END_TIME, event_log_mode=EventLogMode.OFF
+    )
+    benchmark.extra_info["events_per_round"] = EVENTS_PER_ROUND
+    benchmark(_schedule_and_pop, event_manager)
+
+
+def test_million_schedule_pop_cycles(benchmark: BenchmarkFixture) -> None:
+    """Schedule an event and step to it, a million times"""
+    delay = datetime.timedelta(seconds=1)
+
+    def run() -> None:
+        event_manager = EventManager(
+            start_time=START_TIME, end_time=END_TIME, event_log_mode=EventLogMode.OFF
+        )
+        for _ in range(1_000_000):
+            event_manager.schedule_event(
+                Event[None](EVENT_TYPE.PORTFOLIO_UPDATE), delay=delay
+            )
+            next(event_manager)
+
+    benchmark.pedantic(run, rounds=1, iterations=1)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import datetime
 import enum
-import uuid
 from typing import Any, Generic, Optional, TypeVar
 
 from pandas import Timestamp
@@ -58,6 +58,13 @@ class EVENT_TYPE(enum.Enum):
     Payload: None
     """
 
+    BAR = 9
+    """Emitted when an intraday bar completes at the HOURLY and MINUTE frequencies.
+    The bar completing at the session close is reported by MARKET_CLOSE instead.
+    Publisher: MarketEvents
+    Payload: None
+    """
+
 
 T = TypeVar("T")
 
@@ -67,6 +74,12 @@ class Event(Generic[T]):
     Type-safe event with generic payload.
     """
 
+    __slots__ = ("event_type", "payload", "id", "time_ns", "_time", "_tz")
+
+    time_ns: Optional[int]
+    _time: Optional[Timestamp]
+    _tz: Optional[datetime.tzinfo]
+
     def __init__(
         self,
         event_type: EVENT_TYPE,
@@ -83,11 +96,33 @@ class Event(Generic[T]):
         self.event_type = event_type
         self.time = time
         self.payload = payload
-        self.id = Event.make_id()
+        # Sequence number assigned by the EventManager when the event is scheduled.
+        # Increases monotonically, so it orders events scheduled for the same time.
+        self.id: Optional[int] = None
+
+    @property
+    def time(self) -> Optional[Timestamp]:
+        # Created on first access when the time was set in epoch nanoseconds
+        if self._time is None and self.time_ns is not None:
+            self._time = Timestamp(self.time_ns, tz=self._tz)
+        return self._time
+
+    @time.setter
+    def time(self, time: Optional[Timestamp]) -> None:
+        self._time = time
+        self.time_ns = None if time is None else time.value
+        self._tz = None if time is None else time.tz
+
+    def set_time_ns(self, time_ns: int, tz: Optional[datetime.tzinfo]) -> None:
+        """Sets the event time in epoch nanoseconds without creating a Timestamp.
 
-    @staticmethod
-    def make_id() -> str:
-        return uuid.uuid4().hex
+        Args:
+            time_ns (int): Epoch nanoseconds (UTC) the event should occur
+            tz (tzinfo): Timezone of the `time` Timestamp
+        """
+        self._time = None
+        self.time_ns = time_ns
+        self._tz = tz
 
     def __repr__(self) -> str:
         return (
@@ -95,19 +130,23 @@ class Event(Generic[T]):
         )
 
     def __lt__(self, other: Event[Any]) -> bool:
-        if isinstance(other, Event):
-            return self.id < other.id
-        else:
+        if not isinstance(other, Event):
             raise ValueError(
                 f"Events should only compare to other events, but {type(other)} as passed."
             )
+        return self._sort_key() < other._sort_key()
 
     def __le__(self, other: Event[Any]) -> bool:
         if not isinstance(other, Event):
             raise ValueError(
                 f"Events should only compare to other events, but {type(other)} as passed."
             )
-        return self.id <= other.id
+        return self._sort_key() <= other._sort_key()
+
+    def _sort_key(self) -> int:
+        if self.id is None:
+            raise ValueError(f"Only scheduled events can be compared, got {self}")
+        return self.id
 
 
 # @overload
@@ -126,5 +165,28 @@ class Event(Generic[T]):
 #     return Event(event_type, time=time, payload=data)
 
 
+class HandlerPriority(enum.IntEnum):
+    """Order in which subscribers of the same event type are called, lowest first.
+    Subscribers with the same priority are called in the order they subscribed.
+    """
+
+    MARKET_DATA = 10
+    """Services publishing market data, e.g. MarketPriceService"""
+
+    EXECUTION = 20
+    """Order execution, e.g. BrokerService"""
+
+    ACCOUNTING = 30
+    """Books updated from fills and prices, e.g. LedgerService and PortfolioManager"""
+
+    ANALYTICS = 40
+    """Services reading the books, e.g. PerformanceTrackingService"""
+
+    DEFAULT = 50
+    """Strategies and any other subscriber"""
+
+
 class Frequency(enum.Enum):
     DAILY = 1
+    HOURLY = 2
+    MINUTE = 3
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Iterable, List, Tuple, Type, cast
 
 import pandas as pd
 from loguru import logger
@@ -7,7 +7,7 @@ from pandas._libs.tslibs.nattype import NaTType
 from hypertrade.libs.service.locator import ServiceLocator, register_service
 from hypertrade.libs.simulator.assets import Asset
 from hypertrade.libs.simulator.event.service import EventManager
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, HandlerPriority
 from hypertrade.libs.simulator.execute.commission import CommissionModel, NoCommission
 from hypertrade.libs.simulator.execute.types import Order, Transaction
 from hypertrade.libs.tsfd.datasets.asset import PricesDataset
@@ -34,11 +34,52 @@ class BrokerService:
         if isinstance(execution_delay, NaTType):
             raise ValueError("Execution delay cannot be NaT")
         self.execution_delay: pd.Timedelta = execution_delay
-        self.event_manager.subscribe(EVENT_TYPE.ORDER_PLACED, self._execute_trade)
+        self.event_manager.subscribe(
+            EVENT_TYPE.ORDER_PLACED,
+            self._execute_trade,
+            priority=HandlerPriority.EXECUTION,
+        )
         self.dataset = dataset
 
     def place_order(self, asset: Asset, amount: int) -> Order:
+        return self.place_orders([(asset, amount)])[0]
+
+    def place_orders(self, orders: Iterable[Tuple[Asset, int]]) -> List[Order]:
+        """
+        Places a batch of orders at the current time.
+
+        The orders share one calendar lookup and are scheduled together, which is
+        considerably cheaper than calling `place_order` for each order when
+        rebalancing a large portfolio.
+
+        Args:
+            orders (Iterable[Tuple[Asset, int]]): The asset and amount of each order.
+
+        Returns:
+            List[Order]: The placed orders, in the same order.
+        """
         current_time = self.event_manager.current_time
+        delayed_time = self._order_time(current_time)
+
+        placed_orders = [
+            Order(asset=asset, amount=amount, order_placed=delayed_time)
+            for asset, amount in orders
+        ]
+        self.event_manager.schedule_events(
+            (
+                Event(event_type=EVENT_TYPE.ORDER_PLACED, payload=order)
+                for order in placed_orders
+            ),
+            delay=(
+                (delayed_time - current_time) if delayed_time > current_time else None
+            ),
+        )
+        return placed_orders
+
+    def _order_time(self, current_time: pd.Timestamp) -> pd.Timestamp:
+        """
+        Returns the time an order placed at `current_time` is submitted to the market.
+        """
         open_time = self.event_manager._market_events.calendar.next_open(current_time)
         close_time = self.event_manager._market_events.calendar.next_close(current_time)
 
@@ -48,18 +89,8 @@ class BrokerService:
             logger.bind(simulation_time=current_time).debug(
                 "Scheduling order for next market open"
             )
-            delayed_time = open_time
-        else:
-            delayed_time = current_time
-
-        order = Order(asset=asset, amount=amount, order_placed=delayed_time)
-        self.event_manager.schedule_event(
-            Event(event_type=EVENT_TYPE.ORDER_PLACED, payload=order),
-            delay=(
-                (delayed_time - current_time) if delayed_time > current_time else None
-            ),
-        )
-        return order
+            return cast(pd.Timestamp, open_time)
+        return current_time
 
     def _execute_trade(self, event: Event[Order]) -> None:
         current_time = self.event_manager.current_time
@@ -79,6 +110,7 @@ class BrokerService:
             amount=order.amount,
             price=current_price,
         )
+        transaction.commission = self.commission_model.calculate(order, transaction)
         logger.bind(simulation_time=current_time).debug(
             f"Trade executed for {order}: {current_price}"
         )
@@ -1,15 +1,30 @@
+import array
+import datetime
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
+import pyarrow
+import pyarrow.parquet as pq
 from loguru import logger
 
 from hypertrade.libs.service.locator import ServiceLocator, register_service
 from hypertrade.libs.simulator.event.service import EventManager
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, HandlerPriority
 from hypertrade.libs.simulator.execute.types import Transaction
 
+TRANSACTIONS_COLUMNS = ["amount", "price", "symbol", "sid", "commission", "order_id"]
+
 
 class Ledger:
     """Object providing read-only access to current ledger state.
 
+    Transactions are appended to typed column buffers (`array.array`), one per field,
+    so recording a fill is amortized O(1) and doesn't copy the previous ones. The
+    symbols and order ids are stored once and referenced by index. The `transactions`
+    DataFrame is built from the columns when accessed.
+
     Attributes
     ----------
     transactions : pd.DataFrame, optional
@@ -26,8 +41,115 @@ class Ledger:
     """
 
     def __init__(self) -> None:
-        # trunk-ignore(pyright/reportArgumentType)
-        self.transactions = pd.DataFrame(columns=["amount", "price", "symbol"])
+        self._time_ns = array.array("q")
+        self._sid = array.array("q")
+        self._amount = array.array("d")
+        self._price = array.array("d")
+        self._commission = array.array("d")
+        self._order = array.array("q")
+        self._tz: Optional[datetime.tzinfo] = None
+        self._symbols: Dict[int, str] = {}
+        self._orders: Dict[str, int] = {}
+        self._order_ids: List[str] = []
+        self._transactions: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self._time_ns)
+
+    def record(self, transaction: Transaction) -> None:
+        """Append a transaction to the ledger."""
+        if not self._time_ns:
+            self._tz = transaction.dt.tz
+        sid = transaction.asset.sid
+        if sid not in self._symbols:
+            self._symbols[sid] = transaction.asset.symbol
+        order = self._orders.get(transaction.order_id)
+        if order is None:
+            order = self._orders[transaction.order_id] = len(self._order_ids)
+            self._order_ids.append(transaction.order_id)
+
+        self._time_ns.append(transaction.dt.value)
+        self._sid.append(sid)
+        self._amount.append(transaction.amount)
+        self._price.append(transaction.price)
+        self._commission.append(transaction.commission)
+        self._order.append(order)
+        self._transactions = None
+
+    def columns(self) -> Dict[str, npt.NDArray[Any]]:
+        """NumPy copies of the column buffers, by field.
+
+        The buffers can't grow while a view of them exists, so the columns are copied.
+        """
+        return {
+            "time_ns": np.frombuffer(self._time_ns, dtype=np.int64).copy(),
+            "sid": np.frombuffer(self._sid, dtype=np.int64).copy(),
+            "amount": np.frombuffer(self._amount, dtype=np.float64).copy(),
+            "price": np.frombuffer(self._price, dtype=np.float64).copy(),
+            "commission": np.frombuffer(self._commission, dtype=np.float64).copy(),
+            "order": np.frombuffer(self._order, dtype=np.int64).copy(),
+        }
+
+    def _dates(self, time_ns: npt.NDArray[np.int64]) -> pd.DatetimeIndex:
+        dates = pd.to_datetime(time_ns)
+        if self._tz is not None:
+            dates = dates.tz_localize("UTC").tz_convert(self._tz)
+        return pd.DatetimeIndex(dates)
+
+    def _symbol_codes(
+        self, sid: npt.NDArray[np.int64]
+    ) -> Tuple[npt.NDArray[np.intp], List[str]]:
+        """Index of each transaction's symbol into the list of symbols traded."""
+        sids, codes = np.unique(sid, return_inverse=True)
+        return codes, [self._symbols[s] for s in cast(List[int], sids.tolist())]
+
+    @property
+    def transactions(self) -> pd.DataFrame:
+        if self._transactions is None:
+            columns = self.columns()
+            codes, symbols = self._symbol_codes(columns["sid"])
+            self._transactions = pd.DataFrame(
+                {
+                    "amount": columns["amount"],
+                    "price": columns["price"],
+                    "symbol": np.array(symbols, dtype=object)[codes],
+                    "sid": columns["sid"],
+                    "commission": columns["commission"],
+                    "order_id": np.array(self._order_ids, dtype=object)[
+                        columns["order"]
+                    ],
+                },
+                index=self._dates(columns["time_ns"]),
+                # trunk-ignore(pyright/reportArgumentType)
+                columns=TRANSACTIONS_COLUMNS,
+            )
+        return self._transactions
+
+    def to_parquet(self, path: str) -> None:
+        """Write the transactions to a Parquet file, without going through pandas.
+
+        The file has a "date" column followed by the `transactions` columns, with the
+        symbols and order ids dictionary encoded.
+        """
+        columns = self.columns()
+        codes, symbols = self._symbol_codes(columns["sid"])
+        tz = None if self._tz is None else str(self._tz)
+        table = pyarrow.table(
+            {
+                "date": pyarrow.array(columns["time_ns"], pyarrow.timestamp("ns", tz)),
+                "amount": columns["amount"],
+                "price": columns["price"],
+                "symbol": pyarrow.DictionaryArray.from_arrays(
+                    codes.astype(np.int32), symbols
+                ),
+                "sid": columns["sid"],
+                "commission": columns["commission"],
+                "order_id": pyarrow.DictionaryArray.from_arrays(
+                    columns["order"].astype(np.int32), self._order_ids
+                ),
+            }
+        )
+        pq.write_table(table, path)
 
 
 LEDGER_SERVICE_NAME = "ledger_service"
@@ -44,7 +166,9 @@ class LedgerService:
             EventManager.SERVICE_NAME
         )
         self.event_manager.subscribe(
-            EVENT_TYPE.ORDER_FULFILLED, self.record_transaction
+            EVENT_TYPE.ORDER_FULFILLED,
+            self.record_transaction,
+            priority=HandlerPriority.ACCOUNTING,
         )
 
     def record_transaction(self, event: Event[Transaction]) -> None:
@@ -55,8 +179,4 @@ class LedgerService:
         transaction = event.payload
         if transaction is None:
             raise ValueError("Transaction data is None")
-        self.ledger.transactions.loc[transaction.dt] = [
-            transaction.amount,
-            transaction.price,
-            transaction.asset.symbol,
-        ]
+        self.ledger.record(transaction)
@@ -0,0 +1,77 @@
+"""Benchmarks for placing orders through the BrokerService.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/execute/tests:broker_benchmarks
+"""
+
+import os
+import sys
+from typing import List, Tuple
+
+import exchange_calendars as xcals
+import pandas as pd
+import pytest
+import pytz
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.event.log import EventLogMode
+from hypertrade.libs.simulator.event.service import EventManager
+from hypertrade.libs.simulator.execute.broker import BrokerService
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+
+pytest_plugins = ["hypertrade.libs.simulator.tests.benchmark_fixtures"]
+pytestmark = pytest.mark.usefixtures("quiet_logging")
+
+NYTZ = pytz.timezone("America/New_York")
+
+
+@pytest.fixture
+def broker_service() -> BrokerService:
+    EventManager(
+        start_time=pd.Timestamp("2021-10-01 08:00:00", tz=NYTZ),
+        end_time=pd.Timestamp("2021-10-02 20:00:00", tz=NYTZ),
+        event_log_mode=EventLogMode.OFF,
+    )
+    ws = os.path.dirname(__file__)
+    sample_data_path = os.path.join(ws, "../../data/tests/data/ohlvc/sample.csv")
+    dataset = PricesDataset(
+        data_source=OHLVCDataSourceFormat(CSVSource(filepath=sample_data_path)),
+        symbols=["GE", "BA"],
+        name="prices",
+        trading_calendar=xcals.get_calendar("XNYS"),
+    )
+    return BrokerService(dataset=dataset)
+
+
+def _rebalance(n_names: int) -> List[Tuple[Asset, int]]:
+    return [(Asset(sid, f"SYM{sid}", f"Asset {sid}"), 10) for sid in range(n_names)]
+
+
+@pytest.mark.parametrize("n_names", [50, 100, 500])
+@pytest.mark.parametrize("batched", [True, False], ids=["place_orders", "place_order"])
+def test_rebalance_cost_by_portfolio_size(
+    benchmark: BenchmarkFixture,
+    broker_service: BrokerService,
+    n_names: int,
+    batched: bool,
+) -> None:
+    """Cost of placing the orders of a rebalance, should grow linearly with its size"""
+    orders = _rebalance(n_names)
+    event_queue = broker_service.event_manager._event_queue
+
+    def rebalance() -> None:
+        if batched:
+            broker_service.place_orders(orders)
+        else:
+            for asset, amount in orders:
+                broker_service.place_order(asset, amount)
+
+    benchmark.extra_info["orders"] = n_names
+    benchmark.pedantic(rebalance, setup=event_queue.clear, rounds=20, warmup_rounds=1)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -8,13 +8,25 @@ import pytz
 # import hypertrade.libs.debugging  # donotcommit
 from hypertrade.libs.simulator.assets import Asset
 from hypertrade.libs.simulator.event.service import EventManager
+from hypertrade.libs.simulator.event.types import EVENT_TYPE
 from hypertrade.libs.simulator.execute.broker import BrokerService
+from hypertrade.libs.simulator.execute.commission import CommissionModel
+from hypertrade.libs.simulator.execute.ledger import LedgerService
+from hypertrade.libs.simulator.execute.types import Order, Transaction
 from hypertrade.libs.tsfd.datasets.asset import PricesDataset
 from hypertrade.libs.tsfd.sources.csv import CSVSource
 from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
 from hypertrade.libs.tsfd.utils.time import cast_timestamp
 
 
+class PerShareCommission(CommissionModel):
+    """Charges a cent per share traded."""
+
+    @staticmethod
+    def calculate(order: Order, transaction: Transaction) -> float:
+        return abs(transaction.amount) * 0.01
+
+
 class TestBrokerService(unittest.TestCase):
     def setUp(self) -> None:
         nytz = pytz.timezone("America/New_York")
@@ -69,6 +81,50 @@ class TestBrokerService(unittest.TestCase):
         order = self.broker_service.place_order(self.asset, 5)
         self.assertGreater(order.order_placed, self.event_manager.current_time)
 
+    def test_place_orders(self) -> None:
+        """Placing a batch of orders should schedule them together, in order."""
+        assets = [
+            Asset(sid=i, symbol=symbol, asset_name=symbol)
+            for i, symbol in enumerate(["AAPL", "GE", "BA"])
+        ]
+        orders = self.broker_service.place_orders(
+            [(asset, 10 * (i + 1)) for i, asset in enumerate(assets)]
+        )
+        self.assertEqual([order.asset for order in orders], assets)
+        self.assertEqual([order.amount for order in orders], [10, 20, 30])
+        open_time = pd.Timestamp(
+            "2021-10-01 09:30:00", tz=pytz.timezone("America/New_York")
+        )
+        for order in orders:
+            self.assertEqual(order.order_placed, open_time)
+
+        self.event_manager.unsubscribe(
+            EVENT_TYPE.ORDER_PLACED, self.broker_service._execute_trade
+        )
+        next(self.event_manager)  # Advance to market pre open
+        events = [next(self.event_manager) for _ in range(len(orders))]
+        self.assertEqual([event.payload for event in events], orders)
+        self.assertTrue(all(event.time == open_time for event in events))
+
+    def test_commission_recorded_in_ledger(self) -> None:
+        """Fills carry the commission model's charge through to the ledger."""
+        nytz = pytz.timezone("America/New_York")
+        EventManager(
+            start_time=cast_timestamp(pd.Timestamp("2018-10-01 08:00:00", tz=nytz)),
+            end_time=cast_timestamp(pd.Timestamp("2018-10-02 20:00:00", tz=nytz)),
+        )
+        broker_service = BrokerService(
+            dataset=self.dataset, commission_model=PerShareCommission
+        )
+        ledger_service = LedgerService()
+        asset = Asset(sid=1, symbol="GE", asset_name="General Electric")
+        broker_service.place_order(asset, 250)
+        while len(ledger_service.ledger) == 0:
+            next(broker_service.event_manager)
+        transactions = ledger_service.ledger.transactions
+        self.assertEqual(transactions["symbol"].tolist(), ["GE"])
+        self.assertEqual(transactions["commission"].tolist(), [2.5])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+"""Benchmarks for recording fills in the Ledger.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/execute/tests:ledger_benchmarks
+"""
+
+import os
+import sys
+import tempfile
+from typing import List
+
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.execute.ledger import Ledger
+from hypertrade.libs.simulator.execute.types import Transaction
+
+DT = pd.Timestamp("2021-10-01 09:30:00", tz="America/New_York")
+
+
+def _fills(n_fills: int, n_names: int = 500) -> List[Transaction]:
+    assets = [Asset(sid, f"SYM{sid}", f"Asset {sid}") for sid in range(n_names)]
+    return [
+        Transaction(
+            asset=assets[i % n_names],
+            amount=1 if i % 3 else -1,
+            # Rebalances fill every name at the same time
+            dt=DT + pd.Timedelta(minutes=i // n_names),
+            price=100.0,
+            order_id=str(i),
+        )
+        for i in range(n_fills)
+    ]
+
+
+@pytest.mark.parametrize("n_fills", [100_000, 1_000_000])
+def test_record(benchmark: BenchmarkFixture, n_fills: int) -> None:
+    """Cost of recording fills, should grow linearly"""
+    fills = _fills(n_fills)
+
+    def record() -> None:
+        ledger = Ledger()
+        for fill in fills:
+            ledger.record(fill)
+
+    benchmark.extra_info["fills"] = n_fills
+    benchmark.pedantic(record, rounds=3, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("output", ["transactions", "parquet"])
+def test_export(benchmark: BenchmarkFixture, output: str) -> None:
+    """Cost of building the transactions DataFrame or writing Parquet from 1M fills"""
+    ledger = Ledger()
+    for fill in _fills(1_000_000):
+        ledger.record(fill)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        def export() -> None:
+            if output == "parquet":
+                ledger.to_parquet(os.path.join(tmpdir, "transactions.parquet"))
+            else:
+                ledger._transactions = None
+                _ = ledger.transactions
+
+        benchmark.pedantic(export, rounds=3, warmup_rounds=1)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytz
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.event.service import EventManager
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.execute.ledger import Ledger, LedgerService
+from hypertrade.libs.simulator.execute.types import Transaction
+from hypertrade.libs.tsfd.utils.time import cast_timestamp
+
+NYTZ = pytz.timezone("America/New_York")
+APPLE = Asset(sid=1, symbol="AAPL", asset_name="Apple")
+MICROSOFT = Asset(sid=2, symbol="MSFT", asset_name="Microsoft")
+
+
+class TestLedger(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ledger = Ledger()
+        self.dt = pd.Timestamp("2004-01-09 12:18:01", tz=NYTZ)
+        self.fills = [
+            Transaction(APPLE, 483, self.dt, 324.12, "order-1", commission=1.0),
+            Transaction(MICROSOFT, 122, self.dt, 83.10, "order-2"),
+            Transaction(APPLE, -75, self.dt + pd.Timedelta(days=4), 340.43, "order-1"),
+        ]
+        for fill in self.fills:
+            self.ledger.record(fill)
+
+    def test_transactions(self) -> None:
+        """Fills at the same time are all kept"""
+        transactions = self.ledger.transactions
+        self.assertEqual(len(self.ledger), 3)
+        self.assertEqual(list(transactions.index), [fill.dt for fill in self.fills])
+        self.assertEqual(
+            str(pd.DatetimeIndex(transactions.index).tz), "America/New_York"
+        )
+        self.assertEqual(transactions["amount"].tolist(), [483, 122, -75])
+        self.assertEqual(transactions["price"].tolist(), [324.12, 83.10, 340.43])
+        self.assertEqual(transactions["symbol"].tolist(), ["AAPL", "MSFT", "AAPL"])
+        self.assertEqual(transactions["commission"].tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(
+            transactions["order_id"].tolist(), ["order-1", "order-2", "order-1"]
+        )
+
+    def test_transactions_cached(self) -> None:
+        transactions = self.ledger.transactions
+        self.assertIs(self.ledger.transactions, transactions)
+        self.ledger.record(self.fills[0])
+        self.assertEqual(len(self.ledger.transactions), 4)
+
+    def test_to_parquet(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "transactions.parquet")
+            self.ledger.to_parquet(path)
+            data = pq.read_table(path).to_pandas()
+        pd.testing.assert_frame_equal(
+            data.set_index("date").astype({"symbol": object, "order_id": object}),
+            self.ledger.transactions,
+            check_names=False,
+        )
+
+    def test_empty(self) -> None:
+        ledger = Ledger()
+        self.assertTrue(ledger.transactions.empty)
+        self.assertEqual(
+            list(ledger.transactions.columns)[:3], ["amount", "price", "symbol"]
+        )
+
+
+class TestLedgerService(unittest.TestCase):
+
+    def test_record_transaction(self) -> None:
+        start_time = cast_timestamp(pd.Timestamp("2021-10-01 08:00:00", tz=NYTZ))
+        event_manager = EventManager(
+            start_time=start_time,
+            end_time=cast_timestamp(pd.Timestamp("2021-10-02 20:00:00", tz=NYTZ)),
+        )
+        ledger_service = LedgerService()
+        for asset in [APPLE, MICROSOFT]:
+            event_manager.schedule_event(
+                Event(
+                    event_type=EVENT_TYPE.ORDER_FULFILLED,
+                    payload=Transaction(asset, 10, start_time, 100.0, "order"),
+                )
+            )
+        next(event_manager)
+        next(event_manager)
+        self.assertEqual(
+            ledger_service.ledger.transactions["symbol"].tolist(), ["AAPL", "MSFT"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
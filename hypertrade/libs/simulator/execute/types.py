@@ -53,10 +53,17 @@ class Order:
 
 class Transaction:
     def __init__(
-        self, asset: Asset, amount: int, dt: pd.Timestamp, price: float, order_id: str
+        self,
+        asset: Asset,
+        amount: int,
+        dt: pd.Timestamp,
+        price: float,
+        order_id: str,
+        commission: float = 0.0,
     ) -> None:
         self.asset = asset
         self.amount = amount
         self.dt = dt
         self.price = price
         self.order_id = order_id
+        self.commission = commission
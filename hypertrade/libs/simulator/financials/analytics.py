@@ -0,0 +1,299 @@
+"""Risk and performance metrics of the returns and positions of backtests.
+
+Every function takes NumPy arrays with the sessions on the last axis of the returns
+(the second to last of the positions), so the metrics of many runs, e.g. the runs of a
+parameter sweep, are computed at once from a 2-D (runs, sessions) returns matrix:
+
+    returns = np.stack([r.performance_tracker.returns for r in results if r.ok])
+    sharpes = sharpe_ratio(returns)
+
+Metrics are annualized with the `ANNUALIZER` of the returns' `period`. For metrics
+updated during a run, see OnlineMetrics.
+"""
+
+from typing import Dict, cast
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+
+from hypertrade.libs.simulator.constants import ANNUALIZER
+
+Array = npt.NDArray[np.float64]
+Metric = float | Array
+
+
+def _result(value: npt.ArrayLike) -> Metric:
+    """Floats for the metrics of a single run, arrays for a batch of runs."""
+    array = np.asarray(value)
+    return cast(Metric, array.item() if array.ndim == 0 else array)
+
+
+def _divide(numerator: npt.ArrayLike, denominator: npt.ArrayLike) -> Array:
+    """Element-wise division, NaN where the denominator is 0."""
+    num, den = np.broadcast_arrays(
+        np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    )
+    out = np.full(num.shape, np.nan)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def annual_return(returns: Array, period: str = "daily") -> Metric:
+    """Compound annual growth rate of the returns."""
+    returns = np.asarray(returns, dtype=float)
+    wealth = np.prod(1.0 + returns, axis=-1)
+    return _result(wealth ** (ANNUALIZER[period] / returns.shape[-1]) - 1.0)
+
+
+def annual_volatility(returns: Array, period: str = "daily") -> Metric:
+    """Annualized standard deviation of the returns."""
+    std = np.std(returns, axis=-1, ddof=1)
+    return _result(std * np.sqrt(ANNUALIZER[period]))
+
+
+def sharpe_ratio(
+    returns: Array, risk_free: float = 0.0, period: str = "daily"
+) -> Metric:
+    """Annualized mean of the excess returns over their standard deviation.
+
+    Args:
+        returns (np.ndarray): Returns of a run, or of a batch of runs.
+        risk_free (float): Risk free return of a period.
+        period (str): Period of the returns, a key of `ANNUALIZER`.
+    """
+    excess = np.asarray(returns, dtype=float) - risk_free
+    sharpe = _divide(excess.mean(axis=-1), excess.std(axis=-1, ddof=1))
+    return _result(sharpe * np.sqrt(ANNUALIZER[period]))
+
+
+def sortino_ratio(
+    returns: Array, required_return: float = 0.0, period: str = "daily"
+) -> Metric:
+    """Annualized mean of the excess returns over their downside deviation.
+
+    The downside deviation is the root mean square of the returns below
+    `required_return`, so only losses are penalized.
+    """
+    excess = np.asarray(returns, dtype=float) - required_return
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2, axis=-1))
+    sortino = _divide(excess.mean(axis=-1), downside)
+    return _result(sortino * np.sqrt(ANNUALIZER[period]))
+
+
+def _wealth(returns: Array) -> Array:
+    """Cumulative wealth of the returns, starting from 1 before the first one."""
+    returns = np.asarray(returns, dtype=float)
+    start = np.ones(returns.shape[:-1] + (1,))
+    return np.concatenate((start, np.cumprod(1.0 + returns, axis=-1)), axis=-1)
+
+
+def drawdowns(returns: Array) -> Array:
+    """Decline of the wealth from its previous peak after each return, <= 0."""
+    wealth = _wealth(returns)
+    drawdown = wealth / np.maximum.accumulate(wealth, axis=-1) - 1.0
+    return np.asarray(drawdown[..., 1:], dtype=np.float64)
+
+
+def max_drawdown(returns: Array) -> Metric:
+    """Largest decline of the wealth from a previous peak, e.g. -0.2 for 20%."""
+    return _result(np.min(drawdowns(returns), axis=-1, initial=0.0))
+
+
+def max_drawdown_duration(returns: Array) -> Metric:
+    """Longest number of periods the wealth stayed below a previous peak."""
+    wealth = _wealth(returns)
+    at_peak = wealth >= np.maximum.accumulate(wealth, axis=-1)
+    periods = np.arange(wealth.shape[-1])
+    last_peak = np.maximum.accumulate(np.where(at_peak, periods, 0), axis=-1)
+    return _result(np.max(periods - last_peak, axis=-1))
+
+
+def calmar_ratio(returns: Array, period: str = "daily") -> Metric:
+    """Annual return over the magnitude of the maximum drawdown."""
+    return _result(
+        _divide(annual_return(returns, period), -np.asarray(max_drawdown(returns)))
+    )
+
+
+def rolling_volatility(returns: Array, window: int, period: str = "daily") -> Array:
+    """Annualized volatility of each `window` returns, one per window end.
+
+    Returns:
+        Shape of `returns` with `window - 1` fewer sessions.
+    """
+    windows = sliding_window_view(np.asarray(returns, dtype=float), window, axis=-1)
+    volatility = np.std(windows, axis=-1, ddof=1) * np.sqrt(ANNUALIZER[period])
+    return np.asarray(volatility, dtype=np.float64)
+
+
+def rolling_beta(returns: Array, benchmark_returns: Array, window: int) -> Array:
+    """Beta of the returns to the benchmark's over each `window` returns.
+
+    Args:
+        returns (np.ndarray): Returns of a run, or of a batch of runs.
+        benchmark_returns (np.ndarray): Returns of the benchmark over the same
+            sessions, broadcast to the runs.
+        window (int): Number of returns of each window.
+    """
+    windows = sliding_window_view(np.asarray(returns, dtype=float), window, axis=-1)
+    benchmark = sliding_window_view(
+        np.asarray(benchmark_returns, dtype=float), window, axis=-1
+    )
+    benchmark_deviation = benchmark - benchmark.mean(axis=-1, keepdims=True)
+    covariance = np.sum(
+        (windows - windows.mean(axis=-1, keepdims=True)) * benchmark_deviation, axis=-1
+    )
+    return _divide(covariance, np.sum(benchmark_deviation**2, axis=-1))
+
+
+def turnover(amounts: Array, prices: Array, portfolio_values: Array) -> Array:
+    """Value traded in each session as a fraction of the portfolio value.
+
+    Args:
+        amounts (np.ndarray): Net amount of each asset, shape (..., sessions, assets).
+            Positions before the first session are taken as empty.
+        prices (np.ndarray): Price of each asset, the shape of `amounts`.
+        portfolio_values (np.ndarray): Portfolio value, shape (..., sessions).
+    """
+    traded = np.abs(np.diff(amounts, axis=-2, prepend=0.0)) * prices
+    return _divide(traded.sum(axis=-1), portfolio_values)
+
+
+def gross_exposure(amounts: Array, prices: Array, portfolio_values: Array) -> Array:
+    """Value of the long and short positions as a fraction of the portfolio value.
+
+    Arguments are shaped as for `turnover`.
+    """
+    return _divide(np.abs(amounts * prices).sum(axis=-1), portfolio_values)
+
+
+def net_exposure(amounts: Array, prices: Array, portfolio_values: Array) -> Array:
+    """Value of the long minus the short positions as a fraction of the portfolio
+    value.
+
+    Arguments are shaped as for `turnover`.
+    """
+    return _divide((amounts * prices).sum(axis=-1), portfolio_values)
+
+
+def summary(
+    returns: Array, risk_free: float = 0.0, period: str = "daily"
+) -> Dict[str, Metric]:
+    """The return metrics of a run, or of a batch of runs, by name."""
+    return {
+        "annual_return": annual_return(returns, period),
+        "annual_volatility": annual_volatility(returns, period),
+        "sharpe_ratio": sharpe_ratio(returns, risk_free, period),
+        "sortino_ratio": sortino_ratio(returns, risk_free, period),
+        "max_drawdown": max_drawdown(returns),
+        "max_drawdown_duration": max_drawdown_duration(returns),
+        "calmar_ratio": calmar_ratio(returns, period),
+    }
+
+
+class OnlineMetrics:
+    """Return metrics updated with each return of a run, in O(1).
+
+    The mean and variance are kept with Welford's algorithm, and the wealth with its
+    peak for the drawdowns, so the metrics can be read at any point of the run. Their
+    values match the batch functions of the returns seen so far.
+
+    Updating with arrays of returns, one per run, tracks a batch of runs at once.
+
+    Usage:
+        metrics = OnlineMetrics(period="daily")
+        for r in returns:
+            metrics.update(r)
+        metrics.sharpe_ratio
+    """
+
+    def __init__(
+        self, risk_free: float = 0.0, period: str = "daily", runs: int | None = None
+    ) -> None:
+        """
+        Args:
+            risk_free (float): Risk free return of a period, also the required
+                return of the Sortino ratio.
+            period (str): Period of the returns, a key of `ANNUALIZER`.
+            runs (int, optional): Number of runs of a batch, None for a single run.
+        """
+        shape = () if runs is None else (runs,)
+        self.risk_free = risk_free
+        self.period = period
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._downside = np.zeros(shape)
+        self._wealth = np.ones(shape)
+        self._peak = np.ones(shape)
+        self._max_drawdown = np.zeros(shape)
+        self._duration: npt.NDArray[np.int64] = np.zeros(shape, dtype=np.int64)
+        self._max_duration: npt.NDArray[np.int64] = np.zeros(shape, dtype=np.int64)
+
+    def update(self, returns: Metric) -> None:
+        """Add the next return, or the next return of each run."""
+        returns = np.asarray(returns, dtype=float)
+        excess = returns - self.risk_free
+        self.count += 1
+        delta = excess - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (excess - self._mean)
+        self._downside += np.minimum(excess, 0.0) ** 2
+
+        self._wealth *= 1.0 + returns
+        np.maximum(self._peak, self._wealth, out=self._peak)
+        np.minimum(
+            self._max_drawdown, self._wealth / self._peak - 1.0, out=self._max_drawdown
+        )
+        below_peak = self._wealth < self._peak
+        self._duration = np.where(below_peak, self._duration + 1, 0)
+        np.maximum(self._max_duration, self._duration, out=self._max_duration)
+
+    @property
+    def annual_return(self) -> Metric:
+        if self.count == 0:
+            return _result(np.full(self._mean.shape, np.nan))
+        return _result(self._wealth ** (ANNUALIZER[self.period] / self.count) - 1.0)
+
+    @property
+    def annual_volatility(self) -> Metric:
+        return _result(np.sqrt(self._variance() * ANNUALIZER[self.period]))
+
+    @property
+    def sharpe_ratio(self) -> Metric:
+        sharpe = _divide(self._mean, np.sqrt(self._variance()))
+        return _result(sharpe * np.sqrt(ANNUALIZER[self.period]))
+
+    @property
+    def sortino_ratio(self) -> Metric:
+        downside = np.sqrt(_divide(self._downside, np.asarray(self.count)))
+        sortino = _divide(self._mean, downside)
+        return _result(sortino * np.sqrt(ANNUALIZER[self.period]))
+
+    @property
+    def max_drawdown(self) -> Metric:
+        return _result(self._max_drawdown.copy())
+
+    @property
+    def max_drawdown_duration(self) -> Metric:
+        return _result(self._max_duration.copy())
+
+    @property
+    def calmar_ratio(self) -> Metric:
+        return _result(_divide(self.annual_return, -self._max_drawdown))
+
+    def summary(self) -> Dict[str, Metric]:
+        """The metrics by name, as `summary` of the returns seen so far."""
+        return {
+            "annual_return": self.annual_return,
+            "annual_volatility": self.annual_volatility,
+            "sharpe_ratio": self.sharpe_ratio,
+            "sortino_ratio": self.sortino_ratio,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_duration": self.max_drawdown_duration,
+            "calmar_ratio": self.calmar_ratio,
+        }
+
+    def _variance(self) -> Array:
+        return _divide(self._m2, np.asarray(max(self.count - 1, 0)))
@@ -1,21 +1,33 @@
-from copy import deepcopy
-from typing import Optional
+import datetime
+from typing import Dict, List, Optional
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from loguru import logger
 
 from hypertrade.libs.service.locator import ServiceLocator, register_service
 from hypertrade.libs.simulator.event.service import EventManager
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, HandlerPriority
+from hypertrade.libs.simulator.financials.analytics import OnlineMetrics
 from hypertrade.libs.simulator.financials.portfolio import Portfolio, PortfolioManager
 from hypertrade.libs.simulator.market_types import PriceChangeData
 
+# Number of sessions the tracker has room for when it isn't sized from a calendar
+DEFAULT_CAPACITY = 252
+
 
 class PerformanceTracker:
     """Historical performance metrics for a trading strategy.
 
     This class tracks daily returns and positions of a trading strategy.
 
+    Each session's portfolio value, cash, and net amount and price of every asset are
+    recorded into NumPy buffers. The buffers are preallocated for `capacity` sessions
+    and double when full. `daily_returns` and `daily_positions` are built from them
+    when accessed. The return metrics of the sessions so far are kept up to date in
+    `metrics`, see the analytics module for the other metrics of the buffers.
+
     attributes
     ----------
     daily_returns : pd.Series
@@ -27,22 +39,50 @@ class PerformanceTracker:
             2015-07-20    0.030957
             2015-07-21    0.004902
     daily_positions : pd.DataFrame, optional
-        Daily net position values.
-         - Time series of dollar amount invested in each position and cash.
-         - Days where stocks are not held can be represented by 0 or NaN.
-         - Non-working capital is labelled 'cash'
+        Daily net position amounts.
+         - Time series of the number of shares held of each asset.
+         - Days where stocks are not held are represented by 0.
          - Example:
-            index         'AAPL'         'MSFT'          cash
-            2004-01-09    13939.3800     -14012.9930     711.5585
-            2004-01-12    14492.6300     -14624.8700     27.1821
-            2004-01-13    -13853.2800    13653.6400      -43.6375
+            index         'AAPL'         'MSFT'
+            2004-01-09    100            -80
+            2004-01-12    100            -90
+            2004-01-13    -95            90
+    dates : pd.DatetimeIndex
+        Dates of the sessions recorded.
+    symbols : List[str]
+        Symbols of the columns of `amounts` and `prices`.
+    portfolio_values, cash : np.ndarray
+        Portfolio value and cash at each session, shape (sessions,).
+    amounts, prices : np.ndarray
+        Net amount and market price of each asset at each session, shape
+        (sessions, assets).
+    metrics : OnlineMetrics
+        Sharpe, Sortino, drawdowns etc. of the daily returns so far.
 
     """
 
-    def __init__(self) -> None:
-        self.daily_returns: pd.Series = pd.Series(dtype=float)
-        self.daily_positions: pd.DataFrame = pd.DataFrame()
-        self._previous_portfolio: Optional[Portfolio] = None
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Args:
+            capacity (int): Number of sessions to preallocate, e.g. the number of
+                sessions of the simulation.
+        """
+        capacity = max(capacity, 1)
+        self._count = 0
+        self._dates_ns: npt.NDArray[np.int64] = np.zeros(capacity, dtype=np.int64)
+        self._tz: Optional[datetime.tzinfo] = None
+        self._portfolio_values: npt.NDArray[np.float64] = np.zeros(capacity)
+        self._cash: npt.NDArray[np.float64] = np.zeros(capacity)
+        self._symbols: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._amounts: npt.NDArray[np.float64] = np.zeros((capacity, 0))
+        self._prices: npt.NDArray[np.float64] = np.zeros((capacity, 0))
+        self._daily_returns: Optional[pd.Series] = None
+        self._daily_positions: Optional[pd.DataFrame] = None
+        self.metrics = OnlineMetrics(period="daily")
+
+    def __len__(self) -> int:
+        return self._count
 
     def record_daily_metrics(
         self,
@@ -50,21 +90,124 @@ class PerformanceTracker:
         portfolio: Portfolio,
     ) -> None:
         """Update daily performance metrics."""
+        if self._count == len(self._dates_ns):
+            self._grow_sessions()
+        symbols = portfolio.symbols
+        if symbols[: len(self._symbols)] == self._symbols:
+            # The book only appends assets, so its slots are the first columns
+            self._add_columns(symbols[len(self._symbols) :])
+            columns: slice | List[int] = slice(0, len(symbols))
+        else:
+            # The book was replaced, find the column of each of its assets
+            self._add_columns([s for s in symbols if s not in self._columns])
+            columns = [self._columns[symbol] for symbol in symbols]
+            self._amounts[self._count] = 0.0
+            self._prices[self._count] = 0.0
 
-        # Record daily returns if positions are held
-        if self._previous_portfolio is not None:
-            self.daily_returns.loc[date] = (
-                portfolio.portfolio_value - self._previous_portfolio.portfolio_value
-            ) / self._previous_portfolio.portfolio_value
+        i = self._count
+        if i == 0:
+            self._tz = date.tz
+        self._dates_ns[i] = date.value
+        self._portfolio_values[i] = portfolio.portfolio_value
+        if i > 0 and self._portfolio_values[i - 1] != 0:
+            # A session after one without value has no return, see `returns`
+            previous = self._portfolio_values[i - 1]
+            self.metrics.update((self._portfolio_values[i] - previous) / previous)
+        self._cash[i] = portfolio.cash
+        self._amounts[i, columns] = portfolio.amounts
+        self._prices[i, columns] = portfolio.prices
+        self._count += 1
+        self._daily_returns = None
+        self._daily_positions = None
 
-        current_positions_df = pd.DataFrame(
-            portfolio.positions.groupby(level=0).sum()["amount"].to_dict(),
-            index=pd.Index([date]),
-        )
-        self.daily_positions = pd.concat(
-            [self.daily_positions, current_positions_df], axis=0
+    def _grow_sessions(self) -> None:
+        """Double the number of sessions of the buffers, amortized O(1) per session."""
+        capacity = 2 * len(self._dates_ns)
+        self._dates_ns = np.resize(self._dates_ns, capacity)
+        self._portfolio_values = np.resize(self._portfolio_values, capacity)
+        self._cash = np.resize(self._cash, capacity)
+        self._amounts = self._resize(self._amounts, capacity, self._amounts.shape[1])
+        self._prices = self._resize(self._prices, capacity, self._prices.shape[1])
+
+    def _add_columns(self, symbols: List[str]) -> None:
+        if not symbols:
+            return
+        for symbol in symbols:
+            self._columns[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        if len(self._symbols) > self._amounts.shape[1]:
+            # Double the assets too, books usually grow one asset at a time
+            n_columns = max(len(self._symbols), 2 * self._amounts.shape[1])
+            self._amounts = self._resize(self._amounts, len(self._dates_ns), n_columns)
+            self._prices = self._resize(self._prices, len(self._dates_ns), n_columns)
+
+    @staticmethod
+    def _resize(
+        buffer: npt.NDArray[np.float64], rows: int, columns: int
+    ) -> npt.NDArray[np.float64]:
+        resized: npt.NDArray[np.float64] = np.zeros((rows, columns))
+        resized[: buffer.shape[0], : buffer.shape[1]] = buffer
+        return resized
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        dates = pd.to_datetime(self._dates_ns[: self._count])
+        if self._tz is not None:
+            dates = dates.tz_localize("UTC").tz_convert(self._tz)
+        return pd.DatetimeIndex(dates)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def portfolio_values(self) -> npt.NDArray[np.float64]:
+        return self._portfolio_values[: self._count]
+
+    @property
+    def cash(self) -> npt.NDArray[np.float64]:
+        return self._cash[: self._count]
+
+    @property
+    def amounts(self) -> npt.NDArray[np.float64]:
+        return self._amounts[: self._count, : len(self._symbols)]
+
+    @property
+    def prices(self) -> npt.NDArray[np.float64]:
+        return self._prices[: self._count, : len(self._symbols)]
+
+    @property
+    def returns(self) -> npt.NDArray[np.float64]:
+        """Returns of every session but the first, which has no previous value.
+
+        The return of a session after one where the portfolio was worth nothing is
+        NaN, and isn't part of the online `metrics`.
+        """
+        values = self.portfolio_values
+        previous = values[:-1]
+        return np.divide(
+            values[1:] - previous,
+            previous,
+            out=np.full(len(previous), np.nan),
+            where=previous != 0,
         )
-        self._previous_portfolio = deepcopy(portfolio)
+
+    @property
+    def daily_returns(self) -> pd.Series:
+        if self._daily_returns is None:
+            if self._count < 2:
+                self._daily_returns = pd.Series(dtype=float)
+            else:
+                self._daily_returns = pd.Series(self.returns, index=self.dates[1:])
+        return self._daily_returns
+
+    @property
+    def daily_positions(self) -> pd.DataFrame:
+        if self._daily_positions is None:
+            self._daily_positions = pd.DataFrame(
+                self.amounts.copy(), index=self.dates, columns=self.symbols
+            )
+        return self._daily_positions
 
 
 METRICS_SERVICE_NAME = "metrics_service"
@@ -86,9 +229,18 @@ class PerformanceTrackingService:
         self.portfolio_manager = ServiceLocator[PortfolioManager]().get(
             PortfolioManager.SERVICE_NAME
         )
-        self.performance_tracker = PerformanceTracker()
+        # Size the tracker's buffers for the sessions of the simulation
+        closes = self.event_manager._market_events.calendar.closes_nanos
+        sessions = np.searchsorted(
+            closes, self.event_manager.end_time.value, side="right"
+        ) - np.searchsorted(closes, self.event_manager.current_time.value)
+        self.performance_tracker = PerformanceTracker(capacity=int(sessions))
 
-        self.event_manager.subscribe(EVENT_TYPE.PRICE_CHANGE, self.record_daily_metrics)
+        self.event_manager.subscribe(
+            EVENT_TYPE.PRICE_CHANGE,
+            self.record_daily_metrics,
+            priority=HandlerPriority.ANALYTICS,
+        )
 
     def record_daily_metrics(self, event: Event[PriceChangeData]) -> None:
         """Record daily metrics."""
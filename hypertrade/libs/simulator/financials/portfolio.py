@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import pandera as pa
 from loguru import logger
 
 from hypertrade.libs.service.locator import ServiceLocator, register_service
 from hypertrade.libs.simulator.event.service import EventManager
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, HandlerPriority
 from hypertrade.libs.simulator.execute.types import Transaction
 from hypertrade.libs.simulator.market_types import PriceChangeData
 from hypertrade.libs.tsfd.datasets.asset import PricesDataset
@@ -16,6 +19,12 @@ from hypertrade.libs.tsfd.datasets.asset import PricesDataset
 PRICES_SCHEMA: pa.SeriesSchema = pa.SeriesSchema()
 
 
+# Initial number of assets the position book has room for, doubled when it is full
+_INITIAL_CAPACITY = 16
+
+POSITIONS_COLUMNS = ["amount", "cost_basis"]
+
+
 class Portfolio:
     """Object providing read-only access to current portfolio state.
 
@@ -24,6 +33,14 @@ class Portfolio:
     actions. It is only used to provide information about the current state of
     the portfolio at any given point in time.
 
+    Positions are kept in a position book: every asset traded gets a slot in arrays of
+    net amounts, cost bases, market prices and values. The lots of the fills are
+    appended to a log, which `positions` turns into a DataFrame when it is accessed.
+
+    The value of the positions is a running total. A fill or a price change only
+    updates the slots of the assets it changes, and adds the change of their values to
+    the total, so reading `portfolio_value` is O(1) however large the book is.
+
     attributes
     ----------
         positions : pd.DataFrame
@@ -36,6 +53,11 @@ class Portfolio:
                 AAPL    2004-01-20 16:00:00     10          27.00
                 GE      2004-02-10 09:30:00     2           50.50
 
+        net_positions : pd.Series
+            Net amount held of each asset traded, indexed by symbol.
+
+        cost_basis : pd.Series
+            Average price paid for the net amount of each asset, indexed by symbol.
 
         cash : float
             Amount of cash currently held in portfolio.
@@ -50,6 +72,10 @@ class Portfolio:
         capital_used : float
             Amount of capital used in the current period.
 
+        current_market_prices : pd.Series
+            Latest price of each asset traded, indexed by symbol. Assets are valued at
+            the price of their first fill until a market price is set.
+
         current_portfolio_weights : pd.Series
             Series containing the percentage of the portfolio invested in each asset.
             The index is the asset symbol and the values are the percentage of the
@@ -75,53 +101,194 @@ class Portfolio:
             cash, current cash, and portfolio value.
 
         """
-        self.positions: pd.DataFrame = pd.DataFrame(
-            # trunk-ignore(pyright/reportArgumentType)
-            columns=["amount", "cost_basis"],
-            index=pd.MultiIndex.from_arrays([[], []]),
-        )
         self.starting_cash = capital_base
         self.cash = capital_base
-        self._current_market_prices: pd.Series = pd.Series()
+        self._reset_positions()
+
+    def _reset_positions(self) -> None:
+        # Slot of each symbol in the book
+        self._symbol_slots: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._amounts: npt.NDArray[np.float64] = np.zeros(_INITIAL_CAPACITY)
+        self._cost_basis: npt.NDArray[np.float64] = np.zeros(_INITIAL_CAPACITY)
+        self._prices: npt.NDArray[np.float64] = np.zeros(_INITIAL_CAPACITY)
+        self._values: npt.NDArray[np.float64] = np.zeros(_INITIAL_CAPACITY)
+        self._positions_value = 0.0
+        # Append-only log of the lots, (symbol, time, amount, price)
+        self._lots: List[Tuple[str, pd.Timestamp, float, float]] = []
+        self._positions: Optional[pd.DataFrame] = None
+        self._invalidate()
+
+    def _slot(self, symbol: str, price: float) -> int:
+        """Slot of the asset, added to the book at `price` if it wasn't traded before.
+
+        Slots are keyed by symbol, the key of the prices and of the views.
+        """
+        slot = self._symbol_slots.get(symbol)
+        if slot is None:
+            slot = len(self._symbols)
+            if slot == len(self._amounts):
+                self._grow()
+            self._symbols.append(symbol)
+            self._symbol_slots[symbol] = slot
+            self._prices[slot] = price
+        return slot
+
+    def _grow(self) -> None:
+        """Double the capacity of the book, so adding assets is amortized O(1)."""
+        padding = np.zeros(len(self._amounts))
+        self._amounts = np.concatenate((self._amounts, padding))
+        self._cost_basis = np.concatenate((self._cost_basis, padding))
+        self._prices = np.concatenate((self._prices, padding))
+        self._values = np.concatenate((self._values, padding))
+
+    def _add_lot(
+        self,
+        symbol: str,
+        dt: pd.Timestamp,
+        amount: float,
+        price: float,
+    ) -> None:
+        slot = self._slot(symbol, price)
+        held = float(self._amounts[slot])
+        net = held + amount
+        if net == 0:
+            cost_basis = 0.0
+        elif held == 0 or (held > 0) != (net > 0):
+            # Opened, or closed and opened in the other direction
+            cost_basis = price
+        elif abs(net) > abs(held):
+            cost_basis = (float(self._cost_basis[slot]) * held + price * amount) / net
+        else:
+            # Reducing a position doesn't change the price paid for the rest
+            cost_basis = float(self._cost_basis[slot])
+        self._amounts[slot] = net
+        self._cost_basis[slot] = cost_basis
+        value = net * float(self._prices[slot])
+        self._positions_value += value - float(self._values[slot])
+        self._values[slot] = value
+        self._lots.append((symbol, dt, amount, price))
+        self._positions = None
+        self._invalidate()
 
     def update(self, tx: Transaction) -> None:
         """Update the portfolio given a processed transaction"""
-        # Set the positions dataframe (indexed by (symbol, time)) to the number of shares and cost basis (i.e. original price)
-        self.positions.loc[(tx.asset.symbol, tx.dt), :] = [tx.amount, tx.price]
+        self._add_lot(tx.asset.symbol, tx.dt, tx.amount, tx.price)
         self.cash -= tx.amount * tx.price
 
+    @property
+    def positions(self) -> pd.DataFrame:
+        """Lots held in the portfolio, built from the lot log when accessed."""
+        if self._positions is None:
+            self._positions = pd.DataFrame(
+                [(amount, price) for _, _, amount, price in self._lots],
+                # trunk-ignore(pyright/reportArgumentType)
+                columns=POSITIONS_COLUMNS,
+                index=pd.MultiIndex.from_arrays(
+                    [
+                        [symbol for symbol, _, _, _ in self._lots],
+                        [dt for _, dt, _, _ in self._lots],
+                    ]
+                ),
+                dtype=float,
+            )
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions: pd.DataFrame) -> None:
+        """Replace the positions with the lots of a (symbol, time) indexed DataFrame."""
+        self._reset_positions()
+        for (symbol, dt), amount, cost_basis in zip(
+            positions.index, positions["amount"], positions["cost_basis"]
+        ):
+            self._add_lot(symbol, dt, float(amount), float(cost_basis))
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols of the assets traded, in the order of the book."""
+        return list(self._symbols)
+
+    @property
+    def amounts(self) -> npt.NDArray[np.float64]:
+        """Read-only view of the net amounts, in the order of `symbols`."""
+        view = self._amounts[: len(self._symbols)]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def prices(self) -> npt.NDArray[np.float64]:
+        """Read-only view of the market prices, in the order of `symbols`."""
+        view = self._prices[: len(self._symbols)]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def net_positions(self) -> pd.Series:
+        n = len(self._symbols)
+        return pd.Series(self._amounts[:n].copy(), index=self.symbols, name="amount")
+
+    @property
+    def cost_basis(self) -> pd.Series:
+        n = len(self._symbols)
+        return pd.Series(
+            self._cost_basis[:n].copy(), index=self.symbols, name="cost_basis"
+        )
+
     @property
     def current_market_prices(self) -> pd.Series:
-        return self._current_market_prices
+        n = len(self._symbols)
+        return pd.Series(self._prices[:n].copy(), index=self.symbols, name="price")
 
     @current_market_prices.setter
     def current_market_prices(self, prices: pd.Series) -> None:
-        # Invalidate cached properties
-        if hasattr(self, "positions_value"):
-            delattr(self, "positions_value")
-        if hasattr(self, "portfolio_value"):
-            delattr(self, "portfolio_value")
-        if hasattr(self, "current_portfolio_weights"):
-            delattr(self, "current_portfolio_weights")
-        self._current_market_prices = prices
+        """Set the prices of every asset of the book, those without a price are
+        valued at 0."""
+        n = len(self._symbols)
+        self._reprice(
+            np.arange(n), prices.reindex(self._symbols).fillna(0.0).to_numpy(float)
+        )
+        # Sum the values again, so rounding errors of the deltas don't accumulate
+        self._positions_value = float(self._values[:n].sum())
 
-    @cached_property
-    def positions_value(self) -> float:
-        """Calculate the total value of all positions in the portfolio."""
-        if self.positions.empty:
-            return 0.0
+    def update_market_prices(self, prices: pd.Series) -> None:
+        """Update the prices of the assets in `prices`, indexed by symbol.
 
-        symbol_positions = self.positions.groupby(level=0).sum()["amount"]
-        return float((self.current_market_prices * symbol_positions).sum())
+        Only the assets whose price changed are revalued, the others keep their
+        latest price. Prices of assets that aren't in the book, and missing prices,
+        are ignored.
+        """
+        # Price of each slot, NaN for the symbols that aren't in `prices`
+        values = prices.reindex(self._symbols).to_numpy(float)
+        slots = np.flatnonzero(~np.isnan(values))
+        self._reprice(slots, values[slots])
 
-    @cached_property
+    def _reprice(
+        self, slots: npt.NDArray[np.intp], prices: npt.NDArray[np.float64]
+    ) -> None:
+        """Revalue the slots whose price changed, adding the delta to the total."""
+        changed = prices != self._prices[slots]
+        if not changed.any():
+            return
+        slots = slots[changed]
+        values = self._amounts[slots] * prices[changed]
+        self._positions_value += float((values - self._values[slots]).sum())
+        self._prices[slots] = prices[changed]
+        self._values[slots] = values
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Invalidate cached properties"""
+        self.__dict__.pop("current_portfolio_weights", None)
+
+    @property
+    def positions_value(self) -> float:
+        """Total value of all positions in the portfolio."""
+        return self._positions_value
+
+    @property
     def portfolio_value(self) -> float:
-        """Calculate the total value of the portfolio at the current time."""
-        total_value: float = self.cash
-        if not self.positions.empty:
-            symbol_positions = self.positions.groupby(level=0).sum()["amount"]
-            total_value += float((self.current_market_prices * symbol_positions).sum())
-        return total_value
+        """Total value of the portfolio at the current time."""
+        return self.cash + self._positions_value
 
     @cached_property
     def current_portfolio_weights(self) -> pd.Series:
@@ -133,12 +300,11 @@ class Portfolio:
         futures contract's value is its unit price times number of shares held
         times the multiplier.
         """
-        if self.positions.empty or self.current_market_prices.empty:
+        if not self._symbols:
             return pd.Series()
 
-        symbol_positions = self.positions.groupby(level=0).sum()["amount"]
-        sym_value = symbol_positions * self.current_market_prices
-        return sym_value / sym_value.sum()
+        n = len(self._symbols)
+        return pd.Series(self._values[:n] / self._positions_value, index=self.symbols)
 
 
 PORTFOLIO_SERVICE_NAME = "portfolio_service"
@@ -179,24 +345,30 @@ class PortfolioManager:
 
         service_locator = ServiceLocator[EventManager]()
         self.event_manager = service_locator.get(EventManager.SERVICE_NAME)
-        self.event_manager.subscribe(EVENT_TYPE.ORDER_FULFILLED, self.update_positions)
-        self.event_manager.subscribe(EVENT_TYPE.PRICE_CHANGE, self.handle_price_change)
+        self.event_manager.subscribe(
+            EVENT_TYPE.ORDER_FULFILLED,
+            self.update_positions,
+            priority=HandlerPriority.ACCOUNTING,
+        )
+        self.event_manager.subscribe(
+            EVENT_TYPE.PRICE_CHANGE,
+            self.handle_price_change,
+            priority=HandlerPriority.ACCOUNTING,
+        )
         self.dataset = dataset
         self.portfolio = Portfolio(capital_base=capital_base)
 
     def _set_portfolio_market_price(self) -> None:
         """Set the current market prices for the portfolio's positions."""
-        assets = self.portfolio.positions.groupby(level=0).sum().index.to_list()
         prices = self.dataset[self.event_manager.current_time]["price"]
-        filtered_prices = prices.filter(assets)
-        if isinstance(filtered_prices, pd.Series):
-            self.portfolio.current_market_prices = filtered_prices
+        if isinstance(prices, pd.Series):
+            self.portfolio.update_market_prices(prices)
         else:
             raise ValueError("Prices df is not a series")
 
     def handle_price_change(self, event: Event[PriceChangeData]) -> None:
         """Handle price change events and invalidate the portfolio's cached properties."""
-        if not self.portfolio.positions.empty:
+        if self.portfolio.symbols:
             logger.bind(simulation_time=self.event_manager.current_time).debug(
                 "Setting new market prices on portfolio object"
             )
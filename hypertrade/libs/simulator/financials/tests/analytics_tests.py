@@ -0,0 +1,129 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.simulator.constants import ANNUALIZER
+from hypertrade.libs.simulator.financials import analytics
+from hypertrade.libs.simulator.financials.analytics import OnlineMetrics
+
+
+class TestAnalytics(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        # 4 runs of 500 daily returns
+        self.returns = rng.normal(0.0005, 0.01, size=(4, 500))
+
+    def test_sharpe_ratio(self) -> None:
+        returns = pd.Series(self.returns[0])
+        expected = returns.mean() / returns.std() * np.sqrt(ANNUALIZER["daily"])
+        self.assertAlmostEqual(analytics.sharpe_ratio(self.returns[0]), expected)
+        self.assertAlmostEqual(
+            analytics.sharpe_ratio(self.returns[0], risk_free=0.0001),
+            (returns - 0.0001).mean() / returns.std() * np.sqrt(ANNUALIZER["daily"]),
+        )
+        # A portfolio without positions has no volatility
+        self.assertTrue(np.isnan(analytics.sharpe_ratio(np.zeros(10))))
+
+    def test_sortino_ratio(self) -> None:
+        returns = np.array([0.02, -0.01, 0.03, -0.02])
+        downside = np.sqrt((0.01**2 + 0.02**2) / 4)
+        self.assertAlmostEqual(
+            analytics.sortino_ratio(returns, period="hourly"),
+            0.005 / downside * np.sqrt(ANNUALIZER["hourly"]),
+        )
+
+    def test_drawdowns(self) -> None:
+        # Wealth 1.1, 0.99, 1.089, 1.2, 0.96
+        returns = np.array([0.1, -0.1, 0.1, 1.2 / 1.089 - 1, -0.2])
+        self.assertAlmostEqual(float(analytics.max_drawdown(returns)), -0.2)
+        self.assertEqual(analytics.max_drawdown_duration(returns), 2)
+        self.assertEqual(analytics.max_drawdown(np.array([0.01, 0.02])), 0.0)
+        self.assertEqual(analytics.max_drawdown_duration(np.array([-0.01] * 3)), 3)
+
+        wealth = np.cumprod(1 + self.returns[1])
+        expected = (wealth / np.maximum.accumulate(np.maximum(wealth, 1)) - 1).min()
+        self.assertAlmostEqual(analytics.max_drawdown(self.returns[1]), expected)
+
+    def test_calmar_ratio(self) -> None:
+        returns = self.returns[2]
+        annual_return = np.prod(1 + returns) ** (250 / 500) - 1
+        self.assertAlmostEqual(analytics.annual_return(returns), annual_return)
+        self.assertAlmostEqual(
+            analytics.calmar_ratio(returns),
+            annual_return / -analytics.max_drawdown(returns),
+        )
+        self.assertTrue(np.isnan(analytics.calmar_ratio(np.array([0.01, 0.02]))))
+
+    def test_rolling(self) -> None:
+        returns = pd.Series(self.returns[0])
+        benchmark = pd.Series(self.returns[1])
+        volatility = analytics.rolling_volatility(self.returns[0], window=20)
+        self.assertEqual(volatility.shape, (481,))
+        np.testing.assert_allclose(
+            volatility,
+            returns.rolling(20).std().dropna() * np.sqrt(ANNUALIZER["daily"]),
+        )
+        beta = analytics.rolling_beta(self.returns[0], self.returns[1], window=20)
+        np.testing.assert_allclose(
+            beta,
+            (returns.rolling(20).cov(benchmark) / benchmark.rolling(20).var()).dropna(),
+        )
+
+    def test_positions(self) -> None:
+        amounts = np.array([[10.0, 0.0], [10.0, -5.0], [0.0, -5.0]])
+        prices = np.array([[10.0, 20.0], [11.0, 20.0], [12.0, 18.0]])
+        values = np.array([1000.0, 1010.0, 1020.0])
+        np.testing.assert_allclose(
+            analytics.turnover(amounts, prices, values),
+            [100 / 1000, 100 / 1010, 120 / 1020],
+        )
+        np.testing.assert_allclose(
+            analytics.gross_exposure(amounts, prices, values),
+            [100 / 1000, 210 / 1010, 90 / 1020],
+        )
+        np.testing.assert_allclose(
+            analytics.net_exposure(amounts, prices, values),
+            [100 / 1000, 10 / 1010, -90 / 1020],
+        )
+
+    def test_batch(self) -> None:
+        """Metrics of a returns matrix are those of each run"""
+        batch = analytics.summary(self.returns)
+        for i in range(len(self.returns)):
+            for name, value in analytics.summary(self.returns[i]).items():
+                self.assertAlmostEqual(np.asarray(batch[name])[i], value, msg=name)
+
+        amounts = np.ones((4, 500, 3))
+        prices = np.ones((4, 500, 3))
+        self.assertEqual(
+            analytics.turnover(amounts, prices, np.ones((4, 500))).shape, (4, 500)
+        )
+
+    def test_online(self) -> None:
+        """Online metrics match the batch metrics of the returns so far"""
+        metrics = OnlineMetrics(risk_free=0.0001)
+        batch = OnlineMetrics(risk_free=0.0001, runs=4)
+        for t in range(self.returns.shape[1]):
+            metrics.update(self.returns[0, t])
+            batch.update(self.returns[:, t])
+            if t in (1, 100, 499):
+                expected = analytics.summary(self.returns[:, : t + 1], risk_free=0.0001)
+                for name, value in metrics.summary().items():
+                    self.assertAlmostEqual(
+                        value, np.asarray(expected[name])[0], msg=name
+                    )
+                for name, values in batch.summary().items():
+                    np.testing.assert_allclose(values, expected[name], err_msg=name)
+
+    def test_online_no_returns(self) -> None:
+        metrics = OnlineMetrics()
+        self.assertTrue(np.isnan(metrics.sharpe_ratio))
+        self.assertTrue(np.isnan(metrics.annual_return))
+        self.assertEqual(metrics.max_drawdown, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Benchmarks for recording daily metrics with the PerformanceTracker.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/financials/tests:performance_benchmarks
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.execute.types import Transaction
+from hypertrade.libs.simulator.financials.performance import PerformanceTracker
+from hypertrade.libs.simulator.financials.portfolio import Portfolio
+
+# 30 years of daily sessions
+SESSIONS = 30 * 252
+N_NAMES = 500
+
+
+@pytest.mark.parametrize("presized", [True, False], ids=["presized", "growing"])
+def test_daily_backtest(benchmark: BenchmarkFixture, presized: bool) -> None:
+    """Cost of recording the sessions of a 30 year daily backtest of 500 names"""
+    portfolio = Portfolio(capital_base=1e7)
+    dt = pd.Timestamp("1990-01-02 16:00:00", tz="America/New_York")
+    for sid in range(N_NAMES):
+        asset = Asset(sid, f"SYM{sid}", f"Asset {sid}")
+        portfolio.update(
+            Transaction(asset=asset, amount=100, dt=dt, price=100.0, order_id="b")
+        )
+    dates = pd.date_range(dt, periods=SESSIONS, freq="B")
+    prices = 100.0 * np.exp(
+        np.cumsum(np.random.default_rng(0).normal(0, 0.01, (SESSIONS, N_NAMES)), 0)
+    )
+    symbols = portfolio.symbols
+
+    def backtest() -> PerformanceTracker:
+        tracker = PerformanceTracker(capacity=SESSIONS if presized else 1)
+        for date, session_prices in zip(dates, prices):
+            portfolio.current_market_prices = pd.Series(session_prices, index=symbols)
+            tracker.record_daily_metrics(date=date, portfolio=portfolio)
+        _ = tracker.daily_returns
+        _ = tracker.daily_positions
+        return tracker
+
+    benchmark.extra_info["sessions"] = SESSIONS
+    benchmark.extra_info["names"] = N_NAMES
+    benchmark.pedantic(backtest, rounds=3, warmup_rounds=1)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
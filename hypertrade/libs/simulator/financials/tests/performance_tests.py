@@ -1,8 +1,12 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from hypertrade.libs.logging.setup import initialize_logging
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.execute.types import Transaction
+from hypertrade.libs.simulator.financials import analytics
 from hypertrade.libs.simulator.financials.performance import PerformanceTracker
 from hypertrade.libs.simulator.financials.portfolio import Portfolio
 from hypertrade.libs.tsfd.utils.time import cast_timestamp
@@ -42,14 +46,13 @@ class TestPerformanceTracker(unittest.TestCase):
             data,
             # trunk-ignore(pyright/reportArgumentType)
             columns=["symbol", "dt", "amount", "cost_basis"],
-        )
-        self.portfolio.positions.set_index(["symbol", "dt"], inplace=True)
+        ).set_index(["symbol", "dt"])
 
     def test_performance_tracker_initialization(self) -> None:
         """Basic initialization of the PerformanceTracker object"""
         self.assertEqual(self.performance_tracker.daily_returns.empty, True)
         self.assertEqual(self.performance_tracker.daily_positions.empty, True)
-        self.assertEqual(self.performance_tracker._previous_portfolio, None)
+        self.assertEqual(len(self.performance_tracker), 0)
 
     def test_first_day_record_daily_metrics(self) -> None:
         """First day recording metrics shouldn't record daily returns"""
@@ -104,6 +107,75 @@ class TestPerformanceTracker(unittest.TestCase):
             places=4,
         )
 
+    def test_buffers_grow(self) -> None:
+        """Sessions and assets are added past the preallocated capacity"""
+        tracker = PerformanceTracker(capacity=1)
+        portfolio = Portfolio(capital_base=1000.0)
+        dates = pd.date_range("2019-01-01", periods=10, tz="America/New_York")
+        for i, date in enumerate(dates):
+            symbol = f"SYM{i}"
+            portfolio.update(
+                Transaction(
+                    asset=Asset(sid=i, symbol=symbol, asset_name=symbol),
+                    amount=i + 1,
+                    dt=date,
+                    price=10.0,
+                    order_id="testing",
+                )
+            )
+            portfolio.update_market_prices(pd.Series(11.0, index=portfolio.symbols))
+            tracker.record_daily_metrics(date=date, portfolio=portfolio)
+
+        self.assertEqual(len(tracker), 10)
+        pd.testing.assert_index_equal(tracker.dates, dates, check_names=False)
+        self.assertEqual(tracker.amounts.shape, (10, 10))
+        self.assertEqual(tracker.symbols, [f"SYM{i}" for i in range(10)])
+        self.assertEqual(tracker.daily_positions["SYM3"].tolist(), [0] * 3 + [4] * 7)
+        self.assertEqual(tracker.prices[-1].tolist(), [11.0] * 10)
+        self.assertEqual(tracker.portfolio_values[-1], portfolio.portfolio_value)
+        self.assertEqual(tracker.daily_returns.index[0], dates[1])
+        for name, value in analytics.summary(tracker.returns).items():
+            np.testing.assert_allclose(
+                tracker.metrics.summary()[name], value, err_msg=name
+            )
+        self.assertAlmostEqual(
+            tracker.daily_returns.iloc[0],
+            (tracker.portfolio_values[1] - tracker.portfolio_values[0])
+            / tracker.portfolio_values[0],
+        )
+
+    def test_zero_portfolio_value(self) -> None:
+        """Sessions after one without value have no return, and don't skew metrics"""
+        tracker = PerformanceTracker()
+        portfolio = Portfolio()
+        dates = pd.date_range("2019-01-01", periods=4, tz="America/New_York")
+        tracker.record_daily_metrics(date=dates[0], portfolio=portfolio)
+        for date, cash in zip(dates[1:], [1000.0, 1020.0, 1009.8]):
+            portfolio.cash = cash
+            tracker.record_daily_metrics(date=date, portfolio=portfolio)
+
+        np.testing.assert_allclose(tracker.returns, [np.nan, 0.02, -0.01])
+        self.assertEqual(tracker.metrics.count, 2)
+        for name, value in analytics.summary(tracker.returns[1:]).items():
+            np.testing.assert_allclose(
+                tracker.metrics.summary()[name], value, err_msg=name
+            )
+
+    def test_positions_replaced(self) -> None:
+        """Assets are recorded in their own column when the book is replaced"""
+        self.portfolio.current_market_prices = pd.Series({"GE": 35.0, "BA": 317.0})
+        self.performance_tracker.record_daily_metrics(
+            date=cast_timestamp(pd.Timestamp("2019-01-01")), portfolio=self.portfolio
+        )
+        self.portfolio.positions = self.portfolio.positions.loc[["BA"]]
+        self.performance_tracker.record_daily_metrics(
+            date=cast_timestamp(pd.Timestamp("2019-01-02")), portfolio=self.portfolio
+        )
+        self.assertEqual(
+            self.performance_tracker.daily_positions.to_dict("list"),
+            {"GE": [2.0, 0.0], "BA": [1.0, 1.0]},
+        )
+
 
 if __name__ == "__main__":
     initialize_logging(level="DEBUG")
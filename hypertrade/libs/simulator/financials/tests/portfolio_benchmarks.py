@@ -0,0 +1,84 @@
+"""Benchmarks for updating and valuing a Portfolio.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/financials/tests:portfolio_benchmarks
+"""
+
+import sys
+from typing import List
+
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.execute.types import Transaction
+from hypertrade.libs.simulator.financials.portfolio import Portfolio
+
+DT = pd.Timestamp("2021-10-01 09:30:00", tz="America/New_York")
+
+
+def _fills(n_names: int, n_fills: int) -> List[Transaction]:
+    assets = [Asset(sid, f"SYM{sid}", f"Asset {sid}") for sid in range(n_names)]
+    return [
+        Transaction(
+            asset=assets[i % n_names],
+            amount=1 if i % 3 else -1,
+            dt=DT + pd.Timedelta(minutes=i),
+            price=100.0,
+            order_id="benchmark",
+        )
+        for i in range(n_fills)
+    ]
+
+
+@pytest.mark.parametrize("n_fills", [1_000, 10_000])
+def test_fill_cost(benchmark: BenchmarkFixture, n_fills: int) -> None:
+    """Cost of applying fills to the portfolio, should grow linearly"""
+    fills = _fills(500, n_fills)
+
+    def update() -> None:
+        portfolio = Portfolio(capital_base=1e6)
+        for tx in fills:
+            portfolio.update(tx)
+
+    benchmark.extra_info["fills"] = n_fills
+    benchmark.pedantic(update, rounds=5, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("n_names", [50, 500])
+def test_valuation(benchmark: BenchmarkFixture, n_names: int) -> None:
+    """Cost of revaluing the portfolio after a price change"""
+    portfolio = Portfolio(capital_base=1e6)
+    for tx in _fills(n_names, n_names):
+        portfolio.update(tx)
+    prices = pd.Series(101.0, index=portfolio.symbols)
+
+    def revalue() -> None:
+        portfolio.current_market_prices = prices
+        _ = portfolio.portfolio_value
+        _ = portfolio.current_portfolio_weights
+
+    benchmark.extra_info["names"] = n_names
+    benchmark(revalue)
+
+
+@pytest.mark.parametrize("n_names", [50, 500])
+def test_price_tick(benchmark: BenchmarkFixture, n_names: int) -> None:
+    """Cost of a price tick that changes one asset, shouldn't grow with the book"""
+    portfolio = Portfolio(capital_base=1e6)
+    for tx in _fills(n_names, n_names):
+        portfolio.update(tx)
+    ticks = [pd.Series({"SYM0": 100.0 + i % 2}) for i in range(2)]
+
+    def tick() -> None:
+        for prices in ticks:
+            portfolio.update_market_prices(prices)
+            _ = portfolio.portfolio_value
+
+    benchmark.extra_info["names"] = n_names
+    benchmark(tick)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
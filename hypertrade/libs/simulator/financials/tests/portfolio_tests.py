@@ -2,6 +2,7 @@ import os
 import unittest
 
 import exchange_calendars as xcals
+import numpy as np
 import pandas as pd
 import pytz
 from loguru import logger
@@ -221,6 +222,119 @@ class TestPortfolio(unittest.TestCase):
             "Ending test Portfolio.current_portfolio_weights with a single asset"
         )
 
+    def _fill(
+        self, portfolio: Portfolio, asset: Asset, amount: int, price: float
+    ) -> None:
+        portfolio.update(
+            Transaction(
+                amount=amount,
+                asset=asset,
+                dt=cast_timestamp(self.event_manager.current_time),
+                price=price,
+                order_id="testing",
+            )
+        )
+
+    def test_position_book(self) -> None:
+        """Fills are netted per asset, with the average price paid as cost basis"""
+        portfolio = Portfolio(capital_base=1000.0)
+        boeing = Asset(sid=1, symbol="BA", asset_name="Boeing")
+        ge = Asset(sid=2, symbol="GE", asset_name="General Electric")
+        self._fill(portfolio, boeing, 1, 290.0)
+        self._fill(portfolio, ge, 4, 30.0)
+        self._fill(portfolio, boeing, 3, 310.0)
+        self.assertEqual(portfolio.cost_basis["BA"], 305.0)
+
+        # Selling part of a position keeps its cost basis
+        self._fill(portfolio, boeing, -2, 320.0)
+        self.assertEqual(portfolio.cost_basis["BA"], 305.0)
+        # Going short resets it to the fill price
+        self._fill(portfolio, ge, -6, 35.0)
+        self.assertEqual(portfolio.cost_basis["GE"], 35.0)
+
+        self.assertEqual(portfolio.symbols, ["BA", "GE"])
+        self.assertEqual(portfolio.net_positions.to_dict(), {"BA": 2.0, "GE": -2.0})
+        self.assertEqual(len(portfolio.positions), 5)
+        self.assertEqual(portfolio.positions.loc["GE"]["amount"].tolist(), [4.0, -6.0])
+        self.assertAlmostEqual(portfolio.cash, 1000.0 - 290 - 120 - 930 + 640 + 210)
+
+        portfolio.current_market_prices = pd.Series({"BA": 300.0, "GE": 40.0})
+        self.assertEqual(portfolio.positions_value, 2 * 300.0 - 2 * 40.0)
+        self.assertEqual(
+            portfolio.portfolio_value, portfolio.cash + portfolio.positions_value
+        )
+        self.assertAlmostEqual(portfolio.current_portfolio_weights["BA"], 600 / 520)
+
+        # A new fill invalidates the valuation
+        self._fill(portfolio, ge, 2, 40.0)
+        self.assertEqual(portfolio.positions_value, 600.0)
+        self.assertEqual(portfolio.cost_basis["GE"], 0.0)
+
+    def test_position_book_growth(self) -> None:
+        """The book grows past its initial capacity"""
+        portfolio = Portfolio(capital_base=10_000.0)
+        for sid in range(100):
+            asset = Asset(sid=sid, symbol=f"SYM{sid}", asset_name=f"Asset {sid}")
+            self._fill(portfolio, asset, sid, 1.0)
+        portfolio.current_market_prices = pd.Series(
+            2.0, index=[f"SYM{sid}" for sid in range(100)]
+        )
+        self.assertEqual(portfolio.net_positions.tolist(), list(range(100)))
+        self.assertEqual(portfolio.positions_value, 2.0 * sum(range(100)))
+
+    def test_incremental_valuation(self) -> None:
+        """Price updates revalue the changed assets only"""
+        portfolio = Portfolio(capital_base=10_000.0)
+        symbols = [f"SYM{sid}" for sid in range(20)]
+        for sid, symbol in enumerate(symbols):
+            self._fill(
+                portfolio, Asset(sid=sid, symbol=symbol, asset_name=symbol), 2, 10.0
+            )
+        # Assets are valued at their fill price until they have a market price
+        self.assertEqual(portfolio.positions_value, 20 * 2 * 10.0)
+
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            changed = rng.choice(symbols, size=3, replace=False)
+            portfolio.update_market_prices(
+                pd.Series(rng.uniform(5.0, 15.0, size=3), index=changed)
+            )
+            prices = portfolio.current_market_prices
+            self.assertAlmostEqual(
+                portfolio.positions_value, float((2 * prices).sum()), places=9
+            )
+        self.assertAlmostEqual(portfolio.current_portfolio_weights.sum(), 1.0)
+
+        # Unknown assets and missing prices are ignored
+        prices = portfolio.current_market_prices
+        portfolio.update_market_prices(pd.Series({"SYM0": np.nan, "AAPL": 150.0}))
+        pd.testing.assert_series_equal(portfolio.current_market_prices, prices)
+
+    def test_set_positions(self) -> None:
+        """Assigning a positions DataFrame replaces the book"""
+        portfolio = Portfolio(capital_base=1000.0)
+        self._fill(portfolio, Asset(sid=1, symbol="BA", asset_name="Boeing"), 1, 290.0)
+        positions = pd.DataFrame(
+            {"amount": [1.0, 2.0], "cost_basis": [30.0, 36.0]},
+            index=pd.MultiIndex.from_tuples(
+                [
+                    ("GE", pd.Timestamp("2018-12-26 09:30:00")),
+                    ("GE", pd.Timestamp("2018-12-27 09:30:00")),
+                ]
+            ),
+        )
+        portfolio.positions = positions
+        self.assertEqual(portfolio.symbols, ["GE"])
+        self.assertEqual(portfolio.net_positions["GE"], 3.0)
+        self.assertEqual(portfolio.cost_basis["GE"], 34.0)
+        pd.testing.assert_frame_equal(portfolio.positions, positions)
+
+        # Fills of the assets set without a sid go to the same slot
+        self._fill(portfolio, Asset(sid=2, symbol="GE", asset_name="GE"), 1, 40.0)
+        self._fill(portfolio, Asset(sid=3, symbol="GE", asset_name="GE"), 1, 40.0)
+        self.assertEqual(portfolio.symbols, ["GE"])
+        self.assertEqual(portfolio.net_positions.to_dict(), {"GE": 5.0})
+
 
 if __name__ == "__main__":
     initialize_logging(level="DEBUG")
@@ -6,7 +6,7 @@ from loguru import logger
 from hypertrade.libs.service.locator import ServiceLocator, register_service
 from hypertrade.libs.simulator.assets import Asset
 from hypertrade.libs.simulator.event.service import EventManager
-from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event
+from hypertrade.libs.simulator.event.types import EVENT_TYPE, Event, HandlerPriority
 from hypertrade.libs.simulator.market_types import PriceChangeData
 from hypertrade.libs.tsfd.utils.time import cast_timestamp
 
@@ -21,8 +21,21 @@ class MarketPriceService:
     def __init__(self, universe: List[Asset]) -> None:
         service_locator = ServiceLocator[EventManager]()
         self.event_manager = service_locator.get(EventManager.SERVICE_NAME)
-        self.event_manager.subscribe(EVENT_TYPE.MARKET_CLOSE, self.handle_market_event)
-        self.event_manager.subscribe(EVENT_TYPE.MARKET_OPEN, self.handle_market_event)
+        self.event_manager.subscribe(
+            EVENT_TYPE.MARKET_CLOSE,
+            self.handle_market_event,
+            priority=HandlerPriority.MARKET_DATA,
+        )
+        self.event_manager.subscribe(
+            EVENT_TYPE.MARKET_OPEN,
+            self.handle_market_event,
+            priority=HandlerPriority.MARKET_DATA,
+        )
+        self.event_manager.subscribe(
+            EVENT_TYPE.BAR,
+            self.handle_market_event,
+            priority=HandlerPriority.MARKET_DATA,
+        )
 
         self.universe = universe
 
@@ -123,14 +123,8 @@ class TradingStrategy:
 
     def execute(self, event: Event[Any]) -> None:
         market_data = self.get_market_data(event)
-        portfolio: Portfolio = (
-            ServiceLocator[PortfolioManager]()
-            .get(PortfolioManager.SERVICE_NAME)
-            .portfolio
-        )
-        broker_service: BrokerService = ServiceLocator[BrokerService]().get(
-            BrokerService.SERVICE_NAME
-        )
+        portfolio: Portfolio = self.portfolio_manager.portfolio
+        broker_service: BrokerService = self.broker_service
         if event.time is None:
             raise ValueError("Event time is None")
         context = StrategyContext(
@@ -148,11 +142,19 @@ class TradingStrategy:
     def register_strategy(self) -> None:
         """Should be called by the TradingEngine to register the strategy with the event manager.
 
-        This method subscribes the strategy to the events it is interested in.
+        This method subscribes the strategy to the events it is interested in. The services
+        the strategy uses are resolved here, so it keeps using the services of the engine
+        it was registered with.
         """
         self.event_manager = ServiceLocator[EventManager]().get(
             EventManager.SERVICE_NAME
         )
+        self.portfolio_manager = ServiceLocator[PortfolioManager]().get(
+            PortfolioManager.SERVICE_NAME
+        )
+        self.broker_service = ServiceLocator[BrokerService]().get(
+            BrokerService.SERVICE_NAME
+        )
         for event in self.events:
             # FIXME: Figure out why this overload doesn't work
             # trunk-ignore-all(pyright,mypy)
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import itertools
+import os
+import signal
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from types import FrameType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import exchange_calendars as xcals
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from hypertrade.libs.simulator.engine import TradingEngine
+from hypertrade.libs.simulator.event.log import EventLogMode
+from hypertrade.libs.simulator.event.types import Frequency
+from hypertrade.libs.simulator.financials.performance import PerformanceTracker
+from hypertrade.libs.simulator.strategy import TradingStrategy
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.sources.dataframe import DataFrameSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+
+StrategyFactory = Callable[[Mapping[str, Any], PricesDataset], TradingStrategy]
+"""Builds the trading strategy of a run from its parameters.
+
+The factory is called in the worker process, with the worker's PricesDataset, so it
+has to be picklable, e.g. a module level function.
+"""
+
+ParamGrid = Mapping[str, Sequence[Any]] | Iterable[Mapping[str, Any]]
+
+
+def expand_param_grid(param_grid: ParamGrid) -> List[Dict[str, Any]]:
+    """Expand a parameter grid into the parameters of each run.
+
+    A mapping of parameter name to values is expanded into every combination of the
+    values. Any other iterable is taken as the parameters of each run as is.
+    """
+    if isinstance(param_grid, Mapping):
+        names = list(param_grid.keys())
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*param_grid.values())
+        ]
+    return [dict(params) for params in param_grid]
+
+
+@dataclass
+class SweepResult:
+    """Result of a single run of a parameter sweep.
+
+    attributes
+    ----------
+        params : Dict[str, Any]
+            Parameters the strategy was built from.
+        performance_tracker : PerformanceTracker, optional
+            Performance of the run. None if the run failed.
+        error : str, optional
+            Formatted traceback of the exception that failed the run.
+        elapsed : float
+            Wall time of the run in seconds, 0 if the worker died.
+    """
+
+    params: Dict[str, Any]
+    performance_tracker: Optional[PerformanceTracker] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class _SharedPricesSpec:
+    """Where the price data is in shared memory and how to rebuild the DataFrame."""
+
+    name: str
+    n_rows: int
+    columns: Tuple[str, ...]
+    tickers: Tuple[str, ...]
+
+
+def _share_prices(prices: pd.DataFrame) -> Tuple[SharedMemory, _SharedPricesSpec]:
+    """Copy the numeric OHLVC columns of `prices` into a new shared memory block.
+
+    The block holds the dates (epoch nanoseconds), the ticker codes and then the value
+    columns, one after another, so every worker maps the same pages read-only instead
+    of receiving its own pickled copy of the data.
+    """
+    prices = prices.sort_index()
+    columns = tuple(
+        str(column)
+        for column in prices.columns
+        if pd.api.types.is_numeric_dtype(prices[column])
+    )
+    dates = pd.DatetimeIndex(prices.index.get_level_values("date"))
+    ticker_codes, tickers = pd.factorize(prices.index.get_level_values("ticker"))
+    n_rows = len(prices)
+
+    shm = SharedMemory(create=True, size=max(_shared_size(n_rows, len(columns)), 1))
+    dates_view, codes_view, values_view = _shared_views(shm, n_rows, len(columns))
+    dates_view[:] = dates.tz_convert("UTC").view("i8")
+    codes_view[:] = ticker_codes
+    values_view[:] = prices[list(columns)].to_numpy(dtype=np.float64).T
+    spec = _SharedPricesSpec(
+        name=shm.name,
+        n_rows=n_rows,
+        columns=columns,
+        tickers=tuple(str(ticker) for ticker in tickers),
+    )
+    return shm, spec
+
+
+def _shared_size(n_rows: int, n_columns: int) -> int:
+    return n_rows * (8 + 4 + 8 * n_columns)
+
+
+def _shared_views(
+    shm: SharedMemory, n_rows: int, n_columns: int
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int32], npt.NDArray[np.float64]]:
+    dates: npt.NDArray[np.int64] = np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)
+    codes: npt.NDArray[np.int32] = np.ndarray(
+        (n_rows,), dtype=np.int32, buffer=shm.buf, offset=8 * n_rows
+    )
+    values: npt.NDArray[np.float64] = np.ndarray(
+        (n_columns, n_rows), dtype=np.float64, buffer=shm.buf, offset=12 * n_rows
+    )
+    return dates, codes, values
+
+
+def _attach_shared_memory(name: str) -> SharedMemory:
+    """Attach to a block owned by the parent, without unlinking it on exit."""
+    try:
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg, unused-ignore]
+    except TypeError:
+        # Python < 3.13 registers every attached block with the resource tracker,
+        # which would unlink it when the worker exits
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+# Per worker process state, set up once by `_init_worker`
+_worker_shm: Optional[SharedMemory] = None
+_worker_prices: Optional[pd.DataFrame] = None
+
+
+def _init_worker(spec: _SharedPricesSpec) -> None:
+    global _worker_shm, _worker_prices
+    _worker_shm = _attach_shared_memory(spec.name)
+    dates, codes, values = _shared_views(_worker_shm, spec.n_rows, len(spec.columns))
+    for view in (dates, codes, values):
+        view.flags.writeable = False
+    index = pd.MultiIndex.from_arrays(
+        [
+            pd.DatetimeIndex(dates.view("datetime64[ns]")).tz_localize("UTC"),
+            pd.Index(spec.tickers, dtype=object).take(codes),
+        ],
+        names=["date", "ticker"],
+    )
+    _worker_prices = pd.DataFrame(
+        {column: values[i] for i, column in enumerate(spec.columns)},
+        index=index,
+        copy=False,
+    )
+
+
+class _RunTimeout(BaseException):
+    """Raised in a worker when a run exceeds its timeout.
+
+    Not an Exception, so strategies that catch Exception don't swallow it.
+    """
+
+
+def _raise_timeout(signum: int, frame: Optional[FrameType]) -> None:
+    raise _RunTimeout()
+
+
+def _run_backtest(
+    strategy_factory: StrategyFactory,
+    params: Dict[str, Any],
+    start_time: pd.Timestamp,
+    end_time: pd.Timestamp,
+    symbols: Optional[List[str]],
+    exchange: str,
+    frequency: Frequency,
+    capital_base: float,
+    timeout: Optional[float],
+) -> SweepResult:
+    """Run a single backtest in the worker process, catching any failure."""
+    started = time.perf_counter()
+    if timeout is not None:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        assert _worker_prices is not None, "Worker is not initialized"
+        prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(DataFrameSource(_worker_prices)),
+            symbols=symbols,
+            name="prices",
+            trading_calendar=xcals.get_calendar(exchange),
+        )
+        engine = TradingEngine(
+            start_time=start_time,
+            end_time=end_time,
+            prices_dataset=prices_dataset,
+            trading_strategy=strategy_factory(params, prices_dataset),
+            frequency=frequency,
+            capital_base=capital_base,
+            event_log_mode=EventLogMode.OFF,
+        )
+        engine.run()
+        return SweepResult(
+            params=params,
+            performance_tracker=engine.performance_tracking_service.performance_tracker,
+            elapsed=time.perf_counter() - started,
+        )
+    except _RunTimeout:
+        return SweepResult(
+            params=params,
+            error=f"TimeoutError: run exceeded {timeout}s",
+            elapsed=time.perf_counter() - started,
+        )
+    except Exception:
+        return SweepResult(
+            params=params,
+            error=traceback.format_exc(),
+            elapsed=time.perf_counter() - started,
+        )
+    finally:
+        if timeout is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class SweepRunner:
+    """Runs a TradingEngine backtest for every parameter set of a grid, in parallel.
+
+    Each run is executed in a ProcessPoolExecutor worker. The price data is copied into
+    shared memory once and every worker builds its PricesDataset on top of it, so
+    starting a run doesn't pickle the prices and memory use doesn't grow with the
+    number of workers. A worker runs one backtest at a time with its own services.
+
+    Results are yielded as runs complete. A run that raises, times out or loses its
+    worker process is reported as a failed SweepResult and doesn't stop the sweep.
+
+    Usage:
+        ```python
+        def build_strategy(params, prices_dataset):
+            return (
+                StrategyBuilder()
+                .on_event(EVENT_TYPE.MARKET_OPEN)
+                .with_current_prices(prices_dataset)
+                .build(partial(momentum, lookback=params["lookback"]))
+            )
+
+        runner = SweepRunner(
+            strategy_factory=build_strategy,
+            param_grid={"lookback": [5, 10, 20]},
+            start_time=start_time,
+            end_time=end_time,
+            prices=prices,
+            symbols=["AAPL", "GE"],
+            capital_base=100_000,
+        )
+        for result in runner.run():
+            ...
+        ```
+    """
+
+    def __init__(
+        self,
+        strategy_factory: StrategyFactory,
+        param_grid: ParamGrid,
+        start_time: pd.Timestamp,
+        end_time: pd.Timestamp,
+        prices: pd.DataFrame,
+        symbols: Optional[List[str]] = None,
+        exchange: str = "XNYS",
+        frequency: Frequency = Frequency.DAILY,
+        capital_base: float = 0.0,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        """
+        Args:
+            strategy_factory (StrategyFactory): Builds the strategy of each run.
+            param_grid (ParamGrid): Parameters to run, see `expand_param_grid`.
+            start_time (pd.Timestamp): The start time of every simulation.
+            end_time (pd.Timestamp): The end time of every simulation.
+            prices (pd.DataFrame): Prices in the OHLVC format, indexed by
+                ("date", "ticker"). Only the numeric columns are shared with the workers.
+            symbols (List[str]): Symbols of the PricesDataset.
+            exchange (ExchangeCalendar string): The exchange to get the calendar for.
+            frequency (Frequency): The frequency of the market events.
+            capital_base (float): Starting cash of every run.
+            max_workers (int): Number of worker processes, defaults to the CPU count.
+            timeout (float): Seconds after which a run is stopped and reported as
+                failed. Requires SIGALRM, so it is only supported on Unix.
+            mp_context (BaseContext): Multiprocessing context of the workers.
+        """
+        if timeout is not None and not hasattr(signal, "SIGALRM"):
+            raise ValueError("Run timeouts are not supported on this platform.")
+        self.strategy_factory = strategy_factory
+        self.params = expand_param_grid(param_grid)
+        self.start_time = start_time
+        self.end_time = end_time
+        self.prices = prices
+        self.symbols = symbols
+        self.exchange = exchange
+        self.frequency = frequency
+        self.capital_base = capital_base
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.mp_context = mp_context
+
+    def run(self) -> Iterator[SweepResult]:
+        """Run the sweep, yielding the result of each run as it completes."""
+        if not self.params:
+            return
+        shm, spec = _share_prices(self.prices)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(self.params)),
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(spec,),
+            ) as executor:
+                futures: Dict[Future[SweepResult], Dict[str, Any]] = {
+                    executor.submit(
+                        _run_backtest,
+                        self.strategy_factory,
+                        params,
+                        self.start_time,
+                        self.end_time,
+                        self.symbols,
+                        self.exchange,
+                        self.frequency,
+                        self.capital_base,
+                        self.timeout,
+                    ): params
+                    for params in self.params
+                }
+                for future in as_completed(futures):
+                    exception = future.exception()
+                    if exception is None:
+                        yield future.result()
+                    else:
+                        # The worker died (e.g. BrokenProcessPool) or the result
+                        # couldn't be pickled
+                        yield SweepResult(
+                            params=futures[future],
+                            error="".join(
+                                traceback.format_exception_only(
+                                    type(exception), exception
+                                )
+                            ),
+                        )
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,25 @@
+"""Fixtures shared by the simulator benchmarks.
+
+Benchmarks load them with `pytest_plugins`, rather than from a conftest.py, because
+`bazel run` starts pytest on the benchmark file alone and conftest.py files above its
+directory aren't collected.
+"""
+
+import sys
+from typing import Iterator
+
+import pytest
+from loguru import logger
+
+
+@pytest.fixture(scope="session")
+def quiet_logging() -> Iterator[None]:
+    """Remove the loguru sinks, including the default console sink, for the session.
+
+    The services log debug messages on every event, and writing them to the console
+    would dominate the timings. Event managers in ASYNC mode still add and remove their
+    own event log sink.
+    """
+    logger.remove()
+    yield
+    logger.add(sys.stderr)
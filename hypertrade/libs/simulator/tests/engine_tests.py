@@ -1,5 +1,6 @@
 import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import exchange_calendars as xcals
@@ -11,6 +12,7 @@ from loguru import logger
 from hypertrade.libs.logging.setup import initialize_logging
 from hypertrade.libs.simulator.assets import Asset
 from hypertrade.libs.simulator.engine import TradingEngine
+from hypertrade.libs.simulator.event.log import EventLogMode
 from hypertrade.libs.simulator.event.types import EVENT_TYPE
 from hypertrade.libs.simulator.strategy import (
     DATA_TYPE,
@@ -95,6 +97,8 @@ class TestTradingEngine(unittest.TestCase):
                 trading_strategy=trading_strategy,
             )
             engine.run()
+            # The event log sink is removed once the run is over
+            self.assertIsNone(engine.event_manager._event_log_sink)
             self.assertEqual(engine.portfolio_manager.portfolio.cash, 967.12)
             self.assertEqual(
                 engine.portfolio_manager.portfolio.portfolio_value, 1002.45
@@ -145,6 +149,57 @@ class TestTradingEngine(unittest.TestCase):
             except StopIteration:
                 break
 
+    def test_concurrent_engines(self) -> None:
+        """Engines in the same process each use their own services"""
+        nytz = pytz.timezone("America/New_York")
+        start_time = cast_timestamp(pd.Timestamp("2018-12-26", tz=nytz))
+        end_time = cast_timestamp(pd.Timestamp("2018-12-31", tz=nytz))
+        ws = os.path.dirname(__file__)
+        sample_data_path = os.path.join(ws, "../data/tests/data/ohlvc/sample.csv")
+
+        def build_engine(capital_base: float) -> TradingEngine:
+            ohlvc_dataset = PricesDataset(
+                data_source=OHLVCDataSourceFormat(
+                    CSVSource(filepath=sample_data_path),
+                ),
+                symbols=["GE", "BA"],
+                name="prices",
+                trading_calendar=xcals.get_calendar("XNYS"),
+            )
+            trading_strategy = (
+                StrategyBuilder()
+                .on_event(EVENT_TYPE.MARKET_OPEN)
+                .with_assets([Asset(sid=1, symbol="GE", asset_name="General Electric")])
+                .with_current_prices(data=ohlvc_dataset)
+                .build(buy_hold_strategy)
+            )
+            return TradingEngine(
+                start_time=start_time,
+                end_time=end_time,
+                prices_dataset=ohlvc_dataset,
+                capital_base=capital_base,
+                trading_strategy=trading_strategy,
+                event_log_mode=EventLogMode.OFF,
+            )
+
+        engines = [build_engine(1000), build_engine(2000)]
+        for engine in engines:
+            self.assertIs(engine.order_manager.event_manager, engine.event_manager)
+            self.assertIs(
+                engine.performance_tracking_service.portfolio_manager,
+                engine.portfolio_manager,
+            )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(TradingEngine.run, engines))
+
+        self.assertEqual(engines[0].portfolio_manager.portfolio.cash, 967.12)
+        self.assertEqual(engines[1].portfolio_manager.portfolio.cash, 1967.12)
+        for engine in engines:
+            self.assertEqual(
+                engine.portfolio_manager.portfolio.positions["amount"].sum(), 1
+            )
+
 
 if __name__ == "__main__":
     initialize_logging(level="TRACE")
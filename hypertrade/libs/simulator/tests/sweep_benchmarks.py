@@ -0,0 +1,90 @@
+"""Benchmarks for running parameter sweeps across worker processes.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/tests:sweep_benchmarks
+"""
+
+import os
+import sys
+from functools import partial
+from typing import Any, Mapping
+
+import pandas as pd
+import pytest
+import pytz
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.event.types import EVENT_TYPE
+from hypertrade.libs.simulator.strategy import (
+    StrategyBuilder,
+    StrategyContext,
+    StrategyData,
+    TradingStrategy,
+)
+from hypertrade.libs.simulator.sweep import SweepRunner
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+
+pytest_plugins = ["hypertrade.libs.simulator.tests.benchmark_fixtures"]
+pytestmark = pytest.mark.usefixtures("quiet_logging")
+
+NYTZ = pytz.timezone("America/New_York")
+START_TIME = pd.Timestamp("2018-09-04", tz=NYTZ)
+END_TIME = pd.Timestamp("2018-12-31", tz=NYTZ)
+RUNS = 8
+SAMPLE_DATA_PATH = os.path.join(
+    os.path.dirname(__file__), "../data/tests/data/ohlvc/sample.csv"
+)
+
+
+def buy_hold_strategy(
+    context: StrategyContext, data: StrategyData, shares: int
+) -> None:
+    if context.portfolio.positions.empty:
+        context.broker_service.place_order(
+            asset=Asset(sid=1, symbol="GE", asset_name="General Electric"),
+            amount=shares,
+        )
+
+
+def build_strategy(
+    params: Mapping[str, Any], prices_dataset: PricesDataset
+) -> TradingStrategy:
+    return (
+        StrategyBuilder()
+        .on_event(EVENT_TYPE.MARKET_OPEN)
+        .build(partial(buy_hold_strategy, shares=params["shares"]))
+    )
+
+
+@pytest.fixture(scope="module")
+def prices() -> pd.DataFrame:
+    return pd.read_csv(SAMPLE_DATA_PATH, parse_dates=True, index_col=["date", "ticker"])
+
+
+def _sweep(prices: pd.DataFrame, max_workers: int) -> None:
+    runner = SweepRunner(
+        strategy_factory=build_strategy,
+        param_grid={"shares": list(range(1, RUNS + 1))},
+        start_time=START_TIME,
+        end_time=END_TIME,
+        prices=prices,
+        symbols=["GE", "BA"],
+        capital_base=1000,
+        max_workers=max_workers,
+    )
+    for result in runner.run():
+        assert result.ok, result.error
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 4])
+def test_sweep_scaling(
+    benchmark: BenchmarkFixture, prices: pd.DataFrame, max_workers: int
+) -> None:
+    """Wall time of a fixed sweep, should drop close to linearly with the workers"""
+    benchmark.extra_info["runs"] = RUNS
+    benchmark.pedantic(_sweep, args=(prices, max_workers), rounds=3, iterations=1)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -0,0 +1,141 @@
+import os
+import time
+import unittest
+from functools import partial
+from typing import Any, Dict, List, Mapping
+
+import pandas as pd
+import pytz
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.logging.setup import initialize_logging
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.event.types import EVENT_TYPE
+from hypertrade.libs.simulator.strategy import (
+    StrategyBuilder,
+    StrategyContext,
+    StrategyData,
+    TradingStrategy,
+)
+from hypertrade.libs.simulator.sweep import SweepRunner, expand_param_grid
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.utils.time import cast_timestamp
+
+GE = Asset(sid=1, symbol="GE", asset_name="General Electric")
+
+
+def buy_hold_strategy(
+    context: StrategyContext, data: StrategyData, shares: int, fail: bool
+) -> None:
+    if fail:
+        raise RuntimeError("Strategy failed")
+    if context.portfolio.positions.empty:
+        context.broker_service.place_order(asset=GE, amount=shares)
+
+
+def slow_strategy(context: StrategyContext, data: StrategyData) -> None:
+    # The timeout must stop the run even if the strategy catches every exception
+    try:
+        time.sleep(60)
+    except Exception:
+        pass
+
+
+def build_strategy(
+    params: Mapping[str, Any], prices_dataset: PricesDataset
+) -> TradingStrategy:
+    if params.get("slow"):
+        strategy_function = slow_strategy
+    else:
+        strategy_function = partial(
+            buy_hold_strategy,
+            shares=params["shares"],
+            fail=params.get("fail", False),
+        )
+    return (
+        StrategyBuilder()
+        .on_event(EVENT_TYPE.MARKET_OPEN)
+        .with_assets([GE])
+        .build(strategy_function)
+    )
+
+
+class TestExpandParamGrid(unittest.TestCase):
+
+    def test_product(self) -> None:
+        param_grid: Dict[str, List[Any]] = {"a": [1, 2], "b": ["x", "y", "z"]}
+        params = expand_param_grid(param_grid)
+        self.assertEqual(len(params), 6)
+        self.assertEqual(params[0], {"a": 1, "b": "x"})
+        self.assertEqual(params[-1], {"a": 2, "b": "z"})
+
+    def test_list(self) -> None:
+        params = expand_param_grid([{"a": 1}, {"a": 2, "b": 3}])
+        self.assertEqual(params, [{"a": 1}, {"a": 2, "b": 3}])
+
+
+class TestSweepRunner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        nytz = pytz.timezone("America/New_York")
+        self.start_time = cast_timestamp(pd.Timestamp("2018-12-26", tz=nytz))
+        self.end_time = cast_timestamp(pd.Timestamp("2018-12-31", tz=nytz))
+
+        ws = os.path.dirname(__file__)
+        sample_data_path = os.path.join(ws, "../data/tests/data/ohlvc/sample.csv")
+        self.prices = pd.read_csv(
+            sample_data_path, parse_dates=True, index_col=["date", "ticker"]
+        )
+
+    def _runner(self, param_grid: Any, **kwargs: Any) -> SweepRunner:
+        return SweepRunner(
+            strategy_factory=build_strategy,
+            param_grid=param_grid,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            prices=self.prices,
+            symbols=["GE", "BA"],
+            capital_base=1000,
+            max_workers=2,
+            **kwargs,
+        )
+
+    def test_results_per_params(self) -> None:
+        results = list(self._runner({"shares": [1, 2, 3]}).run())
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(result.ok for result in results))
+        for result in results:
+            tracker = result.performance_tracker
+            assert tracker is not None
+            self.assertEqual(len(tracker.daily_returns), 2)
+            self.assertEqual(
+                tracker.daily_positions["GE"].iloc[-1], result.params["shares"]
+            )
+
+    def test_failed_run(self) -> None:
+        """A failing run is reported without stopping the other runs"""
+        results = list(self._runner([{"shares": 1}, {"shares": 1, "fail": True}]).run())
+
+        by_fail = {result.params.get("fail", False): result for result in results}
+        self.assertTrue(by_fail[False].ok)
+        self.assertFalse(by_fail[True].ok)
+        self.assertIsNone(by_fail[True].performance_tracker)
+        error = by_fail[True].error
+        assert error is not None
+        self.assertIn("Strategy failed", error)
+
+    def test_timeout(self) -> None:
+        results = list(self._runner([{"shares": 1}, {"slow": True}], timeout=5).run())
+
+        by_slow = {result.params.get("slow", False): result for result in results}
+        self.assertTrue(by_slow[False].ok)
+        self.assertFalse(by_slow[True].ok)
+        error = by_slow[True].error
+        assert error is not None
+        self.assertIn("TimeoutError", error)
+
+
+if __name__ == "__main__":
+    initialize_logging(level="INFO")
+    unittest.main()
@@ -0,0 +1,259 @@
+"""Benchmarks comparing the VectorizedTradingEngine with the event driven TradingEngine.
+
+Run with:
+    bazel run //hypertrade/libs/simulator/tests:vectorized_benchmarks
+"""
+
+import os
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Tuple
+
+import exchange_calendars as xcals
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pytest
+import pytz
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.engine import TradingEngine
+from hypertrade.libs.simulator.event.log import EventLogMode
+from hypertrade.libs.simulator.event.types import EVENT_TYPE
+from hypertrade.libs.simulator.strategy import (
+    DATA_TYPE,
+    StrategyBuilder,
+    StrategyContext,
+    StrategyData,
+    StrategyFunction,
+)
+from hypertrade.libs.simulator.vectorized import (
+    VectorizedMarketData,
+    VectorizedTradingEngine,
+)
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+
+pytest_plugins = ["hypertrade.libs.simulator.tests.benchmark_fixtures"]
+pytestmark = pytest.mark.usefixtures("quiet_logging")
+
+NYTZ = pytz.timezone("America/New_York")
+CALENDAR = xcals.get_calendar("XNYS")
+LARGE_START_TIME = pd.Timestamp("2015-01-01", tz=NYTZ)
+LARGE_END_TIME = pd.Timestamp("2020-01-01", tz=NYTZ)
+LARGE_UNIVERSE = 500
+# The event driven engine runs over the first months only, and is extrapolated
+EVENT_DRIVEN_END_TIME = pd.Timestamp("2015-04-01", tz=NYTZ)
+
+
+def _prices_dataset(path: str, symbols: List[str]) -> PricesDataset:
+    return PricesDataset(
+        data_source=OHLVCDataSourceFormat(CSVSource(filepath=path)),
+        symbols=symbols,
+        name="prices",
+        trading_calendar=CALENDAR,
+    )
+
+
+def _sessions(start_time: pd.Timestamp, end_time: pd.Timestamp) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(
+        CALENDAR.sessions_in_range(
+            start_time.tz_localize(None), end_time.tz_localize(None)
+        )
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_dataset() -> PricesDataset:
+    ws = os.path.dirname(__file__)
+    return _prices_dataset(
+        os.path.join(ws, "../data/tests/data/ohlvc/sample.csv"), ["GE", "BA"]
+    )
+
+
+@pytest.fixture(scope="module")
+def large_prices(tmp_path_factory: pytest.TempPathFactory) -> Tuple[str, List[str]]:
+    """CSV of 5 years x 500 symbols of random walk prices, and the symbols"""
+    symbols = [f"SYM{i}" for i in range(LARGE_UNIVERSE)]
+    sessions = _sessions(LARGE_START_TIME, LARGE_END_TIME)
+    rng = np.random.default_rng(0)
+    closes = 50 * np.exp(
+        np.cumsum(rng.normal(0, 0.02, (len(sessions), LARGE_UNIVERSE)), axis=0)
+    )
+    opens = closes * np.exp(rng.normal(0, 0.005, closes.shape))
+    df = pd.DataFrame(
+        {
+            "date": np.repeat(sessions.tz_localize("UTC"), LARGE_UNIVERSE),
+            "ticker": np.tile(symbols, len(sessions)),
+            "open": opens.ravel(),
+            "high": np.maximum(opens, closes).ravel(),
+            "low": np.minimum(opens, closes).ravel(),
+            "close": closes.ravel(),
+            "volume": 1_000_000.0,
+            "lastupdated": "2024-12-29",
+        }
+    )
+    path = Path(tmp_path_factory.mktemp("prices")) / "prices.csv"
+    df.to_csv(path, index=False)
+    return str(path), symbols
+
+
+@pytest.fixture(scope="module")
+def large_engine(large_prices: Tuple[str, List[str]]) -> VectorizedTradingEngine:
+    """Vectorized engine over the large universe, with the prices loaded once"""
+    engine = VectorizedTradingEngine(
+        start_time=LARGE_START_TIME,
+        end_time=LARGE_END_TIME,
+        prices_dataset=_prices_dataset(*large_prices),
+        target_weights=_momentum_weights,
+        capital_base=1_000_000,
+        commission_per_share=0.001,
+    )
+    _ = engine.market_data  # Load the prices outside of the timed run
+    return engine
+
+
+def _momentum_weights(market_data: VectorizedMarketData) -> npt.NDArray[np.float64]:
+    """Equal weight the top decile by 20 session return, known at the previous close"""
+    closes = market_data.close_prices
+    momentum = np.full(closes.shape, np.nan)
+    momentum[21:] = closes[20:-1] / closes[:-21] - 1
+    ranks = np.argsort(
+        np.argsort(-np.nan_to_num(momentum, nan=-np.inf), axis=1), axis=1
+    )
+    n_held = max(len(market_data.symbols) // 10, 1)
+    return np.where(ranks < n_held, 1 / n_held, 0.0)
+
+
+def _momentum_strategy(assets: List[Asset]) -> StrategyFunction:
+    """Event driven `_momentum_weights`, rebalanced at every open"""
+    symbols = [asset.symbol for asset in assets]
+    prices: Deque[npt.NDArray[np.float64]] = deque(maxlen=21)
+    n_held = max(len(assets) // 10, 1)
+
+    def strategy(context: StrategyContext, data: StrategyData) -> None:
+        current = data.data[DATA_TYPE.CURRENT_PRICES].reindex(symbols)
+        prices.append(current.to_numpy(float))
+        if len(prices) < 21:
+            return
+        momentum = np.nan_to_num(prices[-1] / prices[0] - 1, nan=-np.inf)
+        held = np.argsort(-momentum)[:n_held]
+        target = np.zeros(len(symbols))
+        target[held] = context.portfolio.portfolio_value / n_held / prices[-1][held]
+        amounts = context.portfolio.net_positions.reindex(symbols, fill_value=0.0)
+        orders = np.floor(target) - amounts.to_numpy(float)
+        context.broker_service.place_orders(
+            [(assets[i], int(orders[i])) for i in np.flatnonzero(orders)]
+        )
+
+    return strategy
+
+
+def _buy_hold_weights(market_data: VectorizedMarketData) -> npt.NDArray[np.float64]:
+    weights = np.full(market_data.open_prices.shape, np.nan)
+    weights[0] = 0.4
+    return weights
+
+
+def _buy_hold_strategy(context: StrategyContext, data: StrategyData) -> None:
+    if context.portfolio.positions.empty:
+        for sid, symbol in enumerate(["GE", "BA"], start=1):
+            context.broker_service.place_order(
+                asset=Asset(sid=sid, symbol=symbol, asset_name=symbol), amount=1
+            )
+
+
+def test_event_driven_engine_sample_data(
+    benchmark: BenchmarkFixture, sample_dataset: PricesDataset
+) -> None:
+    """Baseline: buy and hold over the sample data with the TradingEngine"""
+
+    def run() -> None:
+        trading_strategy = (
+            StrategyBuilder().on_event(EVENT_TYPE.MARKET_OPEN).build(_buy_hold_strategy)
+        )
+        TradingEngine(
+            start_time=pd.Timestamp("2018-09-04", tz=NYTZ),
+            end_time=pd.Timestamp("2019-01-01", tz=NYTZ),
+            prices_dataset=sample_dataset,
+            trading_strategy=trading_strategy,
+            capital_base=1000,
+            event_log_mode=EventLogMode.OFF,
+        ).run()
+
+    benchmark.pedantic(run, rounds=3, iterations=1)
+
+
+def test_vectorized_engine_sample_data(
+    benchmark: BenchmarkFixture, sample_dataset: PricesDataset
+) -> None:
+    """Buy and hold over the sample data with the VectorizedTradingEngine"""
+    engine = VectorizedTradingEngine(
+        start_time=pd.Timestamp("2018-09-04", tz=NYTZ),
+        end_time=pd.Timestamp("2019-01-01", tz=NYTZ),
+        prices_dataset=sample_dataset,
+        target_weights=_buy_hold_weights,
+        capital_base=1000,
+    )
+    _ = engine.market_data
+    benchmark(engine.run)
+
+
+def test_vectorized_engine_large_universe(
+    benchmark: BenchmarkFixture, large_engine: VectorizedTradingEngine
+) -> None:
+    """Daily momentum rebalance of 500 symbols over 5 years"""
+    market_data = large_engine.market_data
+    benchmark.extra_info["sessions"] = len(market_data.sessions)
+    benchmark.extra_info["symbols"] = len(market_data.symbols)
+    benchmark.pedantic(large_engine.run, rounds=5, iterations=1)
+
+
+def test_event_driven_engine_large_universe(
+    benchmark: BenchmarkFixture, large_prices: Tuple[str, List[str]]
+) -> None:
+    """Baseline: the momentum rebalance with the TradingEngine, over 3 months
+
+    The `extrapolated` extra info is the time of the full 5 years, assuming the time
+    grows linearly with the sessions, to compare with the vectorized engine.
+    """
+    path, symbols = large_prices
+    assets = [
+        Asset(sid=sid, symbol=symbol, asset_name=symbol)
+        for sid, symbol in enumerate(symbols)
+    ]
+    sessions = _sessions(LARGE_START_TIME, EVENT_DRIVEN_END_TIME)
+    dataset = _prices_dataset(path, symbols)
+    # Load the prices outside of the timed run
+    _ = dataset[CALENDAR.session_open(sessions[0])]
+
+    def run() -> None:
+        trading_strategy = (
+            StrategyBuilder()
+            .on_event(EVENT_TYPE.MARKET_OPEN)
+            .with_assets(assets)
+            .with_current_prices(dataset)
+            .build(_momentum_strategy(assets))
+        )
+        TradingEngine(
+            start_time=LARGE_START_TIME,
+            end_time=EVENT_DRIVEN_END_TIME,
+            prices_dataset=dataset,
+            trading_strategy=trading_strategy,
+            capital_base=1_000_000,
+            event_log_mode=EventLogMode.OFF,
+        ).run()
+
+    benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info["sessions"] = len(sessions)
+    benchmark.extra_info["symbols"] = len(symbols)
+    if benchmark.stats is not None:
+        scale = len(_sessions(LARGE_START_TIME, LARGE_END_TIME)) / len(sessions)
+        benchmark.extra_info["extrapolated"] = benchmark.stats.stats.mean * scale
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -0,0 +1,166 @@
+import os
+import unittest
+
+import exchange_calendars as xcals
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pytz
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.logging.setup import initialize_logging
+from hypertrade.libs.simulator.assets import Asset
+from hypertrade.libs.simulator.engine import TradingEngine
+from hypertrade.libs.simulator.event.log import EventLogMode
+from hypertrade.libs.simulator.event.types import EVENT_TYPE
+from hypertrade.libs.simulator.strategy import (
+    StrategyBuilder,
+    StrategyContext,
+    StrategyData,
+)
+from hypertrade.libs.simulator.vectorized import (
+    VectorizedMarketData,
+    VectorizedTradingEngine,
+)
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.utils.time import cast_timestamp
+
+
+def buy_hold_strategy(context: StrategyContext, data: StrategyData) -> None:
+    if context.portfolio.positions.empty:
+        context.broker_service.place_order(
+            asset=Asset(sid=1, symbol="GE", asset_name="General Electric"), amount=1
+        )
+
+
+def buy_hold_weights(market_data: VectorizedMarketData) -> npt.NDArray[np.float64]:
+    # Enough of the portfolio for one share of GE on the first session, then hold
+    weights = np.full(market_data.open_prices.shape, np.nan)
+    weights[0] = 0.0
+    weights[0, market_data.symbols.index("GE")] = 0.045
+    return weights
+
+
+class TestVectorizedTradingEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        nytz = pytz.timezone("America/New_York")
+        self.start_time = cast_timestamp(pd.Timestamp("2018-12-26", tz=nytz))
+        self.end_time = cast_timestamp(pd.Timestamp("2018-12-31", tz=nytz))
+
+        ws = os.path.dirname(__file__)
+        sample_data_path = os.path.join(ws, "../data/tests/data/ohlvc/sample.csv")
+        self.prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(
+                CSVSource(filepath=sample_data_path),
+            ),
+            symbols=["GE", "BA"],
+            name="prices",
+            trading_calendar=xcals.get_calendar("XNYS"),
+        )
+
+    def test_matches_event_driven_engine(self) -> None:
+        """Buy and hold should give the same results as the TradingEngine"""
+        trading_strategy = (
+            StrategyBuilder()
+            .on_event(EVENT_TYPE.MARKET_OPEN)
+            .with_assets([Asset(sid=1, symbol="GE", asset_name="General Electric")])
+            .build(buy_hold_strategy)
+        )
+        engine = TradingEngine(
+            start_time=self.start_time,
+            end_time=self.end_time,
+            prices_dataset=self.prices_dataset,
+            capital_base=1000,
+            trading_strategy=trading_strategy,
+            event_log_mode=EventLogMode.OFF,
+        )
+        engine.run()
+        portfolio = engine.portfolio_manager.portfolio
+        performance_tracker = engine.performance_tracking_service.performance_tracker
+
+        result = VectorizedTradingEngine(
+            start_time=self.start_time,
+            end_time=self.end_time,
+            prices_dataset=self.prices_dataset,
+            target_weights=buy_hold_weights,
+            capital_base=1000,
+        ).run()
+
+        self.assertAlmostEqual(result.cash.iloc[-1], portfolio.cash)
+        self.assertAlmostEqual(
+            result.portfolio_value.iloc[-1], portfolio.portfolio_value
+        )
+        pd.testing.assert_series_equal(
+            result.daily_returns,
+            performance_tracker.daily_returns,
+            check_names=False,
+            check_freq=False,
+        )
+        pd.testing.assert_series_equal(
+            result.positions["GE"],
+            performance_tracker.daily_positions["GE"],
+            check_names=False,
+            check_freq=False,
+            check_dtype=False,
+        )
+
+    def test_rebalance_and_commissions(self) -> None:
+        """Target weights are traded at the open, commissions are taken from cash"""
+        sessions = 3
+
+        def equal_weights(market_data: VectorizedMarketData) -> npt.NDArray[np.float64]:
+            return np.full(market_data.open_prices.shape, 0.5)
+
+        engine = VectorizedTradingEngine(
+            start_time=self.start_time,
+            end_time=self.end_time,
+            prices_dataset=self.prices_dataset,
+            target_weights=equal_weights,
+            capital_base=10_000,
+            commission_per_share=0.01,
+        )
+        market_data = engine.market_data
+        self.assertEqual(len(market_data.sessions), sessions)
+        result = engine.run()
+
+        open_prices = market_data.open_prices
+        close_prices = market_data.close_prices
+        expected_shares = np.trunc(5_000 / open_prices[0])
+        np.testing.assert_array_equal(result.positions.iloc[0], expected_shares)
+        expected_cash = (
+            10_000 - expected_shares @ open_prices[0] - 0.01 * expected_shares.sum()
+        )
+        self.assertAlmostEqual(result.cash.iloc[0], expected_cash)
+        self.assertAlmostEqual(
+            result.portfolio_value.iloc[0],
+            expected_cash + expected_shares @ close_prices[0],
+        )
+
+        # Every session is rebalanced from the previous close value
+        for t in range(1, sessions):
+            target = np.trunc(0.5 * result.portfolio_value.iloc[t - 1] / open_prices[t])
+            np.testing.assert_array_equal(result.positions.iloc[t], target)
+            np.testing.assert_array_equal(
+                result.trades.iloc[t], target - result.positions.iloc[t - 1]
+            )
+            self.assertAlmostEqual(
+                result.commissions.iloc[t], 0.01 * np.abs(result.trades.iloc[t]).sum()
+            )
+
+    def test_invalid_weights_shape(self) -> None:
+        engine = VectorizedTradingEngine(
+            start_time=self.start_time,
+            end_time=self.end_time,
+            prices_dataset=self.prices_dataset,
+            target_weights=lambda market_data: np.ones((1, 1)),
+        )
+        with self.assertRaises(ValueError):
+            engine.run()
+
+
+if __name__ == "__main__":
+    initialize_logging(level="INFO")
+    unittest.main()
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, List, Optional
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+
+
+@dataclass
+class VectorizedMarketData:
+    """Session open and close prices over the whole date x symbol grid.
+
+    attributes
+    ----------
+        sessions : pd.DatetimeIndex
+            Trading sessions in the simulation window.
+        opens : pd.DatetimeIndex
+            Market open time of each session.
+        closes : pd.DatetimeIndex
+            Market close time of each session.
+        symbols : List[str]
+            Symbols of the columns of the price arrays.
+        open_prices : np.ndarray
+            Session open price of each symbol, shape (sessions, symbols).
+            NaN where a symbol has no price.
+        close_prices : np.ndarray
+            Session close price of each symbol, shape (sessions, symbols).
+            Missing closes are carried forward from the previous session.
+    """
+
+    sessions: pd.DatetimeIndex
+    opens: pd.DatetimeIndex
+    closes: pd.DatetimeIndex
+    symbols: List[str]
+    open_prices: npt.NDArray[np.float64]
+    close_prices: npt.NDArray[np.float64]
+
+    @classmethod
+    def from_dataset(
+        cls,
+        prices_dataset: PricesDataset,
+        start_time: pd.Timestamp,
+        end_time: pd.Timestamp,
+    ) -> VectorizedMarketData:
+        """Load the prices of the sessions that open and close within the window."""
+        calendar = prices_dataset.trading_calendar
+        sessions = calendar.sessions_in_range(
+            pd.Timestamp(start_time.date()), pd.Timestamp(end_time.date())
+        )
+        opens = pd.DatetimeIndex(calendar.opens.loc[sessions])
+        closes = pd.DatetimeIndex(calendar.closes.loc[sessions])
+        in_window = (opens >= start_time) & (closes <= end_time)
+        sessions, opens, closes = (
+            sessions[in_window],
+            opens[in_window],
+            closes[in_window],
+        )
+
+        # Same window as the PricesDataset uses for a single timestamp, so the first
+        # session is included whatever time of day the source dates are stamped at
+        window = slice(
+            calendar.previous_close(start_time.normalize()).normalize(), end_time
+        )
+        data = prices_dataset.data_source.fetch(timestamp=window)
+        prices = prices_dataset.data_source.prices_adapter(window, data, calendar)
+        wide_prices = prices["price"].unstack(level=1)
+        symbols = (
+            list(prices_dataset.symbols)
+            if prices_dataset.symbols is not None
+            else list(wide_prices.columns)
+        )
+        wide_prices = wide_prices.reindex(columns=symbols)
+
+        open_prices = wide_prices.reindex(opens).to_numpy(float)
+        close_prices = wide_prices.reindex(closes).ffill().to_numpy(float)
+        if start_time.tz is not None:
+            opens = opens.tz_convert(start_time.tz)
+            closes = closes.tz_convert(start_time.tz)
+        return cls(
+            sessions=sessions,
+            opens=opens,
+            closes=closes,
+            symbols=symbols,
+            open_prices=open_prices,
+            close_prices=close_prices,
+        )
+
+
+TargetWeightsFunction = Callable[
+    [VectorizedMarketData], "pd.DataFrame | npt.NDArray[np.float64]"
+]
+"""Returns the target portfolio weights of each session, shape (sessions, symbols).
+
+The weights of a session are traded at its open, as a fraction of the portfolio value
+at the previous close. They should only be computed from data up to the previous
+close. A NaN weight keeps the current position in that symbol.
+"""
+
+
+@dataclass
+class VectorizedBacktestResult:
+    """Results of a VectorizedTradingEngine run, indexed by session close time.
+
+    attributes
+    ----------
+        positions : pd.DataFrame
+            Shares held in each symbol at the close.
+        trades : pd.DataFrame
+            Shares traded in each symbol at the open.
+        commissions : pd.Series
+            Commissions paid at the open.
+        cash : pd.Series
+            Cash held at the close.
+        portfolio_value : pd.Series
+            Liquidation value of the portfolio at the close.
+    """
+
+    positions: pd.DataFrame
+    trades: pd.DataFrame
+    commissions: pd.Series
+    cash: pd.Series
+    portfolio_value: pd.Series
+
+    @cached_property
+    def daily_returns(self) -> pd.Series:
+        """Daily returns between consecutive closes, noncumulative.
+
+        Like the PerformanceTracker, the first session has no return.
+        """
+        values = self.portfolio_value.to_numpy()
+        return pd.Series(
+            values[1:] / values[:-1] - 1, index=self.portfolio_value.index[1:]
+        )
+
+
+class VectorizedTradingEngine:
+    """Backtest engine for strategies expressed as a matrix of target weights.
+
+    Instead of stepping every market event through the EventManager and the simulator
+    services, the whole simulation window is loaded into date x symbol arrays. The
+    strategy is called once and fills, cash, positions, commissions and returns are
+    computed with NumPy. Rebalancing is sequential, since the shares bought depend on
+    the portfolio value at the previous close, but every step is a handful of array
+    operations over the symbols.
+
+    The fill model matches the event driven TradingEngine: orders are filled at the
+    session open price and the portfolio is valued at the session close price.
+
+    Usage:
+        ```python
+        def equal_weight(market_data: VectorizedMarketData) -> np.ndarray:
+            n_symbols = len(market_data.symbols)
+            return np.full(market_data.open_prices.shape, 1 / n_symbols)
+
+        engine = VectorizedTradingEngine(
+            start_time=start_time,
+            end_time=end_time,
+            prices_dataset=prices_dataset,
+            target_weights=equal_weight,
+            capital_base=100_000,
+        )
+        result = engine.run()
+        result.daily_returns
+        ```
+    """
+
+    def __init__(
+        self,
+        start_time: pd.Timestamp,
+        end_time: pd.Timestamp,
+        prices_dataset: PricesDataset,
+        target_weights: TargetWeightsFunction,
+        capital_base: float = 0.0,
+        commission_per_share: float = 0.0,
+        commission_per_dollar: float = 0.0,
+        market_data: Optional[VectorizedMarketData] = None,
+    ) -> None:
+        """
+        Args:
+            start_time (pd.Timestamp): The start time of the simulation.
+            end_time (pd.Timestamp): The end time of the simulation.
+            prices_dataset (PricesDataset): Dataset to load the session prices from.
+            target_weights (TargetWeightsFunction): The strategy.
+            capital_base (float): Starting cash.
+            commission_per_share (float): Commission paid per share traded.
+            commission_per_dollar (float): Commission paid per dollar traded.
+            market_data (VectorizedMarketData): Preloaded prices for the window. Loaded
+                from the `prices_dataset` if not provided.
+        """
+        if start_time > end_time:
+            raise ValueError(
+                f"start_time {start_time} is later than end_time {end_time}"
+            )
+        self.start_time = start_time
+        self.end_time = end_time
+        self.prices_dataset = prices_dataset
+        self.target_weights = target_weights
+        self.capital_base = capital_base
+        self.commission_per_share = commission_per_share
+        self.commission_per_dollar = commission_per_dollar
+        self._market_data = market_data
+
+    @property
+    def market_data(self) -> VectorizedMarketData:
+        if self._market_data is None:
+            self._market_data = VectorizedMarketData.from_dataset(
+                self.prices_dataset, self.start_time, self.end_time
+            )
+        return self._market_data
+
+    def run(self) -> VectorizedBacktestResult:
+        market_data = self.market_data
+        open_prices = market_data.open_prices
+        # Symbols without a close price yet are valued at 0
+        close_prices = np.nan_to_num(market_data.close_prices)
+        n_sessions, n_symbols = open_prices.shape
+
+        weights = np.asarray(self.target_weights(market_data), dtype=float)
+        if weights.shape != open_prices.shape:
+            raise ValueError(
+                f"Target weights should have shape {open_prices.shape} (sessions, "
+                f"symbols), but {weights.shape} was returned."
+            )
+        # Symbols can't be traded without an open price, keep the current position
+        hold = np.isnan(weights) | np.isnan(open_prices)
+        weights = np.where(hold, 0.0, weights)
+        fill_prices = np.where(hold, 0.0, open_prices)
+        safe_open_prices = np.where(hold, 1.0, open_prices)
+
+        positions = np.zeros((n_sessions, n_symbols))
+        trades = np.zeros((n_sessions, n_symbols))
+        commissions = np.zeros(n_sessions)
+        cash = np.zeros(n_sessions)
+        portfolio_value = np.zeros(n_sessions)
+
+        shares = np.zeros(n_symbols)
+        current_cash = float(self.capital_base)
+        current_value = current_cash
+        for t in range(n_sessions):
+            target = np.trunc(weights[t] * current_value / safe_open_prices[t])
+            target = np.where(hold[t], shares, target)
+            traded = target - shares
+            commission = self._commission(traded, fill_prices[t])
+            current_cash -= float(traded @ fill_prices[t]) + commission
+            shares = target
+            current_value = current_cash + float(shares @ close_prices[t])
+
+            positions[t] = shares
+            trades[t] = traded
+            commissions[t] = commission
+            cash[t] = current_cash
+            portfolio_value[t] = current_value
+
+        index = market_data.closes
+        return VectorizedBacktestResult(
+            positions=pd.DataFrame(positions, index=index, columns=market_data.symbols),
+            trades=pd.DataFrame(trades, index=index, columns=market_data.symbols),
+            commissions=pd.Series(commissions, index=index),
+            cash=pd.Series(cash, index=index),
+            portfolio_value=pd.Series(portfolio_value, index=index),
+        )
+
+    def _commission(
+        self, traded: npt.NDArray[np.float64], prices: npt.NDArray[np.float64]
+    ) -> float:
+        if not self.commission_per_share and not self.commission_per_dollar:
+            return 0.0
+        return float(
+            self.commission_per_share * np.abs(traded).sum()
+            + self.commission_per_dollar * np.abs(traded * prices).sum()
+        )
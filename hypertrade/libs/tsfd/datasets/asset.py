@@ -1,16 +1,44 @@
 from abc import abstractmethod
-from typing import List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
 
 import exchange_calendars as xcals
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
+import pandera as pa
 from pandas._libs.tslibs.nattype import NaTType
 
 from hypertrade.libs.tsfd.datasets.types import TimeSeriesDataset
 from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
 from hypertrade.libs.tsfd.schemas.prices import prices_schema
-from hypertrade.libs.tsfd.sources.types import DataSource, Granularity
+from hypertrade.libs.tsfd.sources.types import DataSource, FetchMode, Granularity
+from hypertrade.libs.tsfd.utils.calendar import SessionTimeline
 from hypertrade.libs.tsfd.utils.dataframe import get_index_strategy
 from hypertrade.libs.tsfd.utils.time import cast_timestamp
+from hypertrade.libs.tsfd.utils.validation import (
+    ValidationPolicy,
+    is_validated,
+    mark_validated,
+    validate,
+)
+
+
+def _validate_adapted(
+    data: pd.DataFrame,
+    fetched: pd.DataFrame,
+    schema: pa.DataFrameSchema,
+    policy: ValidationPolicy,
+) -> None:
+    """Validate `data` adapted by a dataset adapter from the `fetched` data.
+
+    Unless the policy is FULL, the adapters are trusted to keep data that was validated
+    by the data source valid, and `data` is only checked if `fetched` wasn't.
+    """
+    if policy is not ValidationPolicy.FULL and is_validated(fetched):
+        mark_validated(data, schema)
+    validate(data, schema, policy)
 
 
 class OhlvcDatasetAdapter(DataSource):
@@ -43,6 +71,11 @@ class OHLVCDataset(TimeSeriesDataset):
         data = ohlvc_dataset[pd.Timestamp("2020-01-02")]
         print(data.head())
 
+    Timestamps are fetched with the `fetch_mode`, by default the latest data at or
+    before them. With FetchMode.STRICT only the bars at the timestamp are returned, and
+    with FetchMode.INTERVAL the bars in the interval of the data source's granularity
+    containing it. A KeyError is raised if there are none.
+
     Returns:
         A pandas DataFrame indexed by date (and symbol if multi-index), with columns such as open, high,
         low, close, volume. The exact columns are validated by ohlvc_schema.
@@ -56,22 +89,26 @@ class OHLVCDataset(TimeSeriesDataset):
         name: Optional[str] = None,
         symbols: Optional[List[str]] = None,
         granularity: Granularity = Granularity.DAILY,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
+        fetch_mode: FetchMode = FetchMode.LATEST,
     ):
         super().__init__(data_source, name)
         self.symbols = symbols
         self.granularity = granularity
+        self.validation_policy = validation_policy
+        self.fetch_mode = fetch_mode
         self.data_source: OhlvcDatasetAdapter = data_source
 
     def _load_data(self, idx: pd.Timestamp | NaTType | slice | int) -> pd.DataFrame:
         if isinstance(idx, pd.Timestamp) and idx.tzinfo is None:
             idx = idx.tz_localize("UTC")
-        data = self.data_source.fetch(timestamp=idx)
-        data = self.data_source.ohlvc_adapter(data)
+        fetched = self.data_source.fetch(timestamp=idx, mode=self.fetch_mode)
+        data = self.data_source.ohlvc_adapter(fetched)
         if self.symbols is not None:
             data = data.loc[pd.IndexSlice[:, self.symbols], :]
         if isinstance(data, pd.Series):
             data = data.to_frame().T
-        self._schema.validate(data)
+        _validate_adapted(data, fetched, self._schema, self.validation_policy)
         return data
 
 
@@ -103,6 +140,32 @@ class PricesDatasetAdapter(DataSource):
         ...
 
 
+@dataclass
+class PricesCacheStats:
+    """Lookups of the PricesDataset cache since it was created."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_CacheKey = Tuple[int, int, Optional[Tuple[str, ...]]]
+
+
+@dataclass
+class _PriceTimeline:
+    """Prices of every session open and close, shape (times, symbols)."""
+
+    symbols: Optional[Tuple[str, ...]]
+    times: npt.NDArray[np.int64]
+    tickers: pd.Index
+    prices: npt.NDArray[np.float64]
+
+
 class PricesDataset(TimeSeriesDataset):
     """PricesDataset will provide the most current prices for a given asset
     at a given point in time. It can accept a continuous stream of timestamps
@@ -134,6 +197,26 @@ class PricesDataset(TimeSeriesDataset):
         dl = DataLoader(prices_dataset, batch_size=32)  # for Torch DataLoader
         ```
 
+    Caching:
+        The prices at a timestamp only change at a session open or close, while the
+        simulator looks them up several times per bar (strategy, broker and portfolio).
+        Timestamp lookups are resolved to the latest session open or close and kept in
+        a bounded LRU cache keyed by that time, the previous session and the symbols.
+        Call `invalidate_cache` if the data source changes. Only DAILY datasets are
+        cached, intraday prices also change between the session open and close.
+
+        With `price_timeline=True` the open and close prices of the whole dataset are
+        built into a matrix on the first lookup, and every lookup is a binary search
+        into it instead of a fetch from the data source.
+
+        The cache hits and misses are counted in `cache_stats`, and reported to the
+        `on_cache_lookup` hook if one is provided.
+
+    Validation:
+        With the default FULL `validation_policy` every lookup is validated against the
+        prices schema. With ON_LOAD or SAMPLED, prices adapted from data that the data
+        source already validated aren't checked again.
+
     """
 
     _schema = prices_schema
@@ -145,18 +228,140 @@ class PricesDataset(TimeSeriesDataset):
         name: Optional[str] = None,
         symbols: Optional[List[str]] = None,
         granularity: Granularity = Granularity.DAILY,
+        cache_size: int = 1024,
+        price_timeline: bool = False,
+        on_cache_lookup: Optional[Callable[[bool], None]] = None,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
     ):
+        """
+        Args:
+            cache_size (int): Maximum number of timestamp lookups cached, 0 disables
+                the cache. Ignored unless the granularity is DAILY.
+            price_timeline (bool): Precompute the prices of the whole dataset. Ignored
+                unless the granularity is DAILY.
+            on_cache_lookup (Callable[[bool], None]): Called on every cache lookup with
+                whether it was a hit.
+            validation_policy (ValidationPolicy): How often the prices are validated
+                against the prices schema.
+        """
         super().__init__(data_source, name)
         self.symbols = symbols
         self.data_source: PricesDatasetAdapter = data_source
         self.granularity = granularity
         self.trading_calendar = trading_calendar
+        self.cache_size = cache_size
+        self.price_timeline = price_timeline
+        self.on_cache_lookup = on_cache_lookup
+        self.validation_policy = validation_policy
+        self.cache_stats = PricesCacheStats()
+        self._cache: OrderedDict[_CacheKey, pd.DataFrame] = OrderedDict()
+        self._session_timeline: Optional[SessionTimeline] = None
+        self._price_timeline: Optional[_PriceTimeline] = None
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached lookups and the price timeline."""
+        self._cache.clear()
+        self._price_timeline = None
+
+    @property
+    def session_timeline(self) -> SessionTimeline:
+        if self._session_timeline is None:
+            self._session_timeline = SessionTimeline(self.trading_calendar)
+        return self._session_timeline
 
     def _load_data(self, idx: pd.Timestamp | NaTType | slice | int) -> pd.DataFrame:
-
-        original_idx = idx
         if isinstance(idx, NaTType):
             raise ValueError("Invalid timestamp passed to fetch data")
+        if (
+            not isinstance(idx, pd.Timestamp)
+            or self.granularity is not Granularity.DAILY
+            or (self.cache_size <= 0 and not self.price_timeline)
+        ):
+            return self._fetch_prices(idx)
+
+        if idx.tzinfo is None:
+            idx = idx.tz_localize("UTC")
+        key = self._cache_key(idx)
+        if key is None:
+            return self._fetch_prices(idx)
+
+        data = self._cache.get(key)
+        hit = data is not None
+        self.cache_stats.hits += hit
+        self.cache_stats.misses += not hit
+        if self.on_cache_lookup is not None:
+            self.on_cache_lookup(hit)
+        if data is not None:
+            self._cache.move_to_end(key)
+        else:
+            data = (
+                self._timeline_prices(key)
+                if self.price_timeline
+                else self._fetch_prices(idx)
+            )
+            if self.cache_size > 0:
+                self._cache[key] = data
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        # Callers own the returned frame, the cached one must stay untouched
+        return data.copy()
+
+    def _cache_key(self, idx: pd.Timestamp) -> Optional[_CacheKey]:
+        """Resolve a timestamp to the lookups that give the same prices.
+
+        Two timestamps get the same prices if the latest session open or close at or
+        before them is the same, and they fetch from the same previous session (see
+        `_fetch_prices`). Returns None for timestamps outside the calendar.
+        """
+        price_time = self.session_timeline.latest_price_time(idx.value)
+        previous_session = self.session_timeline.previous_session(idx.normalize().value)
+        if price_time is None or previous_session is None:
+            return None
+        symbols = tuple(self.symbols) if self.symbols is not None else None
+        return price_time, previous_session[0], symbols
+
+    def _timeline_prices(self, key: _CacheKey) -> pd.DataFrame:
+        price_time, previous_open, symbols = key
+        timeline = self._price_timeline
+        if timeline is None or timeline.symbols != symbols:
+            timeline = self._price_timeline = self._build_price_timeline(symbols)
+
+        i = int(np.searchsorted(timeline.times, price_time, side="right")) - 1
+        # Like a fetch, only prices from the previous session onwards are current
+        if i < 0 or timeline.times[i] < previous_open:
+            raise KeyError(f"No prices at or before {pd.Timestamp(price_time)}")
+        prices = timeline.prices[i]
+        available = ~np.isnan(prices)
+        return pd.DataFrame(
+            {"price": prices[available]}, index=timeline.tickers[available]
+        )
+
+    def _build_price_timeline(
+        self, symbols: Optional[Tuple[str, ...]]
+    ) -> _PriceTimeline:
+        fetched = self.data_source.fetch()
+        data = self.data_source.prices_adapter(
+            slice(None), fetched, self.trading_calendar
+        )
+        _validate_adapted(
+            data.reset_index(level=0, drop=True),
+            fetched,
+            self._schema,
+            self.validation_policy,
+        )
+        wide = data["price"].unstack(level="ticker").sort_index()
+        if symbols is not None:
+            wide = wide.loc[:, wide.columns.isin(symbols)]
+        wide = wide.dropna(how="all")
+        return _PriceTimeline(
+            symbols=symbols,
+            times=np.asarray(pd.DatetimeIndex(wide.index).view("i8"), dtype=np.int64),
+            tickers=pd.Index(wide.columns, name="ticker"),
+            prices=wide.to_numpy(dtype=np.float64),
+        )
+
+    def _fetch_prices(self, idx: pd.Timestamp | slice | int) -> pd.DataFrame:
+        original_idx = idx
 
         if isinstance(idx, pd.Timestamp):
             if idx.tzinfo is None:
@@ -168,8 +373,8 @@ class PricesDataset(TimeSeriesDataset):
                 self.trading_calendar.previous_close(idx.normalize()).normalize(), idx
             )
 
-        data = self.data_source.fetch(timestamp=idx)
-        data = self.data_source.prices_adapter(idx, data, self.trading_calendar)
+        fetched = self.data_source.fetch(timestamp=idx)
+        data = self.data_source.prices_adapter(idx, fetched, self.trading_calendar)
         if self.symbols is not None:
             data = data.loc[pd.IndexSlice[:, self.symbols], :].sort_index()
         if isinstance(data, pd.Series):
@@ -182,5 +387,5 @@ class PricesDataset(TimeSeriesDataset):
         if isinstance(original_idx, slice):
             data = index_strategy.loc_slice(data, original_idx)
         data.reset_index(level=0, drop=True, inplace=True)
-        self._schema.validate(data)
+        _validate_adapted(data, fetched, self._schema, self.validation_policy)
         return data
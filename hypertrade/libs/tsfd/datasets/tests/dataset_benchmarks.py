@@ -0,0 +1,92 @@
+"""Benchmarks for looking up current prices through the PricesDataset.
+
+Run with:
+    bazel run //hypertrade/libs/tsfd/datasets/tests:dataset_benchmarks
+"""
+
+import os
+import sys
+from typing import Any, Dict
+
+import exchange_calendars as xcals
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
+
+SAMPLE_DATA_PATH = os.path.join(
+    os.path.dirname(__file__), "../../tests/data/ohlvc/sample.csv"
+)
+NYTZ = "America/New_York"
+# The strategy, broker and portfolio each look up the prices at the open and close
+LOOKUPS_PER_PRICE_TIME = 3
+
+CACHE_MODES: Dict[str, Dict[str, Any]] = {
+    "uncached": {"cache_size": 0},
+    "lru": {},
+    "price_timeline": {"price_timeline": True},
+}
+
+
+@pytest.fixture(scope="module")
+def timestamps() -> pd.DatetimeIndex:
+    calendar = xcals.get_calendar("XNYS")
+    sessions = calendar.sessions_in_range("2018-12-03", "2018-12-31")
+    opens = calendar.opens.loc[sessions]
+    closes = calendar.closes.loc[sessions]
+    times = pd.DatetimeIndex(opens).append(pd.DatetimeIndex(closes)).sort_values()
+    return pd.DatetimeIndex(times.repeat(LOOKUPS_PER_PRICE_TIME)).tz_convert(NYTZ)
+
+
+@pytest.mark.parametrize("mode", list(CACHE_MODES))
+def test_simulated_lookups(
+    benchmark: BenchmarkFixture, timestamps: pd.DatetimeIndex, mode: str
+) -> None:
+    """Price lookups of a month of daily simulation"""
+
+    def lookups() -> None:
+        prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(CSVSource(filepath=SAMPLE_DATA_PATH)),
+            symbols=["GE", "BA"],
+            name="prices",
+            trading_calendar=xcals.get_calendar("XNYS"),
+            **CACHE_MODES[mode],
+        )
+        for timestamp in timestamps:
+            prices_dataset[timestamp]
+        benchmark.extra_info["hit_rate"] = prices_dataset.cache_stats.hit_rate
+
+    benchmark.extra_info["lookups"] = len(timestamps)
+    benchmark.pedantic(lookups, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("policy", list(ValidationPolicy), ids=lambda p: p.value)
+def test_validation_policies(
+    benchmark: BenchmarkFixture, timestamps: pd.DatetimeIndex, policy: ValidationPolicy
+) -> None:
+    """Uncached price lookups of a month of daily simulation"""
+
+    def lookups() -> None:
+        prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(
+                CSVSource(filepath=SAMPLE_DATA_PATH), validation_policy=policy
+            ),
+            symbols=["GE", "BA"],
+            name="prices",
+            trading_calendar=xcals.get_calendar("XNYS"),
+            cache_size=0,
+            validation_policy=policy,
+        )
+        for timestamp in timestamps:
+            prices_dataset[timestamp]
+
+    benchmark.extra_info["lookups"] = len(timestamps)
+    benchmark.pedantic(lookups, rounds=3, iterations=1)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -1,14 +1,22 @@
 import os
 import unittest
+from typing import Any, List
+from unittest import mock
 
 import exchange_calendars as xcals
 import pandas as pd
 import pytz
+from pandera.errors import SchemaError
 
 # import hypertrade.libs.debugging  # donotcommit
 from hypertrade.libs.tsfd.datasets.asset import OHLVCDataset, PricesDataset
+from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
+from hypertrade.libs.tsfd.schemas.prices import prices_schema
 from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.dataframe import DataFrameSource
 from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import FetchMode, Granularity
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
 
 
 class TestOHLVCCsvDataSet(unittest.TestCase):
@@ -72,6 +80,19 @@ class TestOHLVCCsvDataSet(unittest.TestCase):
         for data in ohlvc_dataset:
             self.assertEqual(data.shape, (3, 6))
 
+    def test_fetch_mode(self) -> None:
+        ohlvc_dataset = OHLVCDataset(
+            data_source=OHLVCDataSourceFormat(
+                CSVSource(filepath=self.ohlvc_sample_data_path)
+            ),
+            name="ohlvc",
+            fetch_mode=FetchMode.STRICT,
+        )
+        data = ohlvc_dataset[pd.Timestamp("2018-12-03", tz=self.tz)]
+        self.assertEqual(data.shape, (3, 6))
+        with self.assertRaises(KeyError):
+            ohlvc_dataset[pd.Timestamp("2018-12-03 09:30", tz=self.tz)]
+
     # def test_slice(self) -> None:
     #     ohlvc_dataset = OHLVCDataset(
     #         data_source=CSVSource(filepath=self.ohlvc_sample_data_path), name="ohlvc"
@@ -123,5 +144,171 @@ class TestPricesCsvDataSet(unittest.TestCase):
         self.assertEqual(data.loc["BA"].values[0], 307.44)
 
 
+class TestPricesDatasetCache(unittest.TestCase):
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        self.ohlvc_sample_data_path = os.path.join(
+            ws, "../../tests/data/ohlvc/sample.csv"
+        )
+        self.nytz = pytz.timezone("America/New_York")
+
+    def _prices_dataset(self, **kwargs: Any) -> PricesDataset:
+        return PricesDataset(
+            data_source=OHLVCDataSourceFormat(
+                CSVSource(filepath=self.ohlvc_sample_data_path),
+            ),
+            symbols=["GE", "BA"],
+            name="prices",
+            trading_calendar=xcals.get_calendar("XNYS"),
+            **kwargs,
+        )
+
+    def test_same_prices_as_uncached(self) -> None:
+        """The cache and the price timeline return the prices of a fresh fetch"""
+        uncached = self._prices_dataset(cache_size=0)
+        cached = self._prices_dataset()
+        timeline = self._prices_dataset(price_timeline=True)
+        timestamps = pd.date_range(
+            "2018-12-20", "2018-12-31 18:00", freq="45min", tz=self.nytz
+        )
+        for timestamp in timestamps:
+            expected = uncached[timestamp]
+            pd.testing.assert_frame_equal(cached[timestamp], expected)
+            pd.testing.assert_frame_equal(timeline[timestamp], expected)
+
+    def test_hits_within_bar(self) -> None:
+        lookups: List[bool] = []
+        prices_dataset = self._prices_dataset(on_cache_lookup=lookups.append)
+        prices_dataset[pd.Timestamp("2018-12-31 09:30:00", tz=self.nytz)]
+        prices_dataset[pd.Timestamp("2018-12-31 10:00:00", tz=self.nytz)]
+        prices_dataset[pd.Timestamp("2018-12-31 15:59:00", tz=self.nytz)]
+        prices_dataset[pd.Timestamp("2018-12-31 16:00:00", tz=self.nytz)]
+
+        self.assertEqual(lookups, [False, True, True, False])
+        self.assertEqual(prices_dataset.cache_stats.hits, 2)
+        self.assertEqual(prices_dataset.cache_stats.misses, 2)
+        self.assertEqual(prices_dataset.cache_stats.hit_rate, 0.5)
+
+    def test_bounded_and_invalidated(self) -> None:
+        prices_dataset = self._prices_dataset(cache_size=2)
+        for day in ["2018-12-26", "2018-12-27", "2018-12-28"]:
+            prices_dataset[pd.Timestamp(f"{day} 10:00:00", tz=self.nytz)]
+        self.assertEqual(len(prices_dataset._cache), 2)
+
+        prices_dataset.invalidate_cache()
+        prices_dataset[pd.Timestamp("2018-12-28 10:00:00", tz=self.nytz)]
+        self.assertEqual(prices_dataset.cache_stats.misses, 4)
+
+    def test_intraday_not_cached(self) -> None:
+        lookups: List[bool] = []
+        prices_dataset = self._prices_dataset(
+            granularity=Granularity.HOURLY, on_cache_lookup=lookups.append
+        )
+        prices_dataset[pd.Timestamp("2018-12-31 10:00:00", tz=self.nytz)]
+        prices_dataset[pd.Timestamp("2018-12-31 11:00:00", tz=self.nytz)]
+
+        self.assertEqual(lookups, [])
+        self.assertEqual(len(prices_dataset._cache), 0)
+
+    def test_returned_frame_is_a_copy(self) -> None:
+        prices_dataset = self._prices_dataset()
+        timestamp = pd.Timestamp("2018-12-31 09:30:00", tz=self.nytz)
+        prices_dataset[timestamp]["price"] = 0.0
+        self.assertEqual(prices_dataset[timestamp].loc["GE"].values[0], 35.37)
+
+
+class TestValidationPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        self.ohlvc_sample_data_path = os.path.join(
+            ws, "../../tests/data/ohlvc/sample.csv"
+        )
+        self.nytz = pytz.timezone("America/New_York")
+        self.timestamps = [
+            pd.Timestamp(f"2018-12-{day} {time}", tz=self.nytz)
+            for day in [26, 27, 28]
+            for time in ["09:30", "16:00"]
+        ]
+
+    def _ohlvc_data(self) -> pd.DataFrame:
+        """A copy of the sample data without the marker of its validation"""
+        data = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path)
+        ).fetch()
+        data = data.copy()
+        data.attrs.clear()
+        return data
+
+    def _count_validations(self, policy: ValidationPolicy) -> List[int]:
+        """Look up prices without the cache, count the ohlvc and prices validations"""
+        prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(
+                CSVSource(filepath=self.ohlvc_sample_data_path),
+                validation_policy=policy,
+            ),
+            symbols=["GE", "BA"],
+            name="prices",
+            trading_calendar=xcals.get_calendar("XNYS"),
+            cache_size=0,
+            validation_policy=policy,
+        )
+        with mock.patch.object(
+            ohlvc_schema, "validate", wraps=ohlvc_schema.validate
+        ) as ohlvc, mock.patch.object(
+            prices_schema, "validate", wraps=prices_schema.validate
+        ) as prices:
+            for timestamp in self.timestamps:
+                prices_dataset[timestamp]
+        return [ohlvc.call_count, prices.call_count]
+
+    def test_full(self) -> None:
+        """Every fetch and every lookup is validated"""
+        self.assertEqual(self._count_validations(ValidationPolicy.FULL), [6, 6])
+
+    def test_on_load(self) -> None:
+        """The data was validated when the source loaded it"""
+        self.assertEqual(self._count_validations(ValidationPolicy.ON_LOAD), [0, 0])
+
+    def test_off(self) -> None:
+        self.assertEqual(self._count_validations(ValidationPolicy.OFF), [0, 0])
+
+    def test_same_prices(self) -> None:
+        prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(
+                CSVSource(filepath=self.ohlvc_sample_data_path),
+                validation_policy=ValidationPolicy.ON_LOAD,
+            ),
+            symbols=["GE", "BA"],
+            trading_calendar=xcals.get_calendar("XNYS"),
+            validation_policy=ValidationPolicy.ON_LOAD,
+        )
+        data = prices_dataset[pd.Timestamp("2018-12-31 09:30:00", tz=self.nytz)]
+        self.assertEqual(data.loc["GE"].values[0], 35.37)
+
+    def test_on_load_rejects_invalid_source(self) -> None:
+        data = self._ohlvc_data()
+        data.iloc[0, 0] = -1.0
+        with self.assertRaises(SchemaError):
+            OHLVCDataset(
+                data_source=OHLVCDataSourceFormat(
+                    DataFrameSource(data), validation_policy=ValidationPolicy.ON_LOAD
+                ),
+                validation_policy=ValidationPolicy.ON_LOAD,
+            )
+
+    def test_unvalidated_source_is_checked_by_the_dataset(self) -> None:
+        """Frames that no layer validated are still checked under ON_LOAD"""
+        data = self._ohlvc_data()
+        data.iloc[-1, 0] = -1.0
+        ohlvc_dataset = OHLVCDataset(
+            data_source=OHLVCDataSourceFormat(
+                DataFrameSource(data), validation_policy=ValidationPolicy.OFF
+            ),
+            validation_policy=ValidationPolicy.ON_LOAD,
+        )
+        with self.assertRaises(SchemaError):
+            ohlvc_dataset[pd.Timestamp("2018-12-31 12:00", tz="UTC")]
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+from typing import Optional, Tuple
+
+import click
+
+from hypertrade.libs.tsfd.ingest.ingest import (
+    DEFAULT_CHUNKSIZE,
+    INGEST_FORMATS,
+    ingest_csv,
+)
+from hypertrade.libs.tsfd.ingest.manifest import Manifest
+
+
+# trunk-ignore-all(mypy)
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command(help="Ingest vendor CSV files into a partitioned Parquet store")
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--store", required=True, type=click.Path(file_okay=False))
+@click.option("--format", "format_", required=True, type=click.Choice(INGEST_FORMATS))
+@click.option("--chunksize", default=DEFAULT_CHUNKSIZE, show_default=True)
+@click.option("--source-tz", default="UTC", show_default=True)
+@click.option("--partition-by", multiple=True, help="Partition columns of a new store")
+@click.option("--overwrite", is_flag=True, help="Replace the store")
+def ingest(
+    files: Tuple[str, ...],
+    store: str,
+    format_: str,
+    chunksize: int,
+    source_tz: str,
+    partition_by: Tuple[str, ...],
+    overwrite: bool,
+) -> None:
+    for i, path in enumerate(files):
+        try:
+            manifest = ingest_csv(
+                path,
+                store,
+                format_,
+                chunksize=chunksize,
+                source_tz=source_tz,
+                partition_by=partition_by or None,
+                overwrite=overwrite and i == 0,
+            )
+        except ValueError as e:
+            raise click.ClickException(f"Failed to ingest {path}: {e}") from e
+        click.echo(f"Ingested {path}: {_summary(manifest)}")
+
+
+@cli.command(help="Show the manifest of a store")
+@click.argument("store", type=click.Path(exists=True, file_okay=False))
+def manifest(store: str) -> None:
+    store_manifest: Optional[Manifest] = Manifest.load(store)
+    if store_manifest is None:
+        raise click.ClickException(f"{store} has no manifest")
+    click.echo(_summary(store_manifest))
+
+
+def _summary(manifest: Manifest) -> str:
+    return (
+        f"{manifest.format} store of {manifest.rows} rows in {len(manifest.files)} "
+        f"files from {manifest.start} to {manifest.end}, {manifest.runs} runs"
+    )
+
+
+if __name__ == "__main__":
+    cli()
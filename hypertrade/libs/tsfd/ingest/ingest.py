@@ -1 +1,280 @@
-# TODO: Add ingestion module
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, cast
+
+import pandas as pd
+import pandera as pa
+import pyarrow.parquet as pq
+
+from hypertrade.libs.tsfd.ingest.manifest import MANIFEST_FILE, Manifest, ManifestFile
+from hypertrade.libs.tsfd.schemas.macro import global_macro_schema
+from hypertrade.libs.tsfd.schemas.news import headline_schema
+from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
+from hypertrade.libs.tsfd.sources.formats.tick import tick_schema
+from hypertrade.libs.tsfd.sources.parquet import write_parquet
+from hypertrade.libs.tsfd.utils.validation import validate
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+@dataclass(frozen=True)
+class IngestFormat:
+    """A vendor file format and how it is stored."""
+
+    schema: pa.DataFrameSchema
+    partition_by: Sequence[str]
+
+
+INGEST_FORMATS: Dict[str, IngestFormat] = {
+    "ohlvc": IngestFormat(ohlvc_schema, ("year",)),
+    "tick": IngestFormat(tick_schema, ("year", "month")),
+    "headline": IngestFormat(headline_schema, ("year",)),
+    "macro": IngestFormat(global_macro_schema, ("year",)),
+}
+
+
+def _index_names(schema: pa.DataFrameSchema) -> List[str]:
+    if schema.index is None:
+        return []
+    return cast(List[str], list(schema.index.names))
+
+
+def _date_dtype(schema: pa.DataFrameSchema) -> Any:
+    if schema.index is None:
+        return schema.columns["date"].dtype
+    if isinstance(schema.index, pa.MultiIndex):
+        return schema.index.indexes[0].dtype
+    return schema.index.dtype
+
+
+def _columns(schema: pa.DataFrameSchema) -> List[str]:
+    index_names = _index_names(schema)
+    return index_names + [c for c in schema.columns if c not in index_names]
+
+
+def _string_columns(schema: pa.DataFrameSchema) -> List[str]:
+    """Columns read as strings, so that codes like "001" keep their leading zeros."""
+    dtypes = {name: column.dtype for name, column in schema.columns.items()}
+    if isinstance(schema.index, pa.MultiIndex):
+        dtypes.update({index.name: index.dtype for index in schema.index.indexes})
+    elif schema.index is not None:
+        dtypes[schema.index.name] = schema.index.dtype
+    return [name for name, dtype in dtypes.items() if str(dtype) == "str"]
+
+
+def normalize(
+    data: pd.DataFrame, schema: pa.DataFrameSchema, source_tz: str = "UTC"
+) -> pd.DataFrame:
+    """Select the columns of the schema, normalize the dates and set the index.
+
+    Dates with a UTC offset are converted to UTC, dates without one are localized to
+    `source_tz` first. Schemas with timezone naive dates get naive UTC dates.
+    """
+    columns = _columns(schema)
+    missing = [column for column in columns if column not in data.columns]
+    if missing:
+        raise ValueError(f"Missing columns {missing}")
+    data = data[columns].copy()
+
+    dates = pd.to_datetime(data["date"], format="ISO8601")
+    if dates.dtype == object:
+        # Mixed UTC offsets, e.g. across daylight saving time
+        dates = pd.to_datetime(data["date"], format="ISO8601", utc=True)
+    if dates.dt.tz is None:
+        dates = dates.dt.tz_localize(source_tz)
+    dates = dates.dt.tz_convert("UTC")
+    if not isinstance(_date_dtype(schema).type, pd.DatetimeTZDtype):
+        dates = dates.dt.tz_localize(None)
+    data["date"] = dates
+
+    index_names = _index_names(schema)
+    if index_names:
+        data = data.set_index(index_names)
+    return data
+
+
+def _manifest_file(store: str, path: str, run: int) -> ManifestFile:
+    metadata = pq.read_metadata(path)
+    column = metadata.schema.names.index("date")
+    statistics = [
+        metadata.row_group(i).column(column).statistics
+        for i in range(metadata.num_row_groups)
+    ]
+    return ManifestFile(
+        path=os.path.relpath(path, store),
+        rows=metadata.num_rows,
+        start=pd.Timestamp(min(s.min for s in statistics)),
+        end=pd.Timestamp(max(s.max for s in statistics)),
+        run=run,
+    )
+
+
+def _overlap(files: List[ManifestFile]) -> bool:
+    """Whether the files, in the order they were written, aren't ordered by date.
+
+    A file may start at the date the previous one ends, e.g. a day split across chunks.
+    """
+    return any(file.start < previous.end for previous, file in zip(files, files[1:]))
+
+
+def _merge_partitions(
+    store: str, written: List[ManifestFile], partition_by: Sequence[str], run: int
+) -> None:
+    """Rewrite the files of each partition whose chunks overlap as sorted files.
+
+    `written` holds the files of the run, it's updated as the files are replaced, so
+    that a failed merge can still remove every file of the run.
+    """
+    partitions: Dict[str, List[ManifestFile]] = defaultdict(list)
+    for file in written:
+        partitions[os.path.dirname(file.path)].append(file)
+    for files in partitions.values():
+        if not _overlap(files):
+            continue
+        data = pd.concat(
+            [
+                pq.read_table(os.path.join(store, file.path)).to_pandas()
+                for file in files
+            ],
+            ignore_index=True,
+        )
+        for path in write_parquet(
+            data,
+            store,
+            partition_by=partition_by,
+            basename_template=f"part-{run:05d}-merged-{{i}}.parquet",
+        ):
+            written.append(_manifest_file(store, path, run))
+        for file in files:
+            os.remove(os.path.join(store, file.path))
+            written.remove(file)
+
+
+def ingest_csv(
+    path: str,
+    store: str,
+    format: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    source_tz: str = "UTC",
+    partition_by: Optional[Sequence[str]] = None,
+    overwrite: bool = False,
+    **kwargs: Any,
+) -> Manifest:
+    """Ingest a vendor CSV file into a partitioned Parquet store.
+
+    The file is read in chunks of `chunksize` rows, so memory use is bounded by the
+    chunk size regardless of the size of the file. Every chunk is normalized (see
+    `normalize`), validated once against the format's schema, sorted and written as new
+    files of the store's partitions. The store can be read with ParquetSource.
+
+    The file doesn't need to be sorted by date. The files a run writes to a partition
+    are ordered by date: if the chunks of a partition overlap, e.g. for a file grouped
+    by ticker, the run's rows of the partition are read back and merged into sorted
+    files once every chunk is written. Memory use is then bounded by the rows of a
+    partition instead. The chunks of a sorted file are never rewritten.
+
+    Ingesting into an existing store appends to it: the new rows must be after the last
+    date of the store, and the existing files are never rewritten. If a run fails, the
+    files it wrote are deleted and the store is left as it was.
+
+    Arguments:
+        path: The CSV file.
+        store: Directory of the store.
+        format: One of `INGEST_FORMATS`.
+        chunksize: Number of rows read at once.
+        source_tz: Timezone of the dates of the file that don't have a UTC offset.
+        partition_by: Partition columns of a new store, the format's by default.
+        overwrite: Replace the store instead of appending to it. The new store is
+            written next to it and only replaces it once the run succeeded.
+        kwargs: Passed to `pd.read_csv`.
+
+    Returns:
+        The manifest of the store.
+
+    Raises:
+        pandera.errors.SchemaError: If the data doesn't match the schema.
+        ValueError: If the format is unknown, or doesn't match the store's, or if the
+            data overlaps the store.
+    """
+    if format not in INGEST_FORMATS:
+        raise ValueError(f"Unknown format {format}, expected one of {INGEST_FORMATS}")
+    ingest_format = INGEST_FORMATS[format]
+    schema = ingest_format.schema
+
+    manifest = Manifest.load(store)
+    # An overwrite is written to a sibling directory, swapped in once it succeeded
+    target = store
+    if manifest is not None and overwrite:
+        target = tempfile.mkdtemp(
+            prefix=f".{os.path.basename(os.path.normpath(store))}-",
+            dir=os.path.dirname(os.path.abspath(store)),
+        )
+        manifest = None
+    elif manifest is None and os.path.isdir(store) and os.listdir(store):
+        raise ValueError(f"{store} isn't empty and has no {MANIFEST_FILE}")
+    if manifest is None:
+        manifest = Manifest(
+            format=format,
+            partition_by=list(partition_by or ingest_format.partition_by),
+        )
+    elif manifest.format != format:
+        raise ValueError(f"Cannot ingest {format} into a {manifest.format} store")
+    os.makedirs(target, exist_ok=True)
+
+    run = manifest.runs + 1
+    last_date = manifest.end
+    written: List[ManifestFile] = []
+    try:
+        chunks = pd.read_csv(
+            path,
+            chunksize=chunksize,
+            usecols=lambda column: column in _columns(schema),
+            dtype={column: str for column in _string_columns(schema)},
+            **kwargs,
+        )
+        for i, chunk in enumerate(chunks):
+            data = normalize(chunk, schema, source_tz)
+            validate(data, schema)
+            dates = (
+                data.index.get_level_values(0)
+                if schema.index is not None
+                else data["date"]
+            )
+            if last_date is not None and bool((dates <= last_date).any()):
+                raise ValueError(
+                    f"Data from {dates.min()} overlaps the store, which ends at "
+                    f"{last_date}"
+                )
+            for file in write_parquet(
+                data,
+                target,
+                partition_by=manifest.partition_by,
+                basename_template=f"part-{run:05d}-{i:05d}-{{i}}.parquet",
+            ):
+                written.append(_manifest_file(target, file, run))
+        _merge_partitions(target, written, manifest.partition_by, run)
+        manifest.files.extend(written)
+        manifest.runs = run
+        manifest.save(target)
+    except BaseException:
+        if target != store:
+            shutil.rmtree(target)
+        else:
+            for manifest_file in written:
+                os.remove(os.path.join(store, manifest_file.path))
+        raise
+
+    if target != store:
+        _replace(store, target)
+    return manifest
+
+
+def _replace(store: str, target: str) -> None:
+    """Replace the store with the directory of a successful overwrite."""
+    previous = f"{target}.previous"
+    os.rename(store, previous)
+    os.rename(target, store)
+    shutil.rmtree(previous)
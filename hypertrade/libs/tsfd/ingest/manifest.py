@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# Readers of the store (pyarrow datasets) skip files starting with "_"
+MANIFEST_FILE = "_manifest.json"
+
+
+@dataclass
+class ManifestFile:
+    """A Parquet file of the store, written by one ingest run."""
+
+    path: str
+    """Path relative to the store."""
+
+    rows: int
+    start: pd.Timestamp
+    end: pd.Timestamp
+    run: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "rows": self.rows,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "run": self.run,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> ManifestFile:
+        return cls(
+            path=data["path"],
+            rows=data["rows"],
+            start=pd.Timestamp(data["start"]),
+            end=pd.Timestamp(data["end"]),
+            run=data["run"],
+        )
+
+
+@dataclass
+class Manifest:
+    """Contents of a store written by the ingestion pipeline.
+
+    The manifest lists the files of every ingest run with their rows and date range.
+    It is rewritten at the end of a successful run, so it never lists the files of a
+    run that failed.
+    """
+
+    format: str
+    partition_by: List[str]
+    files: List[ManifestFile] = field(default_factory=list)
+    runs: int = 0
+
+    @property
+    def rows(self) -> int:
+        return sum(file.rows for file in self.files)
+
+    @property
+    def start(self) -> Optional[pd.Timestamp]:
+        return min((file.start for file in self.files), default=None)
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+        return max((file.end for file in self.files), default=None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "partition_by": self.partition_by,
+            "runs": self.runs,
+            "files": [file.to_dict() for file in self.files],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Manifest:
+        return cls(
+            format=data["format"],
+            partition_by=list(data["partition_by"]),
+            files=[ManifestFile.from_dict(file) for file in data["files"]],
+            runs=data["runs"],
+        )
+
+    @classmethod
+    def load(cls, store: str) -> Optional[Manifest]:
+        """The manifest of the store, or None if there is no store."""
+        path = os.path.join(store, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, store: str) -> None:
+        path = os.path.join(store, MANIFEST_FILE)
+        # Replace the manifest at once so readers never see a partial one
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(f"{path}.tmp", path)
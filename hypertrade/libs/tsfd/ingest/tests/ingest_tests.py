@@ -0,0 +1,198 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+import pandera as pa
+from click.testing import CliRunner
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.ingest.cli import cli
+from hypertrade.libs.tsfd.ingest.ingest import ingest_csv
+from hypertrade.libs.tsfd.ingest.manifest import Manifest
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.parquet import ParquetSource
+
+DATA = os.path.join(os.path.dirname(__file__), "../../tests/data")
+
+
+class TestIngestOHLVC(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.csv_path = os.path.join(DATA, "ohlvc/sample.csv")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = os.path.join(self.tmpdir.name, "ohlvc")
+        self.expected = OHLVCDataSourceFormat(CSVSource(filepath=self.csv_path)).fetch()
+
+    def _read_store(self) -> pd.DataFrame:
+        return OHLVCDataSourceFormat(ParquetSource(path=self.store)).fetch()
+
+    def _write_csv(self, name: str, data: pd.DataFrame) -> str:
+        path = os.path.join(self.tmpdir.name, name)
+        data.to_csv(path)
+        return path
+
+    def test_ingest(self) -> None:
+        """The sample is grouped by ticker, its overlapping chunks are merged"""
+        manifest = ingest_csv(self.csv_path, self.store, "ohlvc", chunksize=50)
+
+        self.assertEqual(manifest.rows, 246)
+        self.assertEqual(len(manifest.files), 1)
+        self.assertEqual(manifest.start, pd.Timestamp("2018-09-04 04:00", tz="UTC"))
+        self.assertEqual(manifest.end, pd.Timestamp("2018-12-31 05:00", tz="UTC"))
+        self.assertEqual(Manifest.load(self.store), manifest)
+        pd.testing.assert_frame_equal(
+            self._read_store(),
+            self.expected[list(self._read_store().columns)],
+            check_index_type=False,
+        )
+
+    def test_sorted_chunks(self) -> None:
+        """The chunks of a sorted file are kept, a day can be split across chunks"""
+        path = self._write_csv("sorted.csv", self.expected.sort_index())
+        manifest = ingest_csv(path, self.store, "ohlvc", chunksize=50)
+
+        self.assertEqual(len(manifest.files), 5)
+        pairs = list(zip(manifest.files, manifest.files[1:]))
+        self.assertTrue(all(previous.end <= file.start for previous, file in pairs))
+        self.assertTrue(any(previous.end == file.start for previous, file in pairs))
+        data = self._read_store()
+        pd.testing.assert_frame_equal(
+            data, self.expected[list(data.columns)], check_index_type=False
+        )
+
+    def test_append_increments(self) -> None:
+        dates = self.expected.index.get_level_values("date")
+        december = pd.Timestamp("2018-12-01", tz="UTC")
+        history = self._write_csv("history.csv", self.expected[dates < december])
+        increment = self._write_csv("increment.csv", self.expected[dates >= december])
+
+        ingest_csv(history, self.store, "ohlvc")
+        history_files = {
+            file.path: os.path.getmtime(os.path.join(self.store, file.path))
+            for file in Manifest.load(self.store).files  # type: ignore
+        }
+        manifest = ingest_csv(increment, self.store, "ohlvc")
+
+        self.assertEqual(manifest.runs, 2)
+        self.assertEqual(manifest.rows, 246)
+        for path, mtime in history_files.items():
+            self.assertEqual(os.path.getmtime(os.path.join(self.store, path)), mtime)
+        data = self._read_store()
+        pd.testing.assert_frame_equal(
+            data, self.expected[list(data.columns)], check_index_type=False
+        )
+
+    def test_overlapping_increment(self) -> None:
+        manifest = ingest_csv(self.csv_path, self.store, "ohlvc")
+        files = sorted(os.listdir(os.path.join(self.store, "year=2018")))
+        with self.assertRaises(ValueError):
+            ingest_csv(self.csv_path, self.store, "ohlvc")
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.store, "year=2018"))), files
+        )
+        self.assertEqual(Manifest.load(self.store), manifest)
+
+    def test_invalid_chunk_is_rolled_back(self) -> None:
+        """Chunks written before the invalid one are deleted"""
+        data = self.expected.copy()
+        data.iloc[-1, 0] = -1.0
+        path = self._write_csv("bad.csv", data)
+        with self.assertRaises(pa.errors.SchemaError):
+            ingest_csv(path, self.store, "ohlvc", chunksize=50)
+        self.assertEqual(os.listdir(os.path.join(self.store, "year=2018")), [])
+        self.assertIsNone(Manifest.load(self.store))
+
+    def test_overwrite(self) -> None:
+        ingest_csv(self.csv_path, self.store, "ohlvc")
+        manifest = ingest_csv(self.csv_path, self.store, "ohlvc", overwrite=True)
+        self.assertEqual(manifest.runs, 1)
+        self.assertEqual(manifest.rows, 246)
+        self.assertEqual(Manifest.load(self.store), manifest)
+        self.assertEqual(os.listdir(self.tmpdir.name), ["ohlvc"])
+
+    def test_failed_overwrite(self) -> None:
+        """A failed overwrite leaves the store as it was"""
+        manifest = ingest_csv(self.csv_path, self.store, "ohlvc")
+        data = self.expected.copy()
+        data.iloc[0, 0] = -1.0
+        path = self._write_csv("bad.csv", data)
+        with self.assertRaises(pa.errors.SchemaError):
+            ingest_csv(path, self.store, "ohlvc", overwrite=True)
+        self.assertEqual(Manifest.load(self.store), manifest)
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ["bad.csv", "ohlvc"])
+        self.assertEqual(len(self._read_store()), 246)
+
+    def test_format_mismatch(self) -> None:
+        ingest_csv(self.csv_path, self.store, "ohlvc")
+        with self.assertRaises(ValueError):
+            ingest_csv(os.path.join(DATA, "macro/sample.csv"), self.store, "macro")
+
+    def test_cli(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["ingest", "--store", self.store, "--format", "ohlvc", self.csv_path]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        result = runner.invoke(cli, ["manifest", self.store])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("ohlvc store of 246 rows", result.output)
+        result = runner.invoke(
+            cli, ["ingest", "--store", self.store, "--format", "ohlvc", self.csv_path]
+        )
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("overlaps the store", result.output)
+
+
+class TestIngestFormats(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = os.path.join(self.tmpdir.name, "store")
+
+    def test_macro(self) -> None:
+        manifest = ingest_csv(
+            os.path.join(DATA, "macro/sample.csv"), self.store, "macro"
+        )
+        self.assertEqual(manifest.rows, 105)
+        data = pd.read_parquet(self.store)
+        self.assertEqual(
+            list(data.columns),
+            ["date", "country_code", "indicator_code", "value", "year"],
+        )
+        # The schema's dates are timezone naive
+        self.assertIsNone(data["date"].dt.tz)
+
+    def test_headline(self) -> None:
+        manifest = ingest_csv(
+            os.path.join(DATA, "news/headline_sample.csv"),
+            self.store,
+            "headline",
+            chunksize=1000,
+        )
+        self.assertEqual(manifest.rows, 2800)
+        self.assertEqual(manifest.end, pd.Timestamp("2020-07-17 23:51", tz="UTC"))
+
+    def test_tick_source_tz(self) -> None:
+        """Dates without a UTC offset are localized to the source timezone"""
+        manifest = ingest_csv(
+            os.path.join(DATA, "tick/sample.csv"),
+            self.store,
+            "tick",
+            source_tz="America/New_York",
+        )
+        self.assertEqual(manifest.rows, 133)
+        self.assertEqual(os.listdir(self.store + "/year=2024"), ["month=7"])
+        data = pd.read_parquet(self.store)
+        raw = pd.read_csv(os.path.join(DATA, "tick/sample.csv"))
+        self.assertEqual(
+            data["date"].max(),
+            pd.Timestamp(raw["date"].max()) + pd.Timedelta(hours=4),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+import json
+import os
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas._libs.tslibs.nattype import NaTType
+
+from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
+from hypertrade.libs.tsfd.sources.formats.default import DefaultDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import (
+    DataSource,
+    DataSourceFormat,
+    FetchMode,
+    Granularity,
+)
+from hypertrade.libs.tsfd.utils.time import cast_timestamp
+from hypertrade.libs.tsfd.utils.validation import mark_validated, validate
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+META_FILE = "meta.json"
+
+
+def write_bar_store(
+    data: pd.DataFrame,
+    path: str,
+    dtype: npt.DTypeLike = np.float64,
+) -> None:
+    """Write OHLVC data as a bar store that BarStoreSource memory maps.
+
+    The store is a directory of `.npy` files with one row per bar, grouped by ticker
+    and sorted by date within each ticker:
+
+        date.npy     int64 epoch nanoseconds (UTC) of every bar
+        key.npy      int64 `ticker * len(dates) + date position` of every bar, sorted
+        <column>.npy open, high, low, close and volume of every bar, as `dtype`
+        dates.npy    sorted unique dates of the store
+        tickers.npy  sorted tickers
+        offsets.npy  row of the first bar of every ticker, followed by the row count
+
+    Arguments:
+        data: Data indexed by ("date", "ticker") with the OHLVC columns.
+        path: Directory of the store, created if needed.
+        dtype: Float type the bar columns are stored as, e.g. np.float32 to halve the
+            size. They are read back as float64.
+
+    Raises:
+        pandera.errors.SchemaError: If the data doesn't match the OHLVC schema.
+    """
+    # The store is immutable, so it is validated once here for the ON_LOAD policy
+    validate(data, ohlvc_schema)
+    index = cast(pd.MultiIndex, data.index)
+    dates = pd.DatetimeIndex(index.get_level_values("date")).tz_convert("UTC")
+    tickers = index.get_level_values("ticker")
+    dates_ns = np.asarray(dates.view("i8"), dtype=np.int64)
+    date_values, date_positions = np.unique(dates_ns, return_inverse=True)
+    ticker_values, ticker_positions = np.unique(
+        np.asarray(tickers, dtype=str), return_inverse=True
+    )
+    keys = ticker_positions.astype(np.int64) * len(date_values) + date_positions
+    order = np.argsort(keys, kind="stable")
+    if len(keys) and bool(np.any(np.diff(keys[order]) == 0)):
+        raise ValueError("Duplicate bars for a date and ticker")
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "date.npy"), dates_ns[order])
+    np.save(os.path.join(path, "key.npy"), keys[order])
+    for column in BAR_COLUMNS:
+        values = np.asarray(data[column], dtype=dtype)
+        np.save(os.path.join(path, f"{column}.npy"), values[order])
+    np.save(os.path.join(path, "dates.npy"), date_values)
+    np.save(os.path.join(path, "tickers.npy"), ticker_values)
+    offsets = np.searchsorted(
+        ticker_positions[order], np.arange(len(ticker_values) + 1)
+    )
+    np.save(os.path.join(path, "offsets.npy"), offsets.astype(np.int64))
+    with open(os.path.join(path, META_FILE), "w") as f:
+        json.dump(
+            {"columns": list(BAR_COLUMNS), "rows": len(keys), "validated": True}, f
+        )
+
+
+class BarStoreSource(DataSource):
+    """BarStoreSource represents OHLVC bars in a memory mapped bar store
+
+    The store is written by `write_bar_store`. Opening it only reads the small arrays
+    of dates, tickers and offsets, the bars are memory mapped: a fetch reads the pages
+    of the bars it returns, and processes that open the same store share them through
+    the page cache. The rows of a date are found with binary searches over the sorted
+    keys of every ticker at once.
+
+    The store was validated against the OHLVC schema when it was written, so with the
+    ON_LOAD validation policy the fetched bars aren't validated again.
+
+    Usage:
+        prices_dataset = PricesDataset(
+            data_source=OHLVCDataSourceFormat(BarStoreSource(path="path/to/store")),
+            trading_calendar=xcals.get_calendar("XNYS"),
+            symbols=["GE", "BA"],
+        )
+    """
+
+    def __init__(
+        self,
+        path: str,
+        granularity: Granularity = Granularity.DAILY,
+        tickers: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Args:
+            path: Directory of the bar store.
+            tickers: Only read the bars of these tickers.
+        """
+        super().__init__(granularity)
+        self._path = path
+
+        with open(os.path.join(path, META_FILE)) as f:
+            self._meta: Dict[str, Any] = json.load(f)
+        self.dates: npt.NDArray[np.int64] = np.load(os.path.join(path, "dates.npy"))
+        self._store_tickers: npt.NDArray[np.str_] = np.load(
+            os.path.join(path, "tickers.npy")
+        )
+        self._offsets: npt.NDArray[np.int64] = np.load(
+            os.path.join(path, "offsets.npy")
+        )
+        positions: npt.NDArray[np.int64] = np.arange(len(self._store_tickers))
+        if tickers is not None:
+            positions = positions[np.isin(self._store_tickers, list(tickers))]
+        self._ticker_positions = positions
+        self.tickers = pd.Index(
+            self._store_tickers[positions].astype(object), name="ticker"
+        )
+
+        self._format: DataSourceFormat = DefaultDataSourceFormat(self)
+
+    @property
+    def format(self) -> DataSourceFormat:
+        return self._format
+
+    @format.setter
+    def format(self, value: DataSourceFormat) -> None:
+        self._format = value
+
+    @cached_property
+    def _bars(self) -> Dict[str, npt.NDArray[Any]]:
+        """Memory maps of the bar files."""
+        names = ["date", "key"] + list(self._meta["columns"])
+        return {
+            name: np.load(os.path.join(self._path, f"{name}.npy"), mmap_mode="r")
+            for name in names
+        }
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        return self._read(0, len(self.dates))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def ticker_bars(self, ticker: str) -> pd.DataFrame:
+        """All the bars of a ticker indexed by date, read from its block of rows."""
+        position = int(np.searchsorted(self._store_tickers, ticker))
+        if (
+            position == len(self._store_tickers)
+            or self._store_tickers[position] != ticker
+        ):
+            raise KeyError(f"No bars for {ticker}")
+        rows = slice(self._offsets[position], self._offsets[position + 1])
+        bars = self._bars
+        return pd.DataFrame(
+            {
+                column: np.asarray(bars[column][rows], dtype=np.float64)
+                for column in self._columns()
+            },
+            index=pd.DatetimeIndex(bars["date"][rows], tz="UTC", name="date"),
+        )
+
+    def _fetch(
+        self,
+        timestamp: Optional[pd.Timestamp | NaTType | slice | int] = None,
+        mode: FetchMode = FetchMode.LATEST,
+    ) -> pd.DataFrame:
+
+        # Handle full data fetch
+        if timestamp is None:
+            return self.data
+
+        if mode is not FetchMode.LATEST and isinstance(timestamp, pd.Timestamp):
+            return self._fetch_mode(timestamp, mode)
+
+        if isinstance(timestamp, slice):
+            start = (
+                0
+                if timestamp.start is None
+                else self._date_position(timestamp.start, "left")
+            )
+            stop = (
+                len(self.dates)
+                if timestamp.stop is None
+                else self._date_position(timestamp.stop, "left")
+            )
+            return self._read(start, max(start, stop))
+
+        # Handle integer index by converting to a date position
+        if isinstance(timestamp, int):
+            position = range(len(self.dates))[timestamp]
+            return self._read(position, position + 1)
+
+        timestamp = cast_timestamp(timestamp)
+        # Return data at the latest date at or before the timestamp
+        position = self._date_position(timestamp, "right") - 1
+        if position < 0:
+            raise KeyError(f"No data at or before {timestamp}")
+        return self._read(position, position + 1)
+
+    def _date_position(self, timestamp: pd.Timestamp, side: str) -> int:
+        value = pd.Timestamp(timestamp).value
+        return int(np.searchsorted(self.dates, value, side=side))  # type: ignore
+
+    def _read(self, start: int, stop: int) -> pd.DataFrame:
+        """Bars of the dates at positions `start:stop`, sorted by date and ticker."""
+        bars = self._bars
+        keys = bars["key"]
+        first_keys = self._ticker_positions * len(self.dates)
+        # Rows of each ticker's bars within the dates
+        lefts = np.searchsorted(keys, first_keys + start, side="left")
+        rights = np.searchsorted(keys, first_keys + stop, side="left")
+        counts = rights - lefts
+        total = int(counts.sum())
+        # Concatenate the ranges of rows without a Python loop over tickers
+        rows = np.repeat(lefts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        ticker_codes = np.repeat(np.arange(len(counts)), counts)
+        date_codes = np.asarray(keys[rows]) % len(self.dates) - start
+        order = np.lexsort((ticker_codes, date_codes))
+        rows = rows[order]
+
+        dates = pd.DatetimeIndex(self.dates[start:stop], tz="UTC")
+        index = pd.MultiIndex(
+            # pandas-stubs don't accept indexes as levels
+            levels=[dates, self.tickers],  # type: ignore[list-item]
+            codes=[date_codes[order], ticker_codes[order]],
+            names=["date", "ticker"],
+            verify_integrity=False,
+        )
+        columns = self._columns()
+        data = pd.DataFrame(
+            {
+                column: np.asarray(bars[column][rows], dtype=np.float64)
+                for column in columns
+            },
+            index=index,
+        )
+        if self._meta.get("validated") and self.format.schema is ohlvc_schema:
+            mark_validated(data, ohlvc_schema)
+        validate(data, self.format.schema, self.format.validation_policy)
+        return data
+
+    def _columns(self) -> List[str]:
+        """Bar columns of the schema, or all of them if the schema has none."""
+        schema_columns = list(self.format.schema.columns)
+        stored = list(self._meta["columns"])
+        if not schema_columns:
+            return stored
+        return [column for column in schema_columns if column in stored]
@@ -1,6 +1,9 @@
+import io
 from functools import cached_property
-from typing import Any, List, Optional, cast
+from typing import Any, BinaryIO, Iterator, List, Optional, cast
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import pandera as pa
 from pandas._libs.tslibs.nattype import NaTType
@@ -12,8 +15,65 @@ from hypertrade.libs.tsfd.sources.types import (
     FetchMode,
     Granularity,
 )
-from hypertrade.libs.tsfd.utils.dataframe import get_index_strategy
+from hypertrade.libs.tsfd.utils.cache import FrameCache
+from hypertrade.libs.tsfd.utils.dataframe import DateIndex, get_index_strategy
 from hypertrade.libs.tsfd.utils.time import cast_timestamp
+from hypertrade.libs.tsfd.utils.validation import (
+    is_validated,
+    mark_validated,
+    validate,
+)
+
+
+class ChunkIndex:
+    """Sparse index of the chunks of a CSV file, built in one pass over the file.
+
+    The file is split into chunks of rows at record boundaries (quoted fields may span
+    lines). Only the byte range and the date range of each chunk are kept, so a fetch
+    seeks to the chunks that overlap its dates and parses those alone.
+
+    attributes
+    ----------
+        header : bytes
+            Header line of the file, prepended to the chunks when parsing them.
+        offsets : np.ndarray
+            Byte offset of the first row of each chunk, followed by the file size, so
+            the bytes of chunk `i` are `offsets[i]:offsets[i + 1]`.
+        starts : np.ndarray
+            Earliest epoch nanosecond date of each chunk.
+        ends : np.ndarray
+            Latest epoch nanosecond date of each chunk.
+        dates : DateIndex
+            Unique dates of the file.
+        is_sorted : bool
+            Whether the rows of the file are sorted by date, in which case the chunks
+            of a date range are consecutive and are found by binary search.
+    """
+
+    def __init__(
+        self,
+        header: bytes,
+        offsets: npt.NDArray[np.int64],
+        starts: npt.NDArray[np.int64],
+        ends: npt.NDArray[np.int64],
+        dates: DateIndex,
+        is_sorted: bool,
+    ) -> None:
+        self.header = header
+        self.offsets = offsets
+        self.starts = starts
+        self.ends = ends
+        self.dates = dates
+        self.is_sorted = is_sorted
+
+    def chunks(self, start: int, stop: int) -> npt.NDArray[np.intp]:
+        """Numbers of the chunks with dates in `start <= date < stop`."""
+        if self.is_sorted:
+            # The chunks are consecutive and their date ranges sorted
+            first = int(np.searchsorted(self.ends, start, side="left"))
+            last = int(np.searchsorted(self.starts, stop, side="left"))
+            return np.arange(first, max(first, last))
+        return np.flatnonzero((self.ends >= start) & (self.starts < stop))
 
 
 class CSVSource(DataSource):
@@ -21,13 +81,48 @@ class CSVSource(DataSource):
 
     The format can be any schema such that it has a "date" column that can be used to fetch all
     information at that particular timestamp.
+
+    By default the whole file is loaded on the first fetch. With a `chunksize` the file is
+    streamed instead: the first fetch scans it once, `chunksize` rows at a time, to build
+    a `ChunkIndex`, and every fetch by timestamp or slice then parses only the chunks
+    that hold its dates. Memory use is proportional to the fetched window rather than to
+    the file, which suits tick or multi-year minute files. Files sorted by date, as
+    vendors usually deliver them, give the narrowest reads.
+
+    With a `cache` the loaded data is kept in a `FrameCache`, keyed by the file's path,
+    mtime and size, the read arguments and the schema. Other sources and processes
+    reading the same file then load the parsed, sorted and validated frame from the
+    cache instead of parsing the file again. With the ON_LOAD validation policy a frame
+    that was validated before it was cached isn't validated again.
+
+    Usage:
+        source = OHLVCDataSourceFormat(
+            CSVSource(filepath="path/to/ohlvc.csv", chunksize=100_000)
+        )
+        data = source.fetch(slice(pd.Timestamp("2018-12-01"), pd.Timestamp("2019-01-01")))
     """
 
     def __init__(
-        self, filepath: str, granularity: Granularity = Granularity.DAILY, **kwargs: Any
+        self,
+        filepath: str,
+        granularity: Granularity = Granularity.DAILY,
+        chunksize: Optional[int] = None,
+        cache: Optional[FrameCache] = None,
+        **kwargs: Any,
     ) -> None:
+        """
+        Args:
+            filepath: CSV file with a header line.
+            chunksize: Number of rows per chunk to stream the file in, or None to load
+                the whole file.
+            cache: Cache of the loaded data, shared with other sources.
+            kwargs: Passed to `pd.read_csv`. When streaming, options that skip or count
+                lines (e.g. `skiprows`, `nrows`, `header`) aren't supported.
+        """
         super().__init__(granularity)
         self._filepath = filepath
+        self._chunksize = chunksize
+        self._cache = cache
         self._kwargs = kwargs
 
         self._format: DataSourceFormat = DefaultDataSourceFormat(self)
@@ -45,18 +140,89 @@ class CSVSource(DataSource):
         self._format = value
         self._index = cast(pa.Index | pa.MultiIndex, self.format.schema.index)
         self._index_strategy = get_index_strategy(self._index)
+        # The chunk index is built from the date column of the format
+        self.__dict__.pop("chunk_index", None)
 
     @cached_property
     def data(self) -> pd.DataFrame:
+        schema = self.format.schema
+        key = None
+        if self._cache is not None:
+            key = self._cache.key(self._filepath, schema, **self._kwargs)
+            cached = self._cache.get(key)
+            if cached is not None:
+                data, validated = cached
+                if validated:
+                    mark_validated(data, schema)
+                validate(data, schema, self.format.validation_policy)
+                return data
+
         index_col = cast(List[str], self._index.names)
         data = pd.read_csv(
             self._filepath, parse_dates=True, index_col=index_col, **self._kwargs
         )
-        data = data.sort_index()
-        self.format.schema.validate(data)
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index(kind="stable")
+        validate(data, schema, self.format.validation_policy)
+        if self._cache is not None and key is not None:
+            self._cache.put(key, data, validated=is_validated(data, schema))
         return data
 
+    @cached_property
+    def chunk_index(self) -> ChunkIndex:
+        """Sparse index of the file's chunks, see `ChunkIndex`."""
+        if self._chunksize is None:
+            raise ValueError("The chunk index requires a chunksize")
+        offsets: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        unique_dates: List[npt.NDArray[np.int64]] = []
+        is_sorted = True
+        last_date: Optional[int] = None
+        tz = None
+
+        with open(self._filepath, "rb") as f:
+            header = f.readline()
+            offset = f.tell()
+            for chunk in self._chunks(f):
+                dates = self._parse_dates(header + chunk)
+                tz = dates.tz
+                values = np.asarray(dates.view("i8"), dtype=np.int64)
+                offsets.append(offset)
+                offset += len(chunk)
+                if not len(values):
+                    starts.append(np.iinfo(np.int64).max)
+                    ends.append(np.iinfo(np.int64).min)
+                    is_sorted = False
+                    continue
+                starts.append(int(values.min()))
+                ends.append(int(values.max()))
+                is_sorted = (
+                    is_sorted
+                    and (last_date is None or last_date <= values[0])
+                    and bool(np.all(values[1:] >= values[:-1]))
+                )
+                last_date = int(values[-1])
+                unique_dates.append(np.unique(values))
+        offsets.append(offset)
+
+        all_dates = (
+            np.unique(np.concatenate(unique_dates))
+            if unique_dates
+            else np.array([], dtype=np.int64)
+        )
+        return ChunkIndex(
+            header=header,
+            offsets=np.asarray(offsets, dtype=np.int64),
+            starts=np.asarray(starts, dtype=np.int64),
+            ends=np.asarray(ends, dtype=np.int64),
+            dates=DateIndex(pd.DatetimeIndex(all_dates, tz=tz)),
+            is_sorted=is_sorted,
+        )
+
     def __len__(self) -> int:
+        if self._chunksize is not None:
+            return len(self.chunk_index.dates.unique_dates)
         return self._index_strategy.size(self.data)
 
     def _fetch(
@@ -69,6 +235,12 @@ class CSVSource(DataSource):
         if timestamp is None:
             return self.data
 
+        if mode is not FetchMode.LATEST and isinstance(timestamp, pd.Timestamp):
+            return self._fetch_mode(timestamp, mode)
+
+        if self._chunksize is not None:
+            return self._fetch_chunks(timestamp)
+
         if isinstance(timestamp, slice):
             data = self._index_strategy.loc_slice(self.data, timestamp)
             return data
@@ -85,3 +257,117 @@ class CSVSource(DataSource):
         # Return data at timestamp
         data = self._index_strategy.loc(self.data, timestamp)
         return data
+
+    def _fetch_chunks(
+        self, timestamp: pd.Timestamp | NaTType | slice | int
+    ) -> pd.DataFrame:
+        """Fetch from the chunks of the file that hold the dates of the timestamp."""
+        dates = self.chunk_index.dates
+        if isinstance(timestamp, slice):
+            start = (
+                np.iinfo(np.int64).min
+                if timestamp.start is None
+                else pd.Timestamp(timestamp.start).value
+            )
+            stop = (
+                np.iinfo(np.int64).max
+                if timestamp.stop is None
+                else pd.Timestamp(timestamp.stop).value
+            )
+            return self._read(start, stop)
+
+        # Handle integer index by converting to timestamp
+        if isinstance(timestamp, int):
+            timestamp = dates.timestamp(int(dates.unique_dates[timestamp]))
+
+        # Return data at the latest date at or before the timestamp
+        date = int(dates.unique_dates[dates.asof(cast_timestamp(timestamp))])
+        return self._read(date, date + 1)
+
+    @property
+    def _date_column(self) -> str:
+        return cast(List[str], self._index.names)[0]
+
+    def _parse(
+        self, content: bytes, index_col: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Parse the header and rows of the file, reading only `index_col` if given."""
+        return cast(
+            pd.DataFrame,
+            pd.read_csv(
+                io.BytesIO(content),
+                parse_dates=True,
+                index_col=index_col or cast(List[str], self._index.names),
+                usecols=index_col,
+                **self._kwargs,
+            ),
+        )
+
+    def _parse_dates(self, content: bytes) -> pd.DatetimeIndex:
+        """Parse the dates of the header and rows of the file."""
+        column = pd.read_csv(
+            io.BytesIO(content), usecols=[self._date_column], dtype=str, **self._kwargs
+        )[self._date_column]
+        try:
+            # Much faster than inferring the format of every date
+            dates = pd.to_datetime(column, format="ISO8601")
+            if dates.dtype == object:
+                # Mixed UTC offsets, e.g. across daylight saving time
+                dates = pd.to_datetime(column, format="ISO8601", utc=True)
+        except ValueError:
+            return pd.DatetimeIndex(self._parse(content, [self._date_column]).index)
+        return pd.DatetimeIndex(dates)
+
+    def _chunks(self, f: BinaryIO) -> Iterator[bytes]:
+        """Bytes of `chunksize` records at a time, from the current position of `f`."""
+        chunksize = cast(int, self._chunksize)
+        lines: List[bytes] = []
+        rows = 0
+        quoted = False
+        for line in f:
+            lines.append(line)
+            # Quotes are escaped by doubling them, so a record ends on a line that
+            # leaves an even number of quotes
+            if line.count(b'"') % 2:
+                quoted = not quoted
+            if quoted:
+                continue
+            rows += 1
+            if rows == chunksize:
+                yield b"".join(lines)
+                lines = []
+                rows = 0
+        if lines:
+            yield b"".join(lines)
+
+    def _read(self, start: int, stop: int) -> pd.DataFrame:
+        """Rows with `start <= date < stop` in epoch nanoseconds, read from the chunks."""
+        chunk_index = self.chunk_index
+        chunks = chunk_index.chunks(start, stop)
+        frames: List[pd.DataFrame] = []
+        if not len(chunks):
+            # Parse the first chunk for the columns and types of an empty result
+            chunks = np.arange(min(1, len(chunk_index.starts)))
+        with open(self._filepath, "rb") as f:
+            # Read runs of consecutive chunks at once
+            for run in np.split(chunks, np.flatnonzero(np.diff(chunks) != 1) + 1):
+                if not len(run):
+                    continue
+                begin = chunk_index.offsets[run[0]]
+                f.seek(begin)
+                content = f.read(chunk_index.offsets[run[-1] + 1] - begin)
+                data = self._parse(chunk_index.header + content)
+                index = data.index
+                if isinstance(index, pd.MultiIndex):
+                    index = index.get_level_values(0)
+                values = np.asarray(pd.DatetimeIndex(index).view("i8"))
+                frames.append(data[(values >= start) & (values < stop)])
+
+        if frames:
+            data = pd.concat(frames) if len(frames) > 1 else frames[0]
+        else:
+            data = self._parse(chunk_index.header)
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index(kind="stable")
+        validate(data, self.format.schema, self.format.validation_policy)
+        return data
@@ -0,0 +1,87 @@
+from functools import cached_property
+from typing import Optional, cast
+
+import pandas as pd
+import pandera as pa
+from pandas._libs.tslibs.nattype import NaTType
+
+from hypertrade.libs.tsfd.sources.formats.default import DefaultDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import (
+    DataSource,
+    DataSourceFormat,
+    FetchMode,
+    Granularity,
+)
+from hypertrade.libs.tsfd.utils.dataframe import get_index_strategy
+from hypertrade.libs.tsfd.utils.time import cast_timestamp
+from hypertrade.libs.tsfd.utils.validation import validate
+
+
+class DataFrameSource(DataSource):
+    """DataFrameSource represents time series data that is already in memory
+
+    The DataFrame must be indexed as described by the format's schema, e.g. by
+    ("date", "ticker") for the OHLVC format. It is validated against the schema on first
+    access and isn't copied, so it can be backed by memory shared between processes.
+    """
+
+    def __init__(
+        self, data: pd.DataFrame, granularity: Granularity = Granularity.DAILY
+    ) -> None:
+        super().__init__(granularity)
+        self._data = data
+
+        self._format: DataSourceFormat = DefaultDataSourceFormat(self)
+        self._index: pa.Index | pa.MultiIndex = cast(
+            pa.Index | pa.MultiIndex, self._format.schema.index
+        )
+        self._index_strategy = get_index_strategy(self._index)
+
+    @property
+    def format(self) -> DataSourceFormat:
+        return self._format
+
+    @format.setter
+    def format(self, value: DataSourceFormat) -> None:
+        self._format = value
+        self._index = cast(pa.Index | pa.MultiIndex, self.format.schema.index)
+        self._index_strategy = get_index_strategy(self._index)
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        data = self._data
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        validate(data, self.format.schema, self.format.validation_policy)
+        return data
+
+    def __len__(self) -> int:
+        return self._index_strategy.size(self.data)
+
+    def _fetch(
+        self,
+        timestamp: Optional[pd.Timestamp | NaTType | slice | int] = None,
+        mode: FetchMode = FetchMode.LATEST,
+    ) -> pd.DataFrame:
+
+        # Handle full data fetch
+        if timestamp is None:
+            return self.data
+
+        if mode is not FetchMode.LATEST and isinstance(timestamp, pd.Timestamp):
+            return self._fetch_mode(timestamp, mode)
+
+        if isinstance(timestamp, slice):
+            return self._index_strategy.loc_slice(self.data, timestamp)
+
+        # Handle integer index by converting to timestamp
+        if isinstance(timestamp, int):
+            timestamp = self._index_strategy.get_timestamp_at_index(
+                self.data, timestamp
+            )
+
+        if isinstance(timestamp, pd.Timestamp) or isinstance(timestamp, NaTType):
+            timestamp = cast_timestamp(timestamp)
+
+        # Return data at timestamp
+        return self._index_strategy.loc(self.data, timestamp)
@@ -10,13 +10,17 @@ from hypertrade.libs.tsfd.sources.types import (
     FetchMode,
     Granularity,
 )
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
 
 
 class DefaultDataSourceFormat(DataSourceFormat):
     def __init__(
-        self, datasource: DataSource, granularity: Granularity = Granularity.DAILY
+        self,
+        datasource: DataSource,
+        granularity: Granularity = Granularity.DAILY,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
     ):
-        super().__init__(datasource)
+        super().__init__(datasource, validation_policy)
         self.granularity = granularity
 
     schema = default_schema
@@ -1,11 +1,16 @@
 from hypertrade.libs.tsfd.schemas.news import headline_schema
 from hypertrade.libs.tsfd.sources.types import DataSource, DataSourceFormat, Granularity
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
 
 
 class HeadlineDataSourceFormat(DataSourceFormat):
 
     schema = headline_schema
 
-    def __init__(self, datasource: DataSource):
-        super().__init__(datasource)
+    def __init__(
+        self,
+        datasource: DataSource,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
+    ):
+        super().__init__(datasource, validation_policy)
         datasource.granularity = Granularity.MINUTE
@@ -1,4 +1,7 @@
+from typing import cast
+
 import exchange_calendars as xcals
+import numpy as np
 import pandas as pd
 from pandas._libs.tslibs.nattype import NaTType
 
@@ -8,6 +11,7 @@ from hypertrade.libs.tsfd.datasets.asset import (
 )
 from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
 from hypertrade.libs.tsfd.sources.types import DataSource, DataSourceFormat, Granularity
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
 
 
 class OHLVCDataSourceFormat(
@@ -28,8 +32,9 @@ class OHLVCDataSourceFormat(
         self,
         datasource: DataSource,
         granularity: Granularity = Granularity.DAILY,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
     ):
-        super().__init__(datasource)
+        super().__init__(datasource, validation_policy)
         self.granularity = granularity
 
     schema = ohlvc_schema
@@ -45,20 +50,69 @@ class OHLVCDataSourceFormat(
     ) -> pd.DataFrame:
         if isinstance(idx, pd.Timestamp) and idx.tzinfo is None:
             idx = idx.tz_localize("UTC")
-        dates = df.index.get_level_values(0).unique()
-        data = {}
-        for date in dates:
-            open_ts = trading_calendar.session_open(date.tz_localize(None).normalize())
-            data[open_ts] = df.xs(date, level="date")["open"].to_dict()
-            close_ts = trading_calendar.session_close(
-                date.tz_localize(None).normalize()
+        if df.empty:
+            return pd.DataFrame(
+                {"price": pd.Series(dtype=float)},
+                index=pd.MultiIndex.from_arrays(
+                    [pd.DatetimeIndex([], tz="UTC"), pd.Index([], dtype=object)],
+                    names=["date", "ticker"],
+                ),
+            )
+
+        index = cast(pd.MultiIndex, df.index)
+        # Work on the codes of the index levels instead of the (repeated) values
+        date_codes = index.codes[0]
+        labels = pd.DatetimeIndex(index.levels[0]).tz_localize(None).normalize()
+        ticker_order = np.argsort(index.levels[1])
+        ticker_rank = np.empty(len(ticker_order), dtype=np.intp)
+        ticker_rank[ticker_order] = np.arange(len(ticker_order))
+        ticker_codes = ticker_rank[index.codes[1]]
+        tickers = index.levels[1][ticker_order]
+
+        # Map every date to its session through the calendar's precomputed opens/closes
+        # Sliced frames keep every date in their index levels, only check the used ones
+        used = np.bincount(date_codes, minlength=len(labels)) > 0
+        sessions = trading_calendar.sessions.get_indexer(labels)
+        if (sessions[used] < 0).any():
+            # Raise the calendar's own error for the first date that isn't a session
+            trading_calendar.session_open(labels[int(np.argmax(used & (sessions < 0)))])
+        row_sessions = sessions[date_codes]
+        open_prices = df["open"].to_numpy(dtype=float)
+        close_prices = df["close"].to_numpy(dtype=float)
+
+        # When several dates fall on the same session, the prices of the latest win
+        if len(np.unique(sessions[used])) < used.sum():
+            last_date = np.full(len(trading_calendar.sessions), -1)
+            np.maximum.at(last_date, row_sessions, date_codes)
+            keep = last_date[row_sessions] == date_codes
+            row_sessions = row_sessions[keep]
+            ticker_codes = ticker_codes[keep]
+            open_prices = open_prices[keep]
+            close_prices = close_prices[keep]
+
+        # Interleave each row's open and close price
+        times = np.column_stack(
+            (
+                trading_calendar.opens_nanos[row_sessions],
+                trading_calendar.closes_nanos[row_sessions],
             )
-            data[close_ts] = df.xs(date, level="date")["close"].to_dict()
+        ).ravel()
+        prices = np.column_stack((open_prices, close_prices)).ravel()
+        ticker_codes = np.repeat(ticker_codes, 2)
 
         # Convert to DataFrame in the schema format defined in `hypertrade.libs.tsfd.schemas.prices`
-        df = pd.DataFrame.from_dict(data, orient="index")
-        df_stacked = df.stack()
-        df_multiindex = pd.DataFrame(df_stacked).reset_index()
-        df_multiindex.columns = ["date", "ticker", "price"]
-        df_multiindex = df_multiindex.set_index(["date", "ticker"]).sort_index()
-        return df_multiindex
+        available = ~np.isnan(prices)
+        order = np.lexsort((ticker_codes[available], times[available]))
+        times = times[available][order]
+        new_time = np.r_[True, times[1:] != times[:-1]]
+        dates = pd.DatetimeIndex(times[new_time].view("datetime64[ns]")).tz_localize(
+            "UTC"
+        )
+        prices_index = pd.MultiIndex(
+            # pandas-stubs don't accept indexes as levels
+            levels=[dates, tickers],  # type: ignore[list-item]
+            codes=[np.cumsum(new_time) - 1, ticker_codes[available][order]],
+            names=["date", "ticker"],
+            verify_integrity=False,
+        ).remove_unused_levels()
+        return pd.DataFrame({"price": prices[available][order]}, index=prices_index)
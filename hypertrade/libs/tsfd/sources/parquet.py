@@ -0,0 +1,256 @@
+import os
+from functools import cached_property
+from typing import List, Optional, Sequence, cast
+
+import pandas as pd
+import pandera as pa
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pandas._libs.tslibs.nattype import NaTType
+
+from hypertrade.libs.tsfd.sources.formats.default import DefaultDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import (
+    DataSource,
+    DataSourceFormat,
+    FetchMode,
+    Granularity,
+)
+from hypertrade.libs.tsfd.utils.dataframe import DateIndex, get_index_strategy
+from hypertrade.libs.tsfd.utils.time import cast_timestamp
+from hypertrade.libs.tsfd.utils.validation import VALIDATED_ATTR, validate
+
+# Partition columns derived from the date when writing, see `write_parquet`
+DATE_PARTITIONS = ("year", "month")
+ROW_GROUP_SIZE = 64 * 1024
+
+
+def write_parquet(
+    data: pd.DataFrame,
+    path: str,
+    partition_by: Sequence[str] = ("year",),
+    row_group_size: int = ROW_GROUP_SIZE,
+    basename_template: Optional[str] = None,
+) -> List[str]:
+    """Write time series data as a Parquet dataset that ParquetSource reads.
+
+    The rows are sorted by date so every row group covers a range of dates, which lets
+    the reader skip row groups from their statistics. Files are partitioned in hive
+    style (e.g. `year=2018/ticker=GE/`) by any of `DATE_PARTITIONS`, which are derived
+    from the UTC date, or by a column or index level of the data, e.g. "ticker".
+
+    Arguments:
+        data: Data indexed by "date" first, as described by a format's schema, or with
+            a "date" column if the schema has no index.
+        path: Directory of the dataset.
+        partition_by: Partition columns.
+        row_group_size: Maximum number of rows in a row group.
+        basename_template: Name of the written files, e.g. "part-1-{i}.parquet". If
+            given, the files are added to the existing ones, otherwise the existing
+            files of the written partitions are deleted.
+
+    Returns:
+        The paths of the written files.
+    """
+    if any(name is not None for name in data.index.names):
+        data = data.sort_index(kind="stable").reset_index()
+    else:
+        data = data.sort_values("date", kind="stable")
+    # The validation marker refers to schemas of this process, it isn't persisted
+    data.attrs.pop(VALIDATED_ATTR, None)
+    # Partitions are by UTC date, as the reader prunes them with UTC bounds
+    dates = pd.DatetimeIndex(data["date"])
+    if dates.tz is not None:
+        dates = dates.tz_convert("UTC")
+    for partition in partition_by:
+        if partition == "year":
+            data["year"] = dates.year
+        elif partition == "month":
+            data["month"] = dates.month
+    table = pyarrow.Table.from_pandas(data, preserve_index=False)
+    written: List[str] = []
+    ds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        basename_template=basename_template,
+        partitioning=list(partition_by) or None,
+        partitioning_flavor="hive" if partition_by else None,
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, len(table)) or 1,
+        existing_data_behavior=(
+            "delete_matching" if basename_template is None else "overwrite_or_ignore"
+        ),
+        preserve_order=True,
+        file_visitor=lambda written_file: written.append(written_file.path),
+    )
+    return written
+
+
+def _utc(timestamp: pd.Timestamp) -> pd.Timestamp:
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.tz_convert("UTC")
+
+
+def _scalar(timestamp: pd.Timestamp, type: pyarrow.DataType) -> pyarrow.Scalar:
+    """The timestamp as a scalar of the date column's type, for comparisons."""
+    return pyarrow.scalar(pd.Timestamp(timestamp).value, pyarrow.int64()).cast(type)
+
+
+class ParquetSource(DataSource):
+    """ParquetSource represents time series datasources stored as Parquet files
+
+    The path is a Parquet file or a directory of them, partitioned in hive style by
+    date (see `write_parquet`) and/or ticker. Unlike CSVSource the data isn't loaded
+    up front: fetches by timestamp or slice read only the matching rows, pushing the date
+    range and the tickers down to the partitions and row group statistics, and only the
+    columns of the format's schema are read.
+
+    Usage:
+        source = OHLVCDataSourceFormat(
+            ParquetSource(path="path/to/ohlvc", tickers=["GE", "BA"])
+        )
+        data = source.fetch(slice(pd.Timestamp("2018-12-01"), pd.Timestamp("2019-01-01")))
+    """
+
+    def __init__(
+        self,
+        path: str,
+        granularity: Granularity = Granularity.DAILY,
+        tickers: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Args:
+            path: Parquet file or directory of a Parquet dataset.
+            tickers: Only read the rows of these tickers.
+        """
+        super().__init__(granularity)
+        self._path = path
+        self._tickers = list(tickers) if tickers is not None else None
+
+        self._format: DataSourceFormat = DefaultDataSourceFormat(self)
+        self._index: pa.Index | pa.MultiIndex = cast(
+            pa.Index | pa.MultiIndex, self._format.schema.index
+        )
+        self._index_strategy = get_index_strategy(self._index)
+
+    @property
+    def format(self) -> DataSourceFormat:
+        return self._format
+
+    @format.setter
+    def format(self, value: DataSourceFormat) -> None:
+        self._format = value
+        self._index = cast(pa.Index | pa.MultiIndex, self.format.schema.index)
+        self._index_strategy = get_index_strategy(self._index)
+
+    @cached_property
+    def dataset(self) -> ds.Dataset:
+        partitioning = "hive" if os.path.isdir(self._path) else None
+        return ds.dataset(self._path, format="parquet", partitioning=partitioning)
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        return self._read()
+
+    @cached_property
+    def dates(self) -> DateIndex:
+        """Dates of the rows of the dataset, read from the date column only."""
+        table = self.dataset.to_table(
+            columns=[self._date_column], filter=self._filter()
+        )
+        dates = pc.unique(table.column(self._date_column))
+        return DateIndex(pd.DatetimeIndex(dates.to_pandas()))
+
+    def __len__(self) -> int:
+        return len(self.dates.unique_dates)
+
+    def _fetch(
+        self,
+        timestamp: Optional[pd.Timestamp | NaTType | slice | int] = None,
+        mode: FetchMode = FetchMode.LATEST,
+    ) -> pd.DataFrame:
+
+        # Handle full data fetch
+        if timestamp is None:
+            return self.data
+
+        if mode is not FetchMode.LATEST and isinstance(timestamp, pd.Timestamp):
+            return self._fetch_mode(timestamp, mode)
+
+        if isinstance(timestamp, slice):
+            return self._read(start=timestamp.start, stop=timestamp.stop)
+
+        # Handle integer index by converting to timestamp
+        if isinstance(timestamp, int):
+            timestamp = self.dates.timestamp(int(self.dates.unique_dates[timestamp]))
+
+        if isinstance(timestamp, pd.Timestamp) or isinstance(timestamp, NaTType):
+            timestamp = cast_timestamp(timestamp)
+
+        # Return data at the latest date at or before the timestamp
+        i = self.dates.asof(timestamp)
+        date = self.dates.timestamp(int(self.dates.unique_dates[i]))
+        return self._read(start=date, stop=date, inclusive=True)
+
+    @property
+    def _date_column(self) -> str:
+        return cast(List[str], self._index.names)[0]
+
+    def _columns(self) -> Optional[List[str]]:
+        """Index and columns of the schema, or all columns if the schema has none."""
+        schema = self.format.schema
+        if not schema.columns:
+            return None
+        return cast(List[str], self._index.names) + list(schema.columns)
+
+    def _filter(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        stop: Optional[pd.Timestamp] = None,
+        inclusive: bool = False,
+    ) -> Optional[ds.Expression]:
+        """Predicate on `start <= date < stop` (or `<= stop`) and the tickers."""
+        fields = self.dataset.schema.names
+        date = ds.field(self._date_column)
+        date_type = self.dataset.schema.field(self._date_column).type
+        predicates: List[ds.Expression] = []
+        if start is not None:
+            predicates.append(date >= _scalar(start, date_type))
+        if stop is not None:
+            stop_value = _scalar(stop, date_type)
+            predicates.append(date <= stop_value if inclusive else date < stop_value)
+        # Prune the partitions derived from the (UTC) date as well
+        if "year" in fields:
+            if start is not None:
+                predicates.append(ds.field("year") >= _utc(start).year)
+            if stop is not None:
+                predicates.append(ds.field("year") <= _utc(stop).year)
+        if self._tickers is not None and "ticker" in fields:
+            predicates.append(ds.field("ticker").isin(self._tickers))
+
+        if not predicates:
+            return None
+        predicate = predicates[0]
+        for other in predicates[1:]:
+            predicate = predicate & other
+        return predicate
+
+    def _read(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        stop: Optional[pd.Timestamp] = None,
+        inclusive: bool = False,
+    ) -> pd.DataFrame:
+        table = self.dataset.to_table(
+            columns=self._columns(), filter=self._filter(start, stop, inclusive)
+        )
+        data = cast(pd.DataFrame, table.to_pandas())
+        # Drop the partition columns derived from the date when reading all columns
+        data = data.drop(columns=[c for c in DATE_PARTITIONS if c in data.columns])
+        data = data.set_index(cast(List[str], self._index.names))
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        validate(data, self.format.schema, self.format.validation_policy)
+        return data
@@ -0,0 +1,130 @@
+"""Benchmarks for reading OHLVC data from a memory mapped bar store.
+
+Run with:
+    bazel run //hypertrade/libs/tsfd/sources/tests:barstore_benchmarks
+"""
+
+import sys
+from typing import Callable, Dict, cast
+
+import exchange_calendars as xcals
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.tsfd.sources.barstore import BarStoreSource, write_bar_store
+from hypertrade.libs.tsfd.sources.dataframe import DataFrameSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.parquet import ParquetSource, write_parquet
+from hypertrade.libs.tsfd.sources.types import DataSource
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
+
+TICKERS = 500
+LOOKUPS = 100
+MONTH = slice(
+    pd.Timestamp("2023-06-01", tz="UTC"), pd.Timestamp("2023-07-01", tz="UTC")
+)
+
+
+@pytest.fixture(scope="module")
+def ohlvc() -> pd.DataFrame:
+    """10 years x 500 tickers of daily bars"""
+    calendar = xcals.get_calendar("XNYS")
+    dates = calendar.sessions_in_range("2014-01-02", "2023-12-29").tz_localize("UTC")
+    tickers = [f"T{i:03d}" for i in range(TICKERS)]
+    index = pd.MultiIndex.from_product([dates, tickers], names=["date", "ticker"])
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(10, 100, (len(index), 2))
+    return pd.DataFrame(
+        {
+            "open": prices[:, 0],
+            "high": prices.max(axis=1),
+            "low": prices.min(axis=1),
+            "close": prices[:, 1],
+            "volume": rng.uniform(0, 1e6, len(index)),
+        },
+        index=index,
+    )
+
+
+@pytest.fixture(scope="module")
+def paths(
+    ohlvc: pd.DataFrame, tmp_path_factory: pytest.TempPathFactory
+) -> Dict[str, str]:
+    tmp_path = tmp_path_factory.mktemp("ohlvc")
+    paths = {
+        "barstore": str(tmp_path / "barstore"),
+        "parquet": str(tmp_path / "parquet"),
+    }
+    write_bar_store(ohlvc, paths["barstore"])
+    write_parquet(ohlvc, paths["parquet"])
+    return paths
+
+
+@pytest.fixture(scope="module")
+def timestamps(ohlvc: pd.DataFrame) -> pd.DatetimeIndex:
+    dates = pd.DatetimeIndex(cast(pd.MultiIndex, ohlvc.index).levels[0])
+    positions = np.random.default_rng(1).integers(1, len(dates), LOOKUPS)
+    return dates[positions] + pd.Timedelta(hours=12)
+
+
+SOURCES: Dict[str, Callable[[str], DataSource]] = {
+    "barstore": lambda path: BarStoreSource(path=path),
+    "parquet": lambda path: ParquetSource(path=path),
+}
+
+
+@pytest.mark.parametrize("source", list(SOURCES))
+def test_cold_start(
+    benchmark: BenchmarkFixture, paths: Dict[str, str], source: str
+) -> None:
+    """Open the source and fetch a month of bars"""
+
+    def cold_start() -> None:
+        OHLVCDataSourceFormat(SOURCES[source](paths[source])).fetch(MONTH)
+
+    benchmark.pedantic(cold_start, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [ValidationPolicy.FULL, ValidationPolicy.ON_LOAD],
+    ids=lambda policy: policy.value,
+)
+def test_asof_fetch_barstore(
+    benchmark: BenchmarkFixture,
+    paths: Dict[str, str],
+    timestamps: pd.DatetimeIndex,
+    policy: ValidationPolicy,
+) -> None:
+    """Fetch the bars of random timestamps from the bar store"""
+    data_source = OHLVCDataSourceFormat(
+        BarStoreSource(path=paths["barstore"]), validation_policy=policy
+    )
+
+    def lookups() -> None:
+        for timestamp in timestamps:
+            data_source.fetch(timestamp)
+
+    benchmark.extra_info["lookups"] = LOOKUPS
+    benchmark(lookups)
+
+
+def test_asof_fetch_in_memory(
+    benchmark: BenchmarkFixture, ohlvc: pd.DataFrame, timestamps: pd.DatetimeIndex
+) -> None:
+    """Fetch the bars of random timestamps from a DataFrame in memory"""
+    data_source = OHLVCDataSourceFormat(DataFrameSource(ohlvc))
+    data_source.fetch(timestamps[0])
+
+    def lookups() -> None:
+        for timestamp in timestamps:
+            data_source.fetch(timestamp)
+
+    benchmark.extra_info["lookups"] = LOOKUPS
+    benchmark(lookups)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
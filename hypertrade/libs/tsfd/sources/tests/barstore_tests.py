@@ -0,0 +1,197 @@
+import os
+import tempfile
+import unittest
+from typing import cast
+from unittest import mock
+
+import exchange_calendars as xcals
+import numpy as np
+import pandas as pd
+import pandera as pa
+import pytz
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.datasets.asset import OHLVCDataset, PricesDataset
+from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
+from hypertrade.libs.tsfd.sources.barstore import BarStoreSource, write_bar_store
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.dataframe import DataFrameSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import FetchMode
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy, is_validated
+
+
+class TestOHLVCBarStoreSource(unittest.TestCase):
+    """Test the BarStoreSource class with OHLVCFormat against the CSVSource"""
+
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        ohlvc_sample_data_path = os.path.join(ws, "../../tests/data/ohlvc/sample.csv")
+        self.csv_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=ohlvc_sample_data_path)
+        )
+        self.data = self.csv_source.fetch()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "ohlvc")
+        write_bar_store(self.data, self.path)
+        self.source = OHLVCDataSourceFormat(BarStoreSource(path=self.path))
+        self.tz = pytz.timezone("America/New_York")
+
+    def assert_same_bars(self, data: pd.DataFrame, expected: pd.DataFrame) -> None:
+        pd.testing.assert_frame_equal(
+            data,
+            expected[list(data.columns)],
+            check_index_type=False,
+        )
+
+    def test_full_data_load(self) -> None:
+        full_data = self.source.fetch()
+
+        self.assertEqual(full_data.shape, (246, 5))
+        self.assertTrue(full_data.index.is_monotonic_increasing)
+        self.assertEqual(len(self.source), 82)
+        self.assert_same_bars(full_data, self.data)
+
+    def test_partial_data_load(self) -> None:
+        for timestamp in [
+            pd.Timestamp("2018-12-03", tz=self.tz),
+            pd.Timestamp("2018-12-31 16:00", tz=self.tz),
+            pd.Timestamp("2019-01-01 03:00", tz=self.tz),
+        ]:
+            data = self.source.fetch(timestamp=timestamp)
+            self.assertEqual(data.shape, (3, 5))
+            self.assert_same_bars(data, self.csv_source.fetch(timestamp=timestamp))
+
+    def test_fetch_modes(self) -> None:
+        for mode, timestamp in [
+            (FetchMode.STRICT, pd.Timestamp("2018-12-03", tz=self.tz)),
+            (FetchMode.INTERVAL, pd.Timestamp("2018-12-03 01:00", tz="UTC")),
+        ]:
+            data = self.source.fetch(timestamp, mode=mode)
+            self.assertEqual(data.shape, (3, 5))
+            expected = self.csv_source.fetch(timestamp, mode=mode)
+            pd.testing.assert_frame_equal(
+                data, expected[list(data.columns)], check_index_type=False
+            )
+            with self.assertRaises(KeyError):
+                self.source.fetch(timestamp + pd.Timedelta(days=2), mode=mode)
+
+    def test_slice(self) -> None:
+        timestamp = slice(
+            pd.Timestamp("2018-12-03", tz=self.tz),
+            pd.Timestamp("2018-12-06", tz=self.tz),
+        )
+        data = self.source.fetch(timestamp=timestamp)
+        self.assertEqual(data.shape, (6, 5))
+        self.assert_same_bars(data, self.csv_source.fetch(timestamp=timestamp))
+
+    def test_integer_index(self) -> None:
+        self.assert_same_bars(self.source.fetch(timestamp=1), self.csv_source.fetch(1))
+        self.assert_same_bars(
+            self.source.fetch(timestamp=-1), self.csv_source.fetch(81)
+        )
+
+    def test_before_first_date(self) -> None:
+        with self.assertRaises(KeyError):
+            self.source.fetch(timestamp=pd.Timestamp("2018-01-01", tz=self.tz))
+
+    def test_missing_bars(self) -> None:
+        """Tickers without a bar on a date are left out of its rows"""
+        data = self.data.drop(
+            [
+                (pd.Timestamp("2018-12-03 05:00", tz="UTC"), "BA"),
+                (pd.Timestamp("2018-12-04 05:00", tz="UTC"), "AAPL"),
+            ]
+        )
+        path = os.path.join(self.tmpdir.name, "missing")
+        write_bar_store(data, path)
+        source = OHLVCDataSourceFormat(BarStoreSource(path=path))
+        timestamp = slice(
+            pd.Timestamp("2018-12-01", tz=self.tz),
+            pd.Timestamp("2018-12-06", tz=self.tz),
+        )
+        expected = OHLVCDataSourceFormat(DataFrameSource(data)).fetch(timestamp)
+        self.assertEqual(len(expected), 4)
+        self.assert_same_bars(source.fetch(timestamp=timestamp), expected)
+
+    def test_tickers(self) -> None:
+        source = OHLVCDataSourceFormat(
+            BarStoreSource(path=self.path, tickers=["GE", "BA"])
+        )
+        data = source.fetch(timestamp=pd.Timestamp("2018-12-03", tz=self.tz))
+        self.assertEqual(list(data.index.get_level_values("ticker")), ["BA", "GE"])
+        self.assertEqual(source.fetch().shape, (164, 5))
+
+    def test_ticker_bars(self) -> None:
+        source = BarStoreSource(path=self.path)
+        bars = source.ticker_bars("GE")
+        expected = cast(pd.DataFrame, self.data.xs("GE", level="ticker"))
+        pd.testing.assert_frame_equal(
+            bars, expected[list(bars.columns)], check_freq=False
+        )
+        with self.assertRaises(KeyError):
+            source.ticker_bars("MSFT")
+
+    def test_float32(self) -> None:
+        path = os.path.join(self.tmpdir.name, "float32")
+        write_bar_store(self.data, path, dtype=np.float32)
+        self.assertEqual(np.load(os.path.join(path, "open.npy")).dtype, np.float32)
+        data = OHLVCDataSourceFormat(BarStoreSource(path=path)).fetch()
+        self.assertEqual(data["open"].dtype, np.float64)
+        np.testing.assert_allclose(data["open"], self.data["open"], rtol=1e-6)
+
+    def test_duplicate_bars(self) -> None:
+        with self.assertRaises(ValueError):
+            write_bar_store(
+                pd.concat([self.data, self.data.iloc[:1]]),
+                os.path.join(self.tmpdir.name, "duplicate"),
+            )
+
+    def test_bad_schema(self) -> None:
+        bad_data = self.data.copy()
+        bad_data["open"] = -1.0
+        with self.assertRaises(pa.errors.SchemaError):
+            write_bar_store(bad_data, os.path.join(self.tmpdir.name, "bad"))
+
+    def test_validated_on_write(self) -> None:
+        """With ON_LOAD the bars aren't validated again when they are fetched"""
+        source = OHLVCDataSourceFormat(
+            BarStoreSource(path=self.path),
+            validation_policy=ValidationPolicy.ON_LOAD,
+        )
+        with mock.patch.object(
+            ohlvc_schema, "validate", wraps=ohlvc_schema.validate
+        ) as spy:
+            data = source.fetch(timestamp=pd.Timestamp("2018-12-03", tz=self.tz))
+            self.source.fetch(timestamp=pd.Timestamp("2018-12-03", tz=self.tz))
+        self.assertTrue(is_validated(data, ohlvc_schema))
+        # Once by the source and once by the format with the FULL policy
+        self.assertEqual(spy.call_count, 2)
+
+    def test_datasets(self) -> None:
+        calendar = xcals.get_calendar("XNYS")
+        csv_prices = PricesDataset(
+            data_source=self.csv_source,
+            symbols=["GE", "BA"],
+            trading_calendar=calendar,
+            cache_size=0,
+        )
+        prices = PricesDataset(
+            data_source=self.source,
+            symbols=["GE", "BA"],
+            trading_calendar=calendar,
+            cache_size=0,
+        )
+        for timestamp in pd.date_range(
+            "2018-12-24", "2018-12-31 18:00", freq="150min", tz=self.tz
+        ):
+            pd.testing.assert_frame_equal(prices[timestamp], csv_prices[timestamp])
+
+        ohlvc = OHLVCDataset(data_source=self.source, symbols=["GE"])
+        data = ohlvc[pd.Timestamp("2018-12-03", tz=self.tz)]
+        self.assertEqual(data["open"].values[0], 35.42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,20 @@
 import os
+import tempfile
 import unittest
+from typing import List
+from unittest import mock
 
 import pandas as pd
+import pandera as pa
 import pytz
 
 # import hypertrade.libs.debugging  # donotcommit
 from hypertrade.libs.tsfd.sources.csv import CSVSource
 from hypertrade.libs.tsfd.sources.formats.news import HeadlineDataSourceFormat
 from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import FetchMode
+from hypertrade.libs.tsfd.utils.cache import FrameCache
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy, is_validated
 
 
 class TestOHLVCCsvDatasource(unittest.TestCase):
@@ -156,5 +163,178 @@ class TestHeadlineCsvDatasource(unittest.TestCase):
         )
 
 
+class TestChunkedCsvDatasource(unittest.TestCase):
+    """Test the CSVSource class streaming the file in chunks against loading it"""
+
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        self.ohlvc_sample_data_path = os.path.join(
+            ws, "../../tests/data/ohlvc/sample.csv"
+        )
+        self.headline_sample_data_path = os.path.join(
+            ws, "../../tests/data/news/headline_sample.csv"
+        )
+        self.tz = pytz.timezone("America/New_York")
+        self.timestamps: List[pd.Timestamp | slice | int] = [
+            pd.Timestamp("2018-12-03", tz=self.tz),
+            pd.Timestamp("2018-12-31 16:00", tz=self.tz),
+            1,
+            -1,
+            slice(
+                pd.Timestamp("2018-12-03", tz=self.tz),
+                pd.Timestamp("2018-12-06", tz=self.tz),
+            ),
+            slice(None, pd.Timestamp("2018-10-01", tz=self.tz)),
+            slice(pd.Timestamp("2020-01-01", tz=self.tz), None),
+        ]
+
+    def test_ohlvc(self) -> None:
+        csv_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path)
+        )
+        for chunksize in [1, 7, 50, 1000]:
+            chunked_source = OHLVCDataSourceFormat(
+                CSVSource(filepath=self.ohlvc_sample_data_path, chunksize=chunksize)
+            )
+            self.assertEqual(len(chunked_source), 82)
+            for timestamp in self.timestamps:
+                pd.testing.assert_frame_equal(
+                    chunked_source.fetch(timestamp), csv_source.fetch(timestamp)
+                )
+
+    def test_headline(self) -> None:
+        """Quoted headlines spanning lines aren't split across chunks"""
+        csv_source = HeadlineDataSourceFormat(
+            CSVSource(filepath=self.headline_sample_data_path)
+        )
+        chunked_source = HeadlineDataSourceFormat(
+            CSVSource(filepath=self.headline_sample_data_path, chunksize=100)
+        )
+        self.assertEqual(len(chunked_source), 2474)
+        timestamps: List[pd.Timestamp | slice | int] = [
+            1,
+            pd.Timestamp("2020-07-16 9:00:00", tz=self.tz),
+            slice(
+                pd.Timestamp("2020-07-15", tz=self.tz),
+                pd.Timestamp("2020-07-17", tz=self.tz),
+            ),
+        ]
+        for timestamp in timestamps:
+            pd.testing.assert_frame_equal(
+                chunked_source.fetch(timestamp), csv_source.fetch(timestamp)
+            )
+
+    def test_fetch_modes(self) -> None:
+        csv_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path)
+        )
+        chunked_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path, chunksize=50)
+        )
+        for mode, timestamp in [
+            (FetchMode.STRICT, pd.Timestamp("2018-12-03", tz=self.tz)),
+            (FetchMode.INTERVAL, pd.Timestamp("2018-12-03 01:00", tz="UTC")),
+        ]:
+            data = chunked_source.fetch(timestamp, mode=mode)
+            self.assertEqual(data.shape, (3, 6))
+            pd.testing.assert_frame_equal(data, csv_source.fetch(timestamp, mode=mode))
+            with self.assertRaises(KeyError):
+                chunked_source.fetch(timestamp + pd.Timedelta(days=2), mode=mode)
+
+    def test_before_first_date(self) -> None:
+        chunked_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path, chunksize=50)
+        )
+        with self.assertRaises(KeyError):
+            chunked_source.fetch(pd.Timestamp("2018-01-01", tz=self.tz))
+
+    def test_sorted_file(self) -> None:
+        """Only the chunks of the fetched dates are parsed when the file is sorted"""
+        data = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path)
+        ).fetch()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sorted.csv")
+            data.to_csv(path)
+            source = CSVSource(filepath=path, chunksize=30)
+            chunked_source = OHLVCDataSourceFormat(source)
+            self.assertTrue(source.chunk_index.is_sorted)
+            self.assertEqual(len(source.chunk_index.offsets), 10)
+
+            with mock.patch.object(
+                CSVSource, "_parse", autospec=True, side_effect=CSVSource._parse
+            ) as spy:
+                partial_data = chunked_source.fetch(
+                    pd.Timestamp("2018-12-03", tz=self.tz)
+                )
+            self.assertEqual(spy.call_count, 1)
+            parsed = spy.call_args.args[1]
+            self.assertLessEqual(parsed.count(b"\n"), 1 + 2 * 30)
+            pd.testing.assert_frame_equal(
+                partial_data,
+                OHLVCDataSourceFormat(CSVSource(filepath=path)).fetch(
+                    pd.Timestamp("2018-12-03", tz=self.tz)
+                ),
+            )
+
+
+class TestCachedCsvDatasource(unittest.TestCase):
+    """Test the CSVSource class loading the data from a FrameCache"""
+
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        self.ohlvc_sample_data_path = os.path.join(
+            ws, "../../tests/data/ohlvc/sample.csv"
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = FrameCache(self.tmpdir.name)
+
+    def test_cache(self) -> None:
+        data = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path, cache=self.cache)
+        ).fetch()
+        self.assertEqual(self.cache.stats.misses, 1)
+
+        with mock.patch("pandas.read_csv") as read_csv:
+            cached_source = OHLVCDataSourceFormat(
+                CSVSource(filepath=self.ohlvc_sample_data_path, cache=self.cache)
+            )
+            cached_data = cached_source.fetch()
+            partial_data = cached_source.fetch(pd.Timestamp("2018-12-03", tz="UTC"))
+        read_csv.assert_not_called()
+        self.assertEqual(self.cache.stats.hits, 1)
+        pd.testing.assert_frame_equal(cached_data, data)
+        self.assertEqual(partial_data.shape, (3, 6))
+
+    def test_other_schema(self) -> None:
+        """Frames are cached per schema"""
+        OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path, cache=self.cache)
+        ).fetch()
+        # The default schema doesn't match the OHLVC data
+        with self.assertRaises(pa.errors.SchemaError):
+            CSVSource(filepath=self.ohlvc_sample_data_path, cache=self.cache).fetch()
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_validated_before_caching(self) -> None:
+        """With ON_LOAD a cached frame isn't validated again"""
+        OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path, cache=self.cache)
+        ).fetch()
+        cached_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=self.ohlvc_sample_data_path, cache=self.cache),
+            validation_policy=ValidationPolicy.ON_LOAD,
+        )
+        with mock.patch.object(
+            OHLVCDataSourceFormat.schema,
+            "validate",
+            wraps=OHLVCDataSourceFormat.schema.validate,
+        ) as spy:
+            data = cached_source.fetch()
+        spy.assert_not_called()
+        self.assertTrue(is_validated(data, OHLVCDataSourceFormat.schema))
+
+
 if __name__ == "__main__":
     unittest.main()
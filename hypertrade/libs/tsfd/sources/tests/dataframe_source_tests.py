@@ -0,0 +1,178 @@
+import os
+import unittest
+
+import pandas as pd
+import pandera as pa
+import pytz
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.sources.dataframe import DataFrameSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.types import FetchMode, Granularity
+
+
+class TestOHLVCDataFrameSource(unittest.TestCase):
+    """Test the DataFrameSource class with OHLVCFormat"""
+
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        ohlvc_sample_data_path = os.path.join(ws, "../../tests/data/ohlvc/sample.csv")
+        # Unsorted, as read from the file
+        self.data = pd.read_csv(
+            ohlvc_sample_data_path, parse_dates=True, index_col=["date", "ticker"]
+        )
+        self.source = OHLVCDataSourceFormat(DataFrameSource(self.data))
+        self.tz = pytz.timezone("America/New_York")
+
+    def test_full_data_load(self) -> None:
+        full_data = self.source.fetch()
+
+        self.assertEqual(full_data.shape, (246, 6))
+        self.assertTrue(full_data.index.is_monotonic_increasing)
+        self.assertEqual(len(self.source), 82)
+
+    def test_partial_data_load(self) -> None:
+        partial_data = self.source.fetch(
+            timestamp=pd.Timestamp("2018-12-03", tz=self.tz)
+        )
+        self.assertEqual(partial_data.shape, (3, 6))
+
+    def test_slice(self) -> None:
+        data = self.source.fetch(
+            timestamp=slice(
+                pd.Timestamp("2018-12-03", tz=self.tz),
+                pd.Timestamp("2018-12-06", tz=self.tz),
+            )
+        )
+        self.assertEqual(data.shape, (6, 6))
+
+    def test_bad_schema(self) -> None:
+        bad_data = self.data.copy()
+        bad_data["open"] = -1.0
+        with self.assertRaises(pa.errors.SchemaError):
+            OHLVCDataSourceFormat(DataFrameSource(bad_data)).fetch()
+
+    def test_strict(self) -> None:
+        timestamp = pd.Timestamp("2018-12-03 05:00", tz="UTC")
+        data = self.source.fetch(timestamp, mode=FetchMode.STRICT)
+        pd.testing.assert_frame_equal(data, self.source.fetch(timestamp))
+        # The same time in another timezone
+        data = self.source.fetch(
+            pd.Timestamp("2018-12-03", tz=self.tz), mode=FetchMode.STRICT
+        )
+        self.assertEqual(data.shape, (3, 6))
+
+        for timestamp in [
+            pd.Timestamp("2018-12-03 05:00:01", tz="UTC"),
+            pd.Timestamp("2018-12-05 05:00", tz="UTC"),
+        ]:
+            with self.assertRaises(KeyError):
+                self.source.fetch(timestamp, mode=FetchMode.STRICT)
+
+    def test_interval(self) -> None:
+        """The bars of the day of the timestamp, even after the timestamp"""
+        data = self.source.fetch(
+            pd.Timestamp("2018-12-03 01:00", tz="UTC"), mode=FetchMode.INTERVAL
+        )
+        pd.testing.assert_frame_equal(
+            data, self.source.fetch(pd.Timestamp("2018-12-03 23:00", tz="UTC"))
+        )
+        # 2018-12-05 was a market holiday
+        with self.assertRaises(KeyError):
+            self.source.fetch(
+                pd.Timestamp("2018-12-05 12:00", tz=self.tz), mode=FetchMode.INTERVAL
+            )
+
+    def test_modes_ignored_for_slices_and_positions(self) -> None:
+        timestamp = slice(
+            pd.Timestamp("2018-12-03", tz=self.tz),
+            pd.Timestamp("2018-12-06", tz=self.tz),
+        )
+        for mode in FetchMode:
+            self.assertEqual(self.source.fetch(timestamp, mode=mode).shape, (6, 6))
+            self.assertEqual(self.source.fetch(1, mode=mode).shape, (3, 6))
+
+
+class TestGranularity(unittest.TestCase):
+
+    def test_bar(self) -> None:
+        timestamp = pd.Timestamp("2024-07-12 09:35:10", tz="America/New_York")
+        self.assertEqual(
+            Granularity.DAILY.bar(timestamp),
+            (
+                pd.Timestamp("2024-07-12", tz="UTC"),
+                pd.Timestamp("2024-07-13", tz="UTC"),
+            ),
+        )
+        self.assertEqual(
+            Granularity.HOURLY.bar(timestamp),
+            (
+                pd.Timestamp("2024-07-12 09:00", tz="America/New_York"),
+                pd.Timestamp("2024-07-12 10:00", tz="America/New_York"),
+            ),
+        )
+        self.assertEqual(
+            Granularity.MINUTE.bar(timestamp),
+            (
+                pd.Timestamp("2024-07-12 09:35", tz="America/New_York"),
+                pd.Timestamp("2024-07-12 09:36", tz="America/New_York"),
+            ),
+        )
+
+    def test_daily_bar_near_midnight(self) -> None:
+        """The evening in New York is already the next day in UTC"""
+        self.assertEqual(
+            Granularity.DAILY.bar(
+                pd.Timestamp("2024-07-12 22:30", tz="America/New_York")
+            ),
+            (
+                pd.Timestamp("2024-07-13", tz="UTC"),
+                pd.Timestamp("2024-07-14", tz="UTC"),
+            ),
+        )
+        self.assertEqual(
+            Granularity.DAILY.bar(pd.Timestamp("2024-07-13 00:30", tz="Asia/Tokyo")),
+            (
+                pd.Timestamp("2024-07-12", tz="UTC"),
+                pd.Timestamp("2024-07-13", tz="UTC"),
+            ),
+        )
+
+    def test_daily_bar_across_dst(self) -> None:
+        """UTC days are 24 hours long, also the day the clocks change"""
+        start, stop = Granularity.DAILY.bar(
+            pd.Timestamp("2024-03-10 12:00", tz="America/New_York")
+        )
+        self.assertEqual(stop - start, pd.Timedelta(hours=24))
+
+    def test_minute_interval(self) -> None:
+        """INTERVAL returns the ticks of the minute bar of the source's granularity"""
+        ticks = pd.DataFrame(
+            {
+                "price": [10.0, 10.5, 11.0, 11.5],
+                "quantity": [1.0, 2.0, 3.0, 4.0],
+                "ticker": ["MSFT"] * 4,
+            },
+            index=pd.MultiIndex.from_arrays(
+                [
+                    pd.DatetimeIndex(
+                        [
+                            "2024-07-12 13:30:59.5",
+                            "2024-07-12 13:31:00",
+                            "2024-07-12 13:31:30",
+                            "2024-07-12 13:32:00",
+                        ]
+                    )
+                ],
+                names=["date"],
+            ),
+        )
+        source = DataFrameSource(ticks, granularity=Granularity.MINUTE)
+        data = source.fetch(
+            pd.Timestamp("2024-07-12 13:31:45", tz="UTC"), mode=FetchMode.INTERVAL
+        )
+        self.assertEqual(list(data["price"]), [10.5, 11.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
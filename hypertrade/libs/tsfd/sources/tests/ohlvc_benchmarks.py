@@ -0,0 +1,59 @@
+"""Benchmarks for adapting OHLVC data to prices.
+
+Run with:
+    bazel run //hypertrade/libs/tsfd/sources/tests:ohlvc_benchmarks
+"""
+
+import sys
+
+import exchange_calendars as xcals
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.tsfd.sources.dataframe import DataFrameSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+
+TICKERS = 500
+
+
+@pytest.fixture(scope="module")
+def calendar() -> xcals.ExchangeCalendar:
+    return xcals.get_calendar("XNYS")
+
+
+@pytest.fixture(scope="module")
+def ohlvc(calendar: xcals.ExchangeCalendar) -> pd.DataFrame:
+    """10 years x 500 tickers of daily bars, dated at midnight UTC like the sources"""
+    sessions = calendar.sessions_in_range("2014-01-02", "2023-12-29")
+    dates = sessions.tz_localize("UTC")
+    tickers = [f"T{i:03d}" for i in range(TICKERS)]
+    index = pd.MultiIndex.from_product([dates, tickers], names=["date", "ticker"])
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(10, 100, (len(index), 2))
+    return pd.DataFrame(
+        {
+            "open": prices[:, 0],
+            "high": prices.max(axis=1),
+            "low": prices.min(axis=1),
+            "close": prices[:, 1],
+            "volume": rng.uniform(0, 1e6, len(index)),
+        },
+        index=index,
+    )
+
+
+def test_prices_adapter(
+    benchmark: BenchmarkFixture,
+    ohlvc: pd.DataFrame,
+    calendar: xcals.ExchangeCalendar,
+) -> None:
+    """Adapt 10 years x 500 tickers of daily bars to open and close prices"""
+    source = OHLVCDataSourceFormat(DataFrameSource(ohlvc))
+    benchmark.extra_info["rows"] = len(ohlvc)
+    benchmark(source.prices_adapter, None, ohlvc, calendar)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -0,0 +1,123 @@
+import os
+import unittest
+
+import exchange_calendars as xcals
+import numpy as np
+import pandas as pd
+from pandas._libs.tslibs.nattype import NaTType
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+
+
+def reference_prices_adapter(
+    idx: pd.Timestamp | NaTType | slice | int,
+    df: pd.DataFrame,
+    trading_calendar: xcals.ExchangeCalendar,
+) -> pd.DataFrame:
+    """The original per-date implementation of `prices_adapter`"""
+    dates = df.index.get_level_values(0).unique()
+    data = {}
+    for date in dates:
+        open_ts = trading_calendar.session_open(date.tz_localize(None).normalize())
+        data[open_ts] = df.xs(date, level="date")["open"].to_dict()
+        close_ts = trading_calendar.session_close(date.tz_localize(None).normalize())
+        data[close_ts] = df.xs(date, level="date")["close"].to_dict()
+
+    df = pd.DataFrame.from_dict(data, orient="index")
+    df_stacked = df.stack()
+    df_multiindex = pd.DataFrame(df_stacked).reset_index()
+    df_multiindex = df_multiindex.set_axis(["date", "ticker", "price"], axis=1)
+    df_multiindex = df_multiindex.set_index(["date", "ticker"]).sort_index()
+    return df_multiindex
+
+
+# The adapters convert the whole frame they are given, whatever was fetched
+FULL_FETCH = slice(None)
+
+
+def _move_last_date(data: pd.DataFrame) -> pd.DataFrame:
+    """Move the rows of the last session to the Sunday before it."""
+    return data.rename(
+        index={
+            pd.Timestamp("2018-12-31 05:00", tz="UTC"): pd.Timestamp(
+                "2018-12-30 05:00", tz="UTC"
+            )
+        },
+        level="date",
+    )
+
+
+class TestOHLVCPricesAdapter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        ohlvc_sample_data_path = os.path.join(ws, "../../tests/data/ohlvc/sample.csv")
+        self.source = OHLVCDataSourceFormat(CSVSource(filepath=ohlvc_sample_data_path))
+        self.calendar = xcals.get_calendar("XNYS")
+
+    def test_matches_reference(self) -> None:
+        data = self.source.fetch()
+        pd.testing.assert_frame_equal(
+            self.source.prices_adapter(FULL_FETCH, data, self.calendar),
+            reference_prices_adapter(FULL_FETCH, data, self.calendar),
+        )
+
+    def test_missing_prices(self) -> None:
+        """Missing rows and NaN prices are left out, like the reference"""
+        data = self.source.fetch().copy()
+        data.loc[data.index[5], "open"] = np.nan
+        data.loc[data.index[10], "close"] = np.nan
+        data = data.drop(data.index[7])
+        pd.testing.assert_frame_equal(
+            self.source.prices_adapter(FULL_FETCH, data, self.calendar),
+            reference_prices_adapter(FULL_FETCH, data, self.calendar),
+        )
+
+    def test_open_close_interleaved(self) -> None:
+        data = self.source.fetch(
+            timestamp=slice(
+                pd.Timestamp("2018-12-27", tz="UTC"),
+                pd.Timestamp("2018-12-29", tz="UTC"),
+            )
+        )
+        prices = self.source.prices_adapter(FULL_FETCH, data, self.calendar)
+        times = prices.index.get_level_values("date").unique()
+        self.assertEqual(
+            list(times),
+            [
+                self.calendar.session_open("2018-12-27"),
+                self.calendar.session_close("2018-12-27"),
+                self.calendar.session_open("2018-12-28"),
+                self.calendar.session_close("2018-12-28"),
+            ],
+        )
+        self.assertEqual(
+            prices.loc[(self.calendar.session_open("2018-12-28"), "GE"), "price"],
+            data.loc[(pd.Timestamp("2018-12-28 05:00", tz="UTC"), "GE"), "open"],
+        )
+
+    def test_not_a_session(self) -> None:
+        data = _move_last_date(self.source.fetch())
+        with self.assertRaises(ValueError):
+            self.source.prices_adapter(FULL_FETCH, data, self.calendar)
+
+    def test_unused_dates_in_index(self) -> None:
+        """Only the dates of the rows are mapped to sessions, not every index level"""
+        data = _move_last_date(self.source.fetch())
+        sliced = data.iloc[:30]
+        pd.testing.assert_frame_equal(
+            self.source.prices_adapter(FULL_FETCH, sliced, self.calendar),
+            reference_prices_adapter(FULL_FETCH, sliced, self.calendar),
+        )
+
+    def test_empty(self) -> None:
+        data = self.source.fetch().iloc[:0]
+        prices = self.source.prices_adapter(FULL_FETCH, data, self.calendar)
+        self.assertTrue(prices.empty)
+        self.assertEqual(prices.index.names, ["date", "ticker"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Benchmarks for reading OHLVC data from Parquet, against CSV loaded or streamed.
+
+Run with:
+    bazel run //hypertrade/libs/tsfd/sources/tests:parquet_benchmarks
+"""
+
+import sys
+import tracemalloc
+from typing import Callable, Dict
+
+import exchange_calendars as xcals
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.parquet import ParquetSource, write_parquet
+from hypertrade.libs.tsfd.sources.types import DataSource
+from hypertrade.libs.tsfd.utils.cache import FrameCache
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
+
+TICKERS = 500
+MONTH = slice(
+    pd.Timestamp("2023-06-01", tz="UTC"), pd.Timestamp("2023-07-01", tz="UTC")
+)
+
+
+@pytest.fixture(scope="module")
+def paths(tmp_path_factory: pytest.TempPathFactory) -> Dict[str, str]:
+    """10 years x 500 tickers of daily bars, as a CSV file and a Parquet dataset"""
+    calendar = xcals.get_calendar("XNYS")
+    dates = calendar.sessions_in_range("2014-01-02", "2023-12-29").tz_localize("UTC")
+    tickers = [f"T{i:03d}" for i in range(TICKERS)]
+    index = pd.MultiIndex.from_product([dates, tickers], names=["date", "ticker"])
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(10, 100, (len(index), 2))
+    data = pd.DataFrame(
+        {
+            "open": prices[:, 0],
+            "high": prices.max(axis=1),
+            "low": prices.min(axis=1),
+            "close": prices[:, 1],
+            "volume": rng.uniform(0, 1e6, len(index)),
+        },
+        index=index,
+    )
+    tmp_path = tmp_path_factory.mktemp("ohlvc")
+    paths = {
+        "csv": str(tmp_path / "ohlvc.csv"),
+        "csv-chunked": str(tmp_path / "ohlvc.csv"),
+        "parquet": str(tmp_path / "ohlvc"),
+    }
+    data.to_csv(paths["csv"])
+    write_parquet(data, paths["parquet"])
+    return paths
+
+
+SOURCES: Dict[str, Callable[[str], DataSource]] = {
+    "csv": lambda path: CSVSource(filepath=path),
+    "csv-chunked": lambda path: CSVSource(filepath=path, chunksize=50_000),
+    "parquet": lambda path: ParquetSource(path=path),
+}
+
+
+@pytest.mark.parametrize("source", list(SOURCES))
+def test_cold_start(
+    benchmark: BenchmarkFixture, paths: Dict[str, str], source: str
+) -> None:
+    """Open the source and fetch a month of bars"""
+
+    def cold_start() -> None:
+        OHLVCDataSourceFormat(SOURCES[source](paths[source])).fetch(MONTH)
+
+    benchmark.pedantic(cold_start, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [ValidationPolicy.FULL, ValidationPolicy.ON_LOAD],
+    ids=lambda policy: policy.value,
+)
+def test_cold_start_cached(
+    benchmark: BenchmarkFixture,
+    paths: Dict[str, str],
+    tmp_path_factory: pytest.TempPathFactory,
+    policy: ValidationPolicy,
+) -> None:
+    """Open a CSV source whose parsed data is cached and fetch a month of bars"""
+    cache = FrameCache(str(tmp_path_factory.mktemp("cache")))
+    OHLVCDataSourceFormat(CSVSource(filepath=paths["csv"], cache=cache)).fetch()
+
+    def cold_start() -> None:
+        OHLVCDataSourceFormat(
+            CSVSource(filepath=paths["csv"], cache=cache), validation_policy=policy
+        ).fetch(MONTH)
+
+    benchmark.pedantic(cold_start, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("source", list(SOURCES))
+def test_slice_fetch(
+    benchmark: BenchmarkFixture, paths: Dict[str, str], source: str
+) -> None:
+    """Fetch a month of bars from an opened source"""
+    data_source = OHLVCDataSourceFormat(SOURCES[source](paths[source]))
+    data_source.fetch(MONTH)
+    benchmark(data_source.fetch, MONTH)
+
+
+@pytest.mark.parametrize("source", list(SOURCES))
+def test_peak_memory(
+    benchmark: BenchmarkFixture, paths: Dict[str, str], source: str
+) -> None:
+    """Peak memory allocated to open the source and fetch a month of bars"""
+
+    def fetch() -> None:
+        OHLVCDataSourceFormat(SOURCES[source](paths[source])).fetch(MONTH)
+
+    tracemalloc.start()
+    benchmark.pedantic(fetch, rounds=1, iterations=1)
+    benchmark.extra_info["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
@@ -0,0 +1,167 @@
+import os
+import tempfile
+import unittest
+from typing import List
+
+import exchange_calendars as xcals
+import pandas as pd
+import pandera as pa
+import pytz
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.datasets.asset import PricesDataset
+from hypertrade.libs.tsfd.sources.csv import CSVSource
+from hypertrade.libs.tsfd.sources.formats.ohlvc import OHLVCDataSourceFormat
+from hypertrade.libs.tsfd.sources.parquet import ParquetSource, write_parquet
+from hypertrade.libs.tsfd.sources.types import FetchMode
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy
+
+
+class TestOHLVCParquetSource(unittest.TestCase):
+    """Test the ParquetSource class with OHLVCFormat against the CSVSource"""
+
+    def setUp(self) -> None:
+        ws = os.path.dirname(__file__)
+        ohlvc_sample_data_path = os.path.join(ws, "../../tests/data/ohlvc/sample.csv")
+        self.csv_source = OHLVCDataSourceFormat(
+            CSVSource(filepath=ohlvc_sample_data_path)
+        )
+        self.data = self.csv_source.fetch()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "ohlvc")
+        write_parquet(self.data, self.path, partition_by=("year",), row_group_size=30)
+        self.source = OHLVCDataSourceFormat(ParquetSource(path=self.path))
+        self.tz = pytz.timezone("America/New_York")
+
+    def test_full_data_load(self) -> None:
+        full_data = self.source.fetch()
+
+        # Only the columns of the schema are read
+        self.assertEqual(full_data.shape, (246, 5))
+        self.assertTrue(full_data.index.is_monotonic_increasing)
+        self.assertEqual(len(self.source), 82)
+        pd.testing.assert_frame_equal(
+            full_data, self.data[list(full_data.columns)], check_index_type=False
+        )
+
+    def test_partial_data_load(self) -> None:
+        for timestamp in [
+            pd.Timestamp("2018-12-03", tz=self.tz),
+            pd.Timestamp("2018-12-31 16:00", tz=self.tz),
+            pd.Timestamp("2019-01-01 03:00", tz=self.tz),
+        ]:
+            expected = self.csv_source.fetch(timestamp=timestamp)
+            data = self.source.fetch(timestamp=timestamp)
+            self.assertEqual(data.shape, (3, 5))
+            pd.testing.assert_frame_equal(
+                data, expected[list(data.columns)], check_index_type=False
+            )
+
+    def test_fetch_modes(self) -> None:
+        for mode, timestamp in [
+            (FetchMode.STRICT, pd.Timestamp("2018-12-03", tz=self.tz)),
+            (FetchMode.INTERVAL, pd.Timestamp("2018-12-03 01:00", tz="UTC")),
+        ]:
+            data = self.source.fetch(timestamp, mode=mode)
+            self.assertEqual(data.shape, (3, 5))
+            expected = self.csv_source.fetch(timestamp, mode=mode)
+            pd.testing.assert_frame_equal(
+                data, expected[list(data.columns)], check_index_type=False
+            )
+            with self.assertRaises(KeyError):
+                self.source.fetch(timestamp + pd.Timedelta(days=2), mode=mode)
+
+    def test_slice(self) -> None:
+        """Slices exclude their stop, like the CSVSource"""
+        timestamp = slice(
+            pd.Timestamp("2018-12-03", tz=self.tz),
+            pd.Timestamp("2018-12-06", tz=self.tz),
+        )
+        data = self.source.fetch(timestamp=timestamp)
+        self.assertEqual(data.shape, (6, 5))
+        expected = self.csv_source.fetch(timestamp=timestamp)
+        pd.testing.assert_frame_equal(
+            data, expected[list(data.columns)], check_index_type=False
+        )
+
+    def test_integer_index(self) -> None:
+        data = self.source.fetch(timestamp=1)
+        self.assertEqual(
+            set(data.index.get_level_values("date")),
+            {pd.Timestamp("2018-09-05 04:00", tz="UTC")},
+        )
+
+    def test_before_first_date(self) -> None:
+        with self.assertRaises(KeyError):
+            self.source.fetch(timestamp=pd.Timestamp("2018-01-01", tz=self.tz))
+
+    def test_year_boundary(self) -> None:
+        """Data in another time zone is partitioned by its UTC year"""
+        data = self.data.loc[pd.Timestamp("2018-12-28 05:00", tz="UTC") :]
+        # The last session closes at 2018-12-31 20:00 New York, 2019 in UTC
+        data = data.rename(
+            index=lambda date: date.tz_convert(self.tz) + pd.Timedelta(hours=20),
+            level="date",
+        )
+        path = os.path.join(self.tmpdir.name, "new_york")
+        write_parquet(data, path, partition_by=("year",))
+        self.assertEqual(sorted(os.listdir(path)), ["year=2018", "year=2019"])
+
+        # The OHLVC schema requires UTC dates
+        source = OHLVCDataSourceFormat(
+            ParquetSource(path=path), validation_policy=ValidationPolicy.OFF
+        )
+        last = pd.Timestamp("2019-01-01 01:00", tz="UTC")
+        timestamps: List[pd.Timestamp | slice] = [
+            slice(pd.Timestamp("2019-01-01 00:30", tz="UTC"), None),
+            pd.Timestamp("2019-01-01 02:00", tz="UTC"),
+        ]
+        for timestamp in timestamps:
+            fetched = source.fetch(timestamp=timestamp)
+            self.assertEqual(len(fetched), 3)
+            self.assertEqual(set(fetched.index.get_level_values("date")), {last})
+
+    def test_tickers(self) -> None:
+        path = os.path.join(self.tmpdir.name, "by_ticker")
+        write_parquet(self.data, path, partition_by=("ticker",))
+        self.assertEqual(
+            sorted(os.listdir(path)), ["ticker=AAPL", "ticker=BA", "ticker=GE"]
+        )
+        source = OHLVCDataSourceFormat(ParquetSource(path=path, tickers=["GE", "BA"]))
+        data = source.fetch(timestamp=pd.Timestamp("2018-12-03", tz=self.tz))
+        self.assertEqual(list(data.index.get_level_values("ticker")), ["BA", "GE"])
+        self.assertEqual(source.fetch().shape, (164, 5))
+
+    def test_bad_schema(self) -> None:
+        bad_data = self.data.copy()
+        bad_data["open"] = -1.0
+        path = os.path.join(self.tmpdir.name, "bad")
+        write_parquet(bad_data, path)
+        with self.assertRaises(pa.errors.SchemaError):
+            OHLVCDataSourceFormat(ParquetSource(path=path)).fetch(
+                timestamp=pd.Timestamp("2018-12-03", tz=self.tz)
+            )
+
+    def test_prices_dataset(self) -> None:
+        def prices_dataset(source: OHLVCDataSourceFormat) -> PricesDataset:
+            return PricesDataset(
+                data_source=source,
+                symbols=["GE", "BA"],
+                name="prices",
+                trading_calendar=xcals.get_calendar("XNYS"),
+                cache_size=0,
+            )
+
+        csv_prices = prices_dataset(self.csv_source)
+        parquet_prices = prices_dataset(self.source)
+        for timestamp in pd.date_range(
+            "2018-12-24", "2018-12-31 18:00", freq="150min", tz=self.tz
+        ):
+            pd.testing.assert_frame_equal(
+                parquet_prices[timestamp], csv_prices[timestamp]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,22 +2,47 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import ClassVar, Optional
+from typing import ClassVar, Optional, Tuple
 
 import pandas as pd
 import pandera as pa
 from pandas._libs.tslibs.nattype import NaTType
 
+from hypertrade.libs.tsfd.utils.validation import ValidationPolicy, validate
+
 
 class Granularity(Enum):
     DAILY = "D"
     HOURLY = "H"
     MINUTE = "T"
 
+    def bar(self, timestamp: pd.Timestamp) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """Start and (exclusive) end of the bar containing the timestamp.
+
+        Daily bars are the UTC calendar day of the timestamp, the timezone the sources
+        date their rows in, whatever the timezone of the timestamp. Naive timestamps
+        are in UTC.
+        """
+        if self is Granularity.DAILY:
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.tz_convert("UTC")
+            start = timestamp.normalize()
+            return start, start + pd.Timedelta(days=1)
+        length = (
+            pd.Timedelta(hours=1)
+            if self is Granularity.HOURLY
+            else pd.Timedelta(minutes=1)
+        )
+        start = timestamp.floor(length)
+        return start, start + length
+
 
-# TODO: Add support for other fetch modes into the datasource
 class FetchMode(Enum):
-    """Mode for fetching data at a specific timestamp."""
+    """Mode for fetching data at a specific timestamp.
+
+    The mode applies to fetches by timestamp, slices and integer positions select the
+    same rows in every mode.
+    """
 
     STRICT = "strict"
     """Fetch data at the exact timestamp. If timestamp is not available, raise an error."""
@@ -26,7 +51,11 @@ class FetchMode(Enum):
     """Fetch the latest data available before the timestamp."""
 
     INTERVAL = "interval"
-    """Fetch data within the interval of the timestamp."""
+    """Fetch data within the interval of the timestamp.
+
+    The interval is the bar of the data source's granularity containing the timestamp,
+    e.g. its calendar day for daily data. If there is no data in it, raise an error.
+    """
 
 
 class DataSource(ABC):
@@ -82,6 +111,9 @@ class DataSource(ABC):
 
         Returns:
             pd.DataFrame: Data at the specified timestamp
+
+        Raises:
+            KeyError: If there is no data at the timestamp for the mode.
         """
         if isinstance(timestamp, pd.Timestamp):
             timestamp = self._maybe_tz_localize(timestamp)
@@ -98,6 +130,24 @@ class DataSource(ABC):
 
         return self._fetch(timestamp, mode)
 
+    def _fetch_mode(self, timestamp: pd.Timestamp, mode: FetchMode) -> pd.DataFrame:
+        """Fetch the data at the timestamp for the STRICT or INTERVAL mode.
+
+        The mode is resolved to a range of dates, fetched as a slice so that the data
+        sources look it up by binary search on their sorted dates.
+
+        Raises:
+            KeyError: If there is no data in the range.
+        """
+        if mode is FetchMode.STRICT:
+            start, stop = timestamp, timestamp + pd.Timedelta(1, "ns")
+        else:
+            start, stop = self.granularity.bar(timestamp)
+        data = self._fetch(slice(start, stop))
+        if data.empty:
+            raise KeyError(f"No data for {timestamp} in {mode.value} mode")
+        return data
+
     def _maybe_tz_localize(self, timestamp: pd.Timestamp) -> pd.Timestamp:
         if timestamp.tzinfo is None:
             return timestamp.tz_localize("UTC")
@@ -127,11 +177,19 @@ class DataSourceFormat(DataSource):
     The DataSourceFormat is a decorator that adds a schema or format layer on top of a DataSource.
     It ensures data validation against a specific schema, while delegating the underlying data
     retrieval to the wrapped DataSource. It should not contain domain-specific logic for datasets.
+
+    The validation policy applies to the data loaded by the wrapped DataSource and to every
+    fetch, see `hypertrade.libs.tsfd.utils.validation.ValidationPolicy`.
     """
 
     schema: ClassVar[pa.DataFrameSchema]
 
-    def __init__(self, datasource: DataSource):
+    def __init__(
+        self,
+        datasource: DataSource,
+        validation_policy: ValidationPolicy = ValidationPolicy.FULL,
+    ):
+        self.validation_policy = validation_policy
         self._datasource = datasource
         self._datasource.format = self
 
@@ -141,7 +199,7 @@ class DataSourceFormat(DataSource):
         mode: FetchMode = FetchMode.LATEST,
     ) -> pd.DataFrame:
         data = self._datasource.fetch(timestamp, mode)
-        self.schema.validate(data)
+        validate(data, self.schema, self.validation_policy)
         return data
 
     def __len__(self) -> int:
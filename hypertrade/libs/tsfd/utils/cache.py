@@ -0,0 +1,222 @@
+import hashlib
+import json
+import mmap
+import os
+
+# trunk-ignore(bandit/B403)
+import pickle
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+import pandera as pa
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tsfd")
+DEFAULT_MAX_BYTES = 2**30
+CACHE_SUFFIX = ".frame"
+
+# Buffers are aligned for NumPy and SIMD loads of the memory mapped arrays
+_ALIGNMENT = 64
+_HEADER = struct.Struct("<QQ")
+
+
+@dataclass
+class FrameCacheStats:
+    """Lookups of a FrameCache since it was created."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _schema_key(schema: pa.DataFrameSchema) -> str:
+    """Description of the schema, including the checks that its repr leaves out."""
+    components: List[Any] = list(schema.columns.values())
+    if isinstance(schema.index, pa.MultiIndex):
+        components.extend(schema.index.indexes)
+    elif schema.index is not None:
+        components.append(schema.index)
+    parts = [repr(schema), repr(schema.checks)]
+    for component in components:
+        parts.append(
+            f"{component.name}:{component.dtype}:{component.nullable}:"
+            f"{component.unique}:{component.checks!r}"
+        )
+    return "\n".join(parts)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class FrameCache:
+    """On-disk cache of parsed DataFrames, shared by every process that uses it.
+
+    Frames are pickled with protocol 5, with their column and index arrays written as
+    out-of-band buffers after the pickle. Loading a frame memory maps the file copy on
+    write, so the arrays point into the page cache instead of being read and copied,
+    and processes loading the same frame share its pages.
+
+    The directory is private to the user, and only frames written by the user are
+    loaded, since unpickling a frame can run arbitrary code.
+
+    Entries are keyed by `key`, from the fingerprint of the file a frame was parsed
+    from, so they are invalidated when the file changes. When the cache grows over
+    `max_bytes` the least recently used entries are evicted.
+
+    Usage:
+        cache = FrameCache("/tmp/tsfd", max_bytes=2**30)
+        source = CSVSource(filepath="path/to/ohlvc.csv", cache=cache)
+    """
+
+    def __init__(
+        self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Args:
+            directory: Directory of the cache, created private to the user if needed.
+            max_bytes: Maximum total size of the cached frames.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = FrameCacheStats()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def key(
+        path: str, schema: Optional[pa.DataFrameSchema] = None, **kwargs: Any
+    ) -> str:
+        """Key of the frame parsed from `path` with the `schema` and read `kwargs`.
+
+        The key changes whenever the file is modified (its mtime or size change), or the
+        schema or the arguments it is read with change.
+        """
+        stat = os.stat(path)
+        fingerprint = [
+            os.path.abspath(path),
+            str(stat.st_mtime_ns),
+            str(stat.st_size),
+            repr(sorted(kwargs.items())),
+            _schema_key(schema) if schema is not None else "",
+        ]
+        return hashlib.sha256("\0".join(fingerprint).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, bool]]:
+        """The cached frame and whether it was validated, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_uid != os.getuid():
+                    # Written by another user, who could have crafted the pickle
+                    self.stats.misses += 1
+                    return None
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            offset, length = _HEADER.unpack_from(content)
+            header = json.loads(bytes(content[offset : offset + length]))
+            view = memoryview(content)
+            start, stop = header["payload"]
+            buffers = [view[begin:end] for begin, end in header["buffers"]]
+            # The file is the user's own, in the user's private directory
+            # trunk-ignore(bandit/B301)
+            data = pickle.loads(view[start:stop], buffers=buffers)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (ValueError, KeyError, EOFError, struct.error, pickle.UnpicklingError):
+            # A partial or foreign file, parse the frame again
+            self.stats.misses += 1
+            self._remove(path)
+            return None
+
+        # Mark the entry as recently used for the eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.stats.hits += 1
+        return data, bool(header["validated"])
+
+    def put(self, key: str, data: pd.DataFrame, validated: bool = False) -> None:
+        """Cache the frame, then evict the least recently used frames over the size.
+
+        The file holds the offset and length of a JSON header, the pickle, the buffers
+        aligned to 64 bytes and finally the header, with the ranges of the pickle and
+        the buffers.
+        """
+        attrs = data.attrs
+        # The attributes, e.g. the validation markers, are specific to this process
+        data.attrs = {}
+        try:
+            buffers: List[pickle.PickleBuffer] = []
+            payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+        finally:
+            data.attrs = attrs
+
+        # Write to a temporary file and rename, so readers never see a partial frame
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                ranges = []
+                offset = _ALIGNMENT
+                for content in [payload] + [buffer.raw() for buffer in buffers]:
+                    f.seek(offset)
+                    f.write(content)
+                    ranges.append([offset, offset + len(content)])
+                    offset = _aligned(offset + len(content))
+                header = json.dumps(
+                    {
+                        "validated": validated,
+                        "payload": ranges[0],
+                        "buffers": ranges[1:],
+                    }
+                ).encode()
+                f.seek(offset)
+                f.write(header)
+                f.seek(0)
+                f.write(_HEADER.pack(offset, len(header)))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used frames until the cache fits `max_bytes`."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(CACHE_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            self.stats.evictions += 1
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached frame."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(CACHE_SUFFIX):
+                self._remove(entry.path)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
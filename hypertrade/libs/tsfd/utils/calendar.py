@@ -0,0 +1,44 @@
+from typing import Optional, Tuple
+
+import exchange_calendars as xcals
+import numpy as np
+import numpy.typing as npt
+
+
+class SessionTimeline:
+    """Session opens and closes of an exchange calendar as sorted epoch nanoseconds.
+
+    Daily prices change at the session open and the session close, so resolving a
+    timestamp to the latest open or close before it tells which prices are current at
+    that time. Lookups are binary searches over the precomputed arrays.
+    """
+
+    def __init__(self, calendar: xcals.ExchangeCalendar) -> None:
+        self.opens: npt.NDArray[np.int64] = np.asarray(
+            calendar.opens_nanos, dtype=np.int64
+        )
+        self.closes: npt.NDArray[np.int64] = np.asarray(
+            calendar.closes_nanos, dtype=np.int64
+        )
+        # Sessions don't overlap, so interleaving opens and closes keeps them sorted
+        self.times: npt.NDArray[np.int64] = np.column_stack(
+            (self.opens, self.closes)
+        ).ravel()
+
+    def latest_price_time(self, time_ns: int) -> Optional[int]:
+        """The latest session open or close at or before `time_ns`.
+
+        Returns None if `time_ns` is before the first session of the calendar.
+        """
+        i = int(np.searchsorted(self.times, time_ns, side="right")) - 1
+        return int(self.times[i]) if i >= 0 else None
+
+    def previous_session(self, time_ns: int) -> Optional[Tuple[int, int]]:
+        """Open and close of the last session that closed strictly before `time_ns`.
+
+        Returns None if no session closed before `time_ns`.
+        """
+        i = int(np.searchsorted(self.closes, time_ns, side="left")) - 1
+        if i < 0:
+            return None
+        return int(self.opens[i]), int(self.closes[i])
@@ -1,5 +1,8 @@
-from typing import Protocol, cast
+import weakref
+from typing import Callable, Optional, Protocol
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import pandera as pa
 
@@ -15,53 +18,162 @@ class IndexStrategy(Protocol):
     def get_timestamp_at_index(self, df: pd.DataFrame, idx: int) -> pd.Timestamp: ...
 
 
+class DateIndex:
+    """Sorted epoch nanosecond dates of a DataFrame's (first level) index.
+
+    The dates are kept as a sorted int64 array, with the offset of the first row of
+    each unique date, so as-of and range lookups are binary searches that resolve to a
+    range of rows instead of a boolean mask over the whole index.
+
+    attributes
+    ----------
+        dates : np.ndarray
+            Dates of every row in sorted order.
+        order : np.ndarray, optional
+            Positions of the rows in sorted order. None if the index is already sorted
+            by date, which is the case for the data sources.
+        unique_dates : np.ndarray
+            Sorted unique dates.
+        offsets : np.ndarray
+            Position in `dates` of the first row of each unique date, followed by the
+            number of rows, so the rows of `unique_dates[i]` are
+            `offsets[i]:offsets[i + 1]`.
+    """
+
+    def __init__(self, index: pd.Index) -> None:
+        dates = pd.DatetimeIndex(index)
+        self.tz = dates.tz
+        values = np.asarray(dates.view("i8"), dtype=np.int64)
+        if len(values) > 1 and bool(np.any(values[1:] < values[:-1])):
+            self.order: Optional[npt.NDArray[np.intp]] = np.argsort(
+                values, kind="stable"
+            )
+            values = values[self.order]
+        else:
+            self.order = None
+        self.dates: npt.NDArray[np.int64] = values
+        if len(values):
+            starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        else:
+            starts = np.empty(0, dtype=np.intp)
+        self.unique_dates: npt.NDArray[np.int64] = values[starts]
+        self.offsets: npt.NDArray[np.intp] = np.r_[starts, len(values)]
+
+    def timestamp(self, value: int) -> pd.Timestamp:
+        return pd.Timestamp(value, tz=self.tz)
+
+    def asof(self, timestamp: pd.Timestamp) -> int:
+        """Number of the latest unique date at or before `timestamp`.
+
+        Raises:
+            KeyError: If there is no date at or before `timestamp`.
+        """
+        i = int(np.searchsorted(self.unique_dates, _ns(timestamp), side="right")) - 1
+        if i < 0:
+            raise KeyError(f"No data at or before {timestamp}")
+        return i
+
+    def rows(self, start: int, stop: int) -> slice | npt.NDArray[np.intp]:
+        """Positions in the frame of the rows `start:stop` in sorted order."""
+        if self.order is None:
+            return slice(start, stop)
+        # Keep the rows in the order of the frame, like a boolean mask would
+        return np.sort(self.order[start:stop])
+
+    def rows_between(self, timestamp: slice) -> slice | npt.NDArray[np.intp]:
+        """Positions of the rows with `timestamp.start <= date < timestamp.stop`."""
+        start = (
+            0
+            if timestamp.start is None
+            else int(np.searchsorted(self.dates, _ns(timestamp.start), side="left"))
+        )
+        stop = (
+            len(self.dates)
+            if timestamp.stop is None
+            else int(np.searchsorted(self.dates, _ns(timestamp.stop), side="left"))
+        )
+        return self.rows(start, max(start, stop))
+
+
+def _ns(timestamp: pd.Timestamp) -> int:
+    return pd.Timestamp(timestamp).value
+
+
+class _DateIndexCache:
+    """DateIndex of the last DataFrame looked up.
+
+    Data sources query the same DataFrame over and over, so the DateIndex is built once
+    and reused for as long as the frame and its index are unchanged.
+    """
+
+    def __init__(self, get_dates: Callable[[pd.DataFrame], pd.Index]) -> None:
+        self._get_dates = get_dates
+        self._frame: Optional[weakref.ref[pd.DataFrame]] = None
+        self._index: Optional[pd.Index] = None
+        self._date_index: Optional[DateIndex] = None
+
+    def get(self, df: pd.DataFrame) -> DateIndex:
+        if (
+            self._date_index is not None
+            and self._frame is not None
+            and self._frame() is df
+            and self._index is df.index
+        ):
+            return self._date_index
+        date_index = DateIndex(self._get_dates(df))
+        self._frame = weakref.ref(df)
+        self._index = df.index
+        self._date_index = date_index
+        return date_index
+
+
 class SingleIndexStrategy(IndexStrategy):
 
+    def __init__(self) -> None:
+        self._date_index = _DateIndexCache(lambda df: df.index)
+
     def size(self, df: pd.DataFrame) -> int:
-        return len(df.index.unique())
+        return len(self._date_index.get(df).unique_dates)
 
     def loc(self, df: pd.DataFrame, timestamp: pd.Timestamp) -> pd.DataFrame:
-        latest_ts = df.loc[df.index <= timestamp].last_valid_index()
-        data = df.loc[latest_ts]
-        if isinstance(data, pd.Series):
-            data = data.to_frame().T
+        date_index = self._date_index.get(df)
+        i = date_index.asof(timestamp)
+        data = df.iloc[
+            date_index.rows(date_index.offsets[i], date_index.offsets[i + 1])
+        ]
+        if data.index.name is None:
             data.index.name = "date"
         return data
 
     def loc_slice(self, df: pd.DataFrame, timestamp: slice) -> pd.DataFrame:
-        return df.loc[(df.index >= timestamp.start) & (df.index < timestamp.stop)]
+        return df.iloc[self._date_index.get(df).rows_between(timestamp)]
 
     def get_timestamp_at_index(self, df: pd.DataFrame, idx: int) -> pd.Timestamp:
-        index = df.index.unique().sort_values()
-        return cast(pd.Timestamp, index[idx])
+        date_index = self._date_index.get(df)
+        return date_index.timestamp(int(date_index.unique_dates[idx]))
 
 
 class MultiIndexStrategy(IndexStrategy):
 
+    def __init__(self) -> None:
+        self._date_index = _DateIndexCache(lambda df: df.index.get_level_values(0))
+
     def size(self, df: pd.DataFrame) -> int:
-        return len(df.index.get_level_values(0).unique())
+        return len(self._date_index.get(df).unique_dates)
 
     def loc(self, df: pd.DataFrame, timestamp: pd.Timestamp) -> pd.DataFrame:
-        latest_ts = df.loc[
-            (df.index.get_level_values(0) <= timestamp),
-            :,
-        ].last_valid_index()[0]
-        data = df.loc[[latest_ts]]
-        if isinstance(data, pd.Series):
-            data = data.to_frame().T
-        return data
+        date_index = self._date_index.get(df)
+        i = date_index.asof(timestamp)
+        return df.iloc[
+            date_index.rows(date_index.offsets[i], date_index.offsets[i + 1])
+        ]
 
     def loc_slice(self, df: pd.DataFrame, timestamp: slice) -> pd.DataFrame:
-
-        return df.loc[
-            (df.index.get_level_values(0) >= timestamp.start)
-            & (df.index.get_level_values(0) < timestamp.stop),
-            :,
-        ]
+        return df.iloc[self._date_index.get(df).rows_between(timestamp)]
 
     def get_timestamp_at_index(self, df: pd.DataFrame, idx: int) -> pd.Timestamp:
-        index = df.index.get_level_values(0).unique().sort_values()
-        return cast(pd.Timestamp, index[idx])
+        date_index = self._date_index.get(df)
+        return date_index.timestamp(int(date_index.unique_dates[idx]))
 
 
 def get_index_strategy(
@@ -0,0 +1,140 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.schemas.ohlvc import ohlvc_schema
+from hypertrade.libs.tsfd.utils.cache import CACHE_SUFFIX, FrameCache
+from hypertrade.libs.tsfd.utils.validation import VALIDATED_ATTR, mark_validated
+
+
+def _ohlvc(rows: int = 100) -> pd.DataFrame:
+    dates = pd.date_range("2024-01-01", periods=rows, freq="D", tz="UTC")
+    index = pd.MultiIndex.from_product(
+        [dates, ["AAPL", "GE"]], names=["date", "ticker"]
+    )
+    values = np.arange(len(index), dtype=float)
+    return pd.DataFrame(
+        {
+            "open": values,
+            "high": values + 1,
+            "low": values,
+            "close": values + 0.5,
+            "volume": values * 10,
+        },
+        index=index,
+    )
+
+
+class TestFrameCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = FrameCache(os.path.join(self.tmpdir.name, "cache"))
+        self.path = os.path.join(self.tmpdir.name, "data.csv")
+        with open(self.path, "w") as f:
+            f.write("date,value\n2024-01-01,1.0\n")
+
+    def test_round_trip(self) -> None:
+        data = _ohlvc()
+        self.cache.put("key", data, validated=True)
+        cached = self.cache.get("key")
+        assert cached is not None
+        cached_data, validated = cached
+
+        pd.testing.assert_frame_equal(cached_data, data)
+        self.assertTrue(validated)
+        # The columns are memory mapped copy on write, and aligned
+        values = cached_data["open"].to_numpy()
+        self.assertTrue(values.flags.writeable)
+        self.assertEqual(values.ctypes.data % 64, 0)
+        cached_data.iloc[0, 0] = 100.0
+        pd.testing.assert_frame_equal(self.cache.get("key")[0], data)  # type: ignore
+
+    def test_attrs_are_not_cached(self) -> None:
+        data = _ohlvc()
+        mark_validated(data, ohlvc_schema)
+        self.cache.put("key", data)
+        self.assertIn(VALIDATED_ATTR, data.attrs)
+        self.assertEqual(self.cache.get("key")[0].attrs, {})  # type: ignore
+
+    def test_stats(self) -> None:
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.put("key", _ohlvc())
+        self.cache.get("key")
+        self.cache.get("key")
+        self.assertEqual(self.cache.stats.hits, 2)
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertAlmostEqual(self.cache.stats.hit_rate, 2 / 3)
+
+    def test_key(self) -> None:
+        key = FrameCache.key(self.path, ohlvc_schema, sep=",")
+        self.assertEqual(key, FrameCache.key(self.path, ohlvc_schema, sep=","))
+        self.assertNotEqual(key, FrameCache.key(self.path, ohlvc_schema))
+        self.assertNotEqual(key, FrameCache.key(self.path, sep=","))
+
+        # A schema differing only by a check
+        schema = ohlvc_schema.update_column(
+            "open", checks=pa.Check.greater_than_or_equal_to(1)
+        )
+        self.assertNotEqual(key, FrameCache.key(self.path, schema, sep=","))
+
+        with open(self.path, "a") as f:
+            f.write("2024-01-02,2.0\n")
+        self.assertNotEqual(key, FrameCache.key(self.path, ohlvc_schema, sep=","))
+
+    def test_eviction(self) -> None:
+        data = _ohlvc(1000)
+        self.cache.put("first", data)
+        size = os.path.getsize(
+            os.path.join(self.cache.directory, "first" + CACHE_SUFFIX)
+        )
+        self.cache.max_bytes = 2 * size
+        self.cache.put("second", data)
+        os.utime(
+            os.path.join(self.cache.directory, "first" + CACHE_SUFFIX),
+            ns=(0, 0),
+        )
+        self.cache.get("second")
+        self.cache.put("third", data)
+
+        self.assertIsNone(self.cache.get("first"))
+        self.assertIsNotNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("third"))
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_corrupt_entry(self) -> None:
+        self.cache.put("key", _ohlvc())
+        path = os.path.join(self.cache.directory, "key" + CACHE_SUFFIX)
+        with open(path, "r+b") as f:
+            f.truncate(100)
+        self.assertIsNone(self.cache.get("key"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_private_directory(self) -> None:
+        mode = os.stat(self.cache.directory).st_mode
+        self.assertEqual(stat.S_IMODE(mode), 0o700)
+
+    def test_foreign_entry(self) -> None:
+        """Frames written by another user are not loaded"""
+        self.cache.put("key", _ohlvc())
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertIsNotNone(self.cache.get("key"))
+
+    def test_clear(self) -> None:
+        self.cache.put("key", _ohlvc())
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
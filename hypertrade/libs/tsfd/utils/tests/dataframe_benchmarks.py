@@ -0,0 +1,72 @@
+"""Benchmarks for date lookups through the index strategies.
+
+Run with:
+    bazel run //hypertrade/libs/tsfd/utils/tests:dataframe_benchmarks
+"""
+
+import sys
+from typing import cast
+
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from hypertrade.libs.tsfd.utils.dataframe import MultiIndexStrategy
+
+# 10M rows: 20,000 daily bars for 500 tickers
+DATES = 20_000
+TICKERS = 500
+LOOKUPS = 100
+
+
+@pytest.fixture(scope="module")
+def prices() -> pd.DataFrame:
+    dates = pd.date_range("1950-01-01", periods=DATES, freq="D", tz="UTC")
+    tickers = [f"T{i:03d}" for i in range(TICKERS)]
+    index = pd.MultiIndex.from_product([dates, tickers], names=["date", "ticker"])
+    return pd.DataFrame(
+        {"close": np.random.default_rng(0).random(len(index))}, index=index
+    )
+
+
+@pytest.fixture(scope="module")
+def timestamps(prices: pd.DataFrame) -> pd.DatetimeIndex:
+    dates = pd.DatetimeIndex(cast(pd.MultiIndex, prices.index).levels[0])
+    positions = np.random.default_rng(1).integers(1, len(dates), LOOKUPS)
+    return dates[positions] + pd.Timedelta(hours=12)
+
+
+def test_asof_lookups(
+    benchmark: BenchmarkFixture, prices: pd.DataFrame, timestamps: pd.DatetimeIndex
+) -> None:
+    """As-of lookups of random timestamps on a 10M row frame"""
+    strategy = MultiIndexStrategy()
+
+    def lookups() -> None:
+        for timestamp in timestamps:
+            strategy.loc(prices, timestamp)
+
+    benchmark.extra_info["rows"] = len(prices)
+    benchmark.extra_info["lookups"] = LOOKUPS
+    benchmark(lookups)
+
+
+def test_range_lookups(
+    benchmark: BenchmarkFixture, prices: pd.DataFrame, timestamps: pd.DatetimeIndex
+) -> None:
+    """A week of rows from random timestamps on a 10M row frame"""
+    strategy = MultiIndexStrategy()
+    week = pd.Timedelta(days=7)
+
+    def lookups() -> None:
+        for timestamp in timestamps:
+            strategy.loc_slice(prices, slice(timestamp, timestamp + week))
+
+    benchmark.extra_info["rows"] = len(prices)
+    benchmark.extra_info["lookups"] = LOOKUPS
+    benchmark(lookups)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "--benchmark-only"]))
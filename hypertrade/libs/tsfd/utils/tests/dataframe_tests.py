@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.utils.dataframe import (
+    MultiIndexStrategy,
+    SingleIndexStrategy,
+)
+
+
+def _multi_index_frame() -> pd.DataFrame:
+    dates = pd.date_range("2020-01-01", periods=5, freq="D", tz="UTC")
+    index = pd.MultiIndex.from_product(
+        [dates, ["A", "B", "C"]], names=["date", "ticker"]
+    )
+    return pd.DataFrame({"close": np.arange(len(index), dtype=float)}, index=index)
+
+
+class TestMultiIndexStrategy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.df = _multi_index_frame()
+        self.strategy = MultiIndexStrategy()
+
+    def test_loc_asof(self) -> None:
+        """The rows of the latest date at or before the timestamp are returned"""
+        data = self.strategy.loc(self.df, pd.Timestamp("2020-01-03 12:00", tz="UTC"))
+        expected = self.df.loc[[pd.Timestamp("2020-01-03", tz="UTC")]]
+        pd.testing.assert_frame_equal(data, expected)
+
+        data = self.strategy.loc(self.df, pd.Timestamp("2020-01-03", tz="UTC"))
+        pd.testing.assert_frame_equal(data, expected)
+
+    def test_loc_before_data(self) -> None:
+        with self.assertRaises(KeyError):
+            self.strategy.loc(self.df, pd.Timestamp("2019-12-31", tz="UTC"))
+
+    def test_loc_slice(self) -> None:
+        start = pd.Timestamp("2020-01-02", tz="UTC")
+        stop = pd.Timestamp("2020-01-04", tz="UTC")
+        data = self.strategy.loc_slice(self.df, slice(start, stop))
+        dates = self.df.index.get_level_values(0)
+        pd.testing.assert_frame_equal(data, self.df[(dates >= start) & (dates < stop)])
+
+        empty = self.strategy.loc_slice(self.df, slice(stop, start))
+        self.assertTrue(empty.empty)
+
+    def test_unsorted_frame(self) -> None:
+        """Unsorted frames give the same rows, in the order of the frame"""
+        df = self.df.sample(frac=1, random_state=0)
+        data = self.strategy.loc(df, pd.Timestamp("2020-01-02", tz="UTC"))
+        expected = df.loc[[pd.Timestamp("2020-01-02", tz="UTC")]]
+        pd.testing.assert_frame_equal(data, expected)
+        self.assertEqual(self.strategy.size(df), 5)
+
+    def test_size_and_timestamp_at_index(self) -> None:
+        self.assertEqual(self.strategy.size(self.df), 5)
+        self.assertEqual(
+            self.strategy.get_timestamp_at_index(self.df, 1),
+            pd.Timestamp("2020-01-02", tz="UTC"),
+        )
+        self.assertEqual(
+            self.strategy.get_timestamp_at_index(self.df, -1),
+            pd.Timestamp("2020-01-05", tz="UTC"),
+        )
+
+    def test_index_change(self) -> None:
+        """The cached dates are rebuilt when the frame's index is replaced"""
+        df = self.df.copy()
+        self.strategy.loc(df, pd.Timestamp("2020-01-05", tz="UTC"))
+        df.rename(
+            index=lambda date: date + pd.Timedelta(days=10), level=0, inplace=True
+        )
+        with self.assertRaises(KeyError):
+            self.strategy.loc(df, pd.Timestamp("2020-01-05", tz="UTC"))
+
+
+class TestSingleIndexStrategy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        index = pd.DatetimeIndex(
+            ["2020-01-01", "2020-01-02", "2020-01-02", "2020-01-04"], tz="UTC"
+        )
+        self.df = pd.DataFrame({"value": [1.0, 2.0, 3.0, 4.0]}, index=index)
+        self.strategy = SingleIndexStrategy()
+
+    def test_loc_asof(self) -> None:
+        data = self.strategy.loc(self.df, pd.Timestamp("2020-01-03", tz="UTC"))
+        self.assertEqual(data["value"].to_list(), [2.0, 3.0])
+        self.assertEqual(data.index.name, "date")
+
+        data = self.strategy.loc(self.df, pd.Timestamp("2020-01-05", tz="UTC"))
+        self.assertEqual(data.shape, (1, 1))
+        self.assertEqual(data.index[0], pd.Timestamp("2020-01-04", tz="UTC"))
+
+    def test_loc_before_data(self) -> None:
+        with self.assertRaises(KeyError):
+            self.strategy.loc(self.df, pd.Timestamp("2019-12-31", tz="UTC"))
+
+    def test_loc_slice(self) -> None:
+        data = self.strategy.loc_slice(
+            self.df,
+            slice(
+                pd.Timestamp("2020-01-02", tz="UTC"),
+                pd.Timestamp("2020-01-04", tz="UTC"),
+            ),
+        )
+        self.assertEqual(data["value"].to_list(), [2.0, 3.0])
+
+    def test_size(self) -> None:
+        self.assertEqual(self.strategy.size(self.df), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+from pandera.errors import SchemaError
+
+# import hypertrade.libs.debugging  # donotcommit
+from hypertrade.libs.tsfd.utils.validation import (
+    ValidationPolicy,
+    is_validated,
+    mark_validated,
+    validate,
+)
+
+schema = pa.DataFrameSchema(
+    {"close": pa.Column(float, checks=pa.Check.greater_than_or_equal_to(0))}
+)
+other_schema = pa.DataFrameSchema({"close": pa.Column(float)})
+
+
+def _frame(rows: int = 10) -> pd.DataFrame:
+    return pd.DataFrame({"close": np.arange(rows, dtype=float)})
+
+
+class TestValidate(unittest.TestCase):
+
+    def test_full_validates_every_time(self) -> None:
+        df = _frame()
+        with mock.patch.object(schema, "validate", wraps=schema.validate) as spy:
+            validate(df, schema, ValidationPolicy.FULL)
+            validate(df, schema, ValidationPolicy.FULL)
+        self.assertEqual(spy.call_count, 2)
+        self.assertTrue(is_validated(df, schema))
+
+    def test_on_load_skips_validated_frames(self) -> None:
+        df = _frame()
+        with mock.patch.object(schema, "validate", wraps=schema.validate) as spy:
+            validate(df, schema, ValidationPolicy.ON_LOAD)
+            validate(df.iloc[2:5], schema, ValidationPolicy.ON_LOAD)
+            validate(df.sort_index(ascending=False), schema, ValidationPolicy.ON_LOAD)
+        self.assertEqual(spy.call_count, 1)
+
+    def test_marker_is_per_schema(self) -> None:
+        df = _frame()
+        mark_validated(df, other_schema)
+        self.assertTrue(is_validated(df))
+        self.assertFalse(is_validated(df, schema))
+        df.loc[3, "close"] = -1.0
+        with self.assertRaises(SchemaError):
+            validate(df, schema, ValidationPolicy.ON_LOAD)
+
+    def test_sampled(self) -> None:
+        df = _frame(100)
+        with mock.patch.object(schema, "validate", wraps=schema.validate) as spy:
+            validate(df, schema, ValidationPolicy.SAMPLED, sample_size=10)
+        spy.assert_called_once_with(df, sample=10, random_state=None)
+        # Only part of the rows were checked
+        self.assertFalse(is_validated(df, schema))
+
+    def test_sampled_small_frame_is_validated_in_full(self) -> None:
+        df = _frame(5)
+        validate(df, schema, ValidationPolicy.SAMPLED, sample_size=10)
+        self.assertTrue(is_validated(df, schema))
+
+    def test_sampled_invalid_rows(self) -> None:
+        df = _frame(100)
+        df["close"] = -1.0
+        with self.assertRaises(SchemaError):
+            validate(df, schema, ValidationPolicy.SAMPLED, sample_size=10)
+
+    def test_off(self) -> None:
+        df = _frame()
+        df["close"] = -1.0
+        validate(df, schema, ValidationPolicy.OFF)
+        self.assertFalse(is_validated(df))
+
+    def test_invalid_frame_is_not_marked(self) -> None:
+        df = _frame()
+        df.loc[3, "close"] = -1.0
+        with self.assertRaises(SchemaError):
+            validate(df, schema, ValidationPolicy.FULL)
+        self.assertFalse(is_validated(df))
+
+
+if __name__ == "__main__":
+    unittest.main()
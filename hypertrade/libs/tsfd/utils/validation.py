@@ -0,0 +1,72 @@
+from enum import Enum
+from typing import FrozenSet, Optional, cast
+
+import pandas as pd
+import pandera as pa
+
+# Key of the marker in `DataFrame.attrs`. pandas carries the attrs over to slices,
+# copies and sorts of a frame, so the rows of a validated frame stay marked.
+VALIDATED_ATTR = "tsfd_validated"
+DEFAULT_SAMPLE_SIZE = 1_000
+
+
+class ValidationPolicy(Enum):
+    """How often data sources, formats and datasets validate frames against a schema."""
+
+    FULL = "full"
+    """Validate every frame: when the source loads it, on every fetch and on every lookup."""
+
+    ON_LOAD = "on-load"
+    """Validate once when the source loads its data. Frames fetched from it are trusted."""
+
+    SAMPLED = "sampled"
+    """Validate a random sample of the rows of frames that haven't been validated."""
+
+    OFF = "off"
+    """Don't validate."""
+
+
+def _validated_schemas(df: pd.DataFrame) -> FrozenSet[int]:
+    return cast(FrozenSet[int], df.attrs.get(VALIDATED_ATTR, frozenset()))
+
+
+def is_validated(df: pd.DataFrame, schema: Optional[pa.DataFrameSchema] = None) -> bool:
+    """Whether `df` was validated against `schema`, or against any schema if None."""
+    validated = _validated_schemas(df)
+    return bool(validated) if schema is None else id(schema) in validated
+
+
+def mark_validated(df: pd.DataFrame, schema: pa.DataFrameSchema) -> None:
+    """Mark `df` as validated against `schema`.
+
+    Schemas are told apart by identity, they are expected to be module level objects
+    like the ones in `hypertrade.libs.tsfd.schemas`.
+    """
+    df.attrs[VALIDATED_ATTR] = _validated_schemas(df) | {id(schema)}
+
+
+def validate(
+    df: pd.DataFrame,
+    schema: pa.DataFrameSchema,
+    policy: ValidationPolicy = ValidationPolicy.FULL,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    random_state: Optional[int] = None,
+) -> None:
+    """Validate `df` against `schema` as required by `policy`.
+
+    Frames that are validated in full are marked, so that ON_LOAD and SAMPLED skip
+    them and whatever is sliced from them later on. FULL validates regardless of the
+    marker.
+
+    Raises:
+        pandera.errors.SchemaError: If the validated rows don't match the schema.
+    """
+    if policy is ValidationPolicy.OFF:
+        return
+    if policy is not ValidationPolicy.FULL and is_validated(df, schema):
+        return
+    if policy is ValidationPolicy.SAMPLED and len(df) > sample_size:
+        schema.validate(df, sample=sample_size, random_state=random_state)
+        return
+    schema.validate(df)
+    mark_validated(df, schema)